@@ -0,0 +1,150 @@
+"""
+Semantic answer cache for the RAG chat
+
+Standalone first-turn questions are embedded with the same MiniLM model as the
+document index and looked up in a small dedicated FAISS inner-product index of
+past questions. A past question with cosine similarity at or above the threshold
+returns its stored answer and sources, skipping the rewrite, retrieval and
+generation calls. Entries expire after a TTL, the least recently used are
+evicted beyond max_entries, and everything is dropped when the document
+index on disk changes.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import faiss
+import numpy as np
+
+from backend.LLM.config import (
+    ANSWER_CACHE_THRESHOLD,
+    ANSWER_CACHE_MAX_ENTRIES,
+    ANSWER_CACHE_TTL_SECONDS,
+)
+from backend.LLM.metrics import chat_metrics
+from backend.src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def index_fingerprint(index_dir) -> tuple:
+    """Changes whenever the saved document index is rewritten"""
+    stats = []
+    for name in ("index.faiss", "index.pkl"):
+        try:
+            stat = os.stat(Path(index_dir) / name)
+            stats.append((stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            stats.append(None)
+    return tuple(stats)
+
+
+class SemanticAnswerCache:
+    """
+    Args:
+        embed: question -> embedding (e.g. HuggingFaceEmbeddings.embed_query)
+        threshold: minimum cosine similarity for a hit
+        max_entries: least recently used entries are evicted beyond this
+        ttl_seconds: entries older than this are not served
+        fingerprint: returns the document index fingerprint; a change clears the cache
+        fingerprint_interval: seconds between fingerprint checks
+    """
+
+    def __init__(self, embed: Callable[[str], List[float]], threshold: float = ANSWER_CACHE_THRESHOLD,
+                 max_entries: int = ANSWER_CACHE_MAX_ENTRIES, ttl_seconds: float = ANSWER_CACHE_TTL_SECONDS,
+                 fingerprint: Optional[Callable[[], tuple]] = None, fingerprint_interval: float = 30):
+        self.embed = embed
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.fingerprint = fingerprint
+        self.fingerprint_interval = fingerprint_interval
+
+        self._index = None  # created on the first store, once the embedding size is known
+        self._entries: "OrderedDict[int, Dict]" = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._fingerprint_value = fingerprint() if fingerprint else None
+        self._fingerprint_checked = time.monotonic()
+
+    def _vector(self, question: str) -> np.ndarray:
+        # Copy: normalize_L2 writes in place, ignoring the read-only flag on vectors shared
+        # from the embedding cache (embeddings.CachedEmbeddings)
+        vector = np.array(self.embed(" ".join(question.lower().split())), dtype=np.float32, copy=True).reshape(1, -1)
+        faiss.normalize_L2(vector)
+        return vector
+
+    def _check_fingerprint(self):
+        if self.fingerprint is None or time.monotonic() - self._fingerprint_checked < self.fingerprint_interval:
+            return
+        self._fingerprint_checked = time.monotonic()
+        value = self.fingerprint()
+        if value != self._fingerprint_value:
+            logger.info("Document index changed; clearing the answer cache.")
+            self._fingerprint_value = value
+            self._clear()
+
+    def lookup(self, question: str) -> Optional[Dict]:
+        """{"question", "answer", "sources", "similarity"} of the closest fresh entry above the threshold"""
+        vector = self._vector(question)
+        with self._lock:
+            self._check_fingerprint()
+            if self._index is None or self._index.ntotal == 0:
+                chat_metrics.increment("answer_cache_misses")
+                return None
+            similarities, ids = self._index.search(vector, 1)
+            similarity, entry_id = float(similarities[0][0]), int(ids[0][0])
+            entry = self._entries.get(entry_id)
+            if entry is not None and time.time() - entry["created_at"] > self.ttl_seconds:
+                self._remove(entry_id)
+                entry = None
+            if entry is None or similarity < self.threshold:
+                chat_metrics.increment("answer_cache_misses")
+                return None
+            self._entries.move_to_end(entry_id)
+            chat_metrics.increment("answer_cache_hits")
+            return {"question": entry["question"], "answer": entry["answer"],
+                    "sources": list(entry["sources"]), "similarity": similarity}
+
+    def store(self, question: str, answer: str, sources: List[str]):
+        if not answer:
+            return
+        vector = self._vector(question)
+        with self._lock:
+            if self._index is None:
+                self._index = faiss.IndexIDMap(faiss.IndexFlatIP(vector.shape[1]))
+            entry_id = self._next_id
+            self._next_id += 1
+            self._index.add_with_ids(vector, np.array([entry_id], dtype=np.int64))
+            self._entries[entry_id] = {"question": question, "answer": answer, "sources": list(sources),
+                                       "created_at": time.time()}
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, entry_id: int):
+        self._entries.pop(entry_id, None)
+        self._index.remove_ids(np.array([entry_id], dtype=np.int64))
+
+    def _clear(self):
+        self._entries.clear()
+        if self._index is not None:
+            self._index.reset()
+
+    def invalidate(self):
+        with self._lock:
+            self._clear()
+
+    def stats(self) -> Dict:
+        counters = chat_metrics.snapshot()["counters"]
+        hits = counters.get("answer_cache_hits", 0)
+        misses = counters.get("answer_cache_misses", 0)
+        return {
+            "entries": len(self._entries),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        }
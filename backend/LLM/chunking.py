@@ -4,6 +4,15 @@ from backend.src.utils.logger import get_logger
 #Initialize logger
 logger=get_logger(__name__)
 
+# Text splitter Setup
+def make_splitter(chunk_size=500, chunk_overlap=50):
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=len #For characters
+        #TODO use tokenizer-based length function later
+    )
+
 #Function for chunking documents
 
 def chunk_documents(documents, chunk_size=500, chunk_overlap=50):
@@ -17,13 +26,7 @@ def chunk_documents(documents, chunk_size=500, chunk_overlap=50):
         return []
 
 
-    # Text splitter Setup
-    text_splitter=RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap,
-        length_function=len #For characters
-        #TODO use tokenizer-based length function later
-    )
+    text_splitter=make_splitter(chunk_size, chunk_overlap)
 
     try:
         chunks=text_splitter.split_documents(documents)
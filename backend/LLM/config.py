@@ -1,9 +1,55 @@
+import os
 
 #Model choice
 
 model_name="gpt-4o-mini"
 chunking_model_name="sentence-transformers/all-MiniLM-L6-v2"
 
+#Embeddings
+
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")  # "torch", "onnx" or "onnx-int8"
+EMBEDDING_CACHE_SIZE = 4096                                  # cached query embeddings per process
+ONNX_INT8_FILE = "onnx/model_qint8_avx2.onnx"                # quantized weights shipped in the model repo
+
+#Vector index
+
+# faiss.index_factory spec used when building: "Flat" (exact), "HNSW32", "IVF256,Flat", "IVF256,PQ48", ...
+FAISS_INDEX_SPEC = os.getenv("FAISS_INDEX_SPEC", "Flat")
+# Search-time parameters applied on load, e.g. "nprobe=16" (IVF) or "efSearch=64" (HNSW)
+FAISS_SEARCH_PARAMS = os.getenv("FAISS_SEARCH_PARAMS", "")
+
+#Ingestion
+
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "0"))  # PDF parser processes (0 = one per core, minus one)
+EMBED_BATCH_SIZE = 256                                    # chunks per embedder call while indexing
+
 #Token limits
 
-MAX_INPUT_TOKENS = 3000
\ No newline at end of file
+MAX_INPUT_TOKENS = 3000
+
+#Question rewrite
+
+SKIP_REWRITE_FOR_STANDALONE = True  # skip the history-aware rewrite for questions that look standalone
+
+#Answer cache
+
+ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "1") == "1"
+ANSWER_CACHE_THRESHOLD = 0.92        # minimum cosine similarity between questions for a hit
+ANSWER_CACHE_MAX_ENTRIES = 2000      # least recently used answers are evicted beyond this
+ANSWER_CACHE_TTL_SECONDS = 86400     # cached answers older than this are regenerated
+
+#Chat sessions
+
+MAX_SESSIONS = 10000          # least recently used sessions are dropped beyond this
+SESSION_TTL_SECONDS = 3600    # sessions idle longer than this are dropped
+HISTORY_MAX_TURNS = 6         # recent question/answer pairs replayed to the chain
+HISTORY_MAX_TOKENS = 1500     # token budget for those recent turns
+SUMMARY_MAX_TOKENS = 300      # token budget for the rolling summary of older turns
+HISTORY_CACHE_TTL_SECONDS = 2 # how long a worker reuses a history read from an external backend
+
+#Chat history backend
+
+# Where chat histories live: "memory" (per process), "sqlite" or "redis" (shared by all workers)
+CHAT_HISTORY_BACKEND = os.getenv("CHAT_HISTORY_BACKEND", "memory")
+CHAT_HISTORY_SQLITE_PATH = os.getenv("CHAT_HISTORY_SQLITE_PATH", "chat_history.sqlite3")
+CHAT_HISTORY_REDIS_URL = os.getenv("CHAT_HISTORY_REDIS_URL", "redis://localhost:6379/0")
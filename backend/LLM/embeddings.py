@@ -0,0 +1,96 @@
+"""
+Process-wide sentence embedder with a query cache
+
+get_embedder() returns one warmed-up embedder per model name, shared by index
+building, index loading, retrieval and the answer cache. Query embeddings are
+kept in an LRU of float32 arrays, so repeated queries (and rewrites that come
+out identical) skip the model entirely.
+
+EMBEDDING_BACKEND selects how the model runs on CPU:
+    torch      - sentence-transformers on PyTorch (default)
+    onnx       - ONNX Runtime export of the same model
+    onnx-int8  - ONNX Runtime with the model's dynamically quantized int8 weights
+The ONNX backends need `optimum[onnxruntime]`; without it the torch backend is used.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_huggingface import HuggingFaceEmbeddings
+
+from backend.LLM.config import (
+    chunking_model_name,
+    EMBEDDING_BACKEND,
+    EMBEDDING_CACHE_SIZE,
+    ONNX_INT8_FILE,
+)
+from backend.src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_embedders: Dict[str, "CachedEmbeddings"] = {}
+_embedders_lock = threading.Lock()
+
+
+class CachedEmbeddings(Embeddings):
+    """Wraps an Embeddings model with an LRU cache of query -> float32 vector"""
+
+    def __init__(self, base: Embeddings, cache_size: int = EMBEDDING_CACHE_SIZE):
+        self.base = base
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def embed_query(self, text: str) -> np.ndarray:
+        with self._lock:
+            vector = self._cache.get(text)
+            if vector is not None:
+                self._cache.move_to_end(text)
+                self.hits += 1
+                return vector
+            self.misses += 1
+
+        vector = np.asarray(self.base.embed_query(text), dtype=np.float32)
+        # Shared between callers, so make sure nobody normalizes it in place
+        vector.setflags(write=False)
+        with self._lock:
+            self._cache[text] = vector
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        # Documents are embedded once, at indexing time: no point caching them
+        return self.base.embed_documents(texts)
+
+
+def _load_base(model_name: str, backend: str) -> Embeddings:
+    if backend in ("onnx", "onnx-int8"):
+        model_kwargs = {"backend": "onnx"}
+        if backend == "onnx-int8":
+            model_kwargs["model_kwargs"] = {"file_name": ONNX_INT8_FILE}
+        try:
+            return HuggingFaceEmbeddings(model_name=model_name, model_kwargs=model_kwargs)
+        except Exception as e:
+            logger.warning(f"ONNX embedding backend unavailable ({e}); using torch.")
+    elif backend != "torch":
+        raise ValueError(f"Unknown embedding backend: {backend}")
+    return HuggingFaceEmbeddings(model_name=model_name)
+
+
+def get_embedder(model_name: str = chunking_model_name, backend: str = EMBEDDING_BACKEND) -> CachedEmbeddings:
+    """The shared embedder for a model, loaded and warmed up on first use"""
+    key = f"{model_name}:{backend}"
+    with _embedders_lock:
+        if key not in _embedders:
+            embedder = CachedEmbeddings(_load_base(model_name, backend))
+            # The first call initializes the tokenizer and runtime; don't let a user pay for it
+            embedder.base.embed_query("warm up")
+            _embedders[key] = embedder
+            logger.info(f"Embedding model {model_name} loaded ({backend}).")
+        return _embedders[key]
@@ -1,5 +1,11 @@
+import uuid
+
+import faiss
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
-from langchain_huggingface import HuggingFaceEmbeddings
+from backend.LLM.config import FAISS_INDEX_SPEC, FAISS_SEARCH_PARAMS
+from backend.LLM.embeddings import get_embedder
 from backend.src.utils.logger import get_logger
 from pathlib import Path
 from backend.config import chunking_model_name
@@ -11,17 +17,113 @@ logger = get_logger(__name__)
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent  # adjust if inside src/
 DATA_DIR = PROJECT_ROOT / "backend" / "LLM" / "data" / "faiss_index"
-def build_faiss_index(chunks,model_name=chunking_model_name):
-
+def parse_search_params(spec: str) -> dict:
+    """
+    "nprobe=16,efSearch=64" -> {"nprobe": 16, "efSearch": 64}. Malformed items are
+    skipped with a warning, so a typo in FAISS_SEARCH_PARAMS can't stop the index loading.
+    """
+    params = {}
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        name, sep, value = (part.strip() for part in item.partition("="))
+        try:
+            if not (name and sep):
+                raise ValueError("expected name=value")
+            params[name] = float(value) if "." in value else int(value)
+        except ValueError as e:
+            logger.warning(f"Ignoring search parameter {item!r}: {e}")
+    return params
+
+
+def build_index_from_vectors(vectors: np.ndarray, index_spec: str = FAISS_INDEX_SPEC):
+    """
+    Raw FAISS index for a factory spec, trained on the vectors if the type needs it
+    (IVF coarse centroids, PQ codebooks), with the vectors added.
+
+    Examples: "Flat" (exact), "HNSW32", "IVF256,Flat", "IVF256,PQ48", "OPQ48,IVF256,PQ48"
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    index = faiss.index_factory(vectors.shape[1], index_spec, faiss.METRIC_L2)
+    if not index.is_trained:
+        logger.info(f"Training {index_spec} on {len(vectors)} vectors...")
+        index.train(vectors)
+    index.add(vectors)
+    return index
+
+
+def supports_removal(index) -> bool:
+    """
+    True if remove_ids compacts the index (flat-codes types: Flat, PQ, SQ), which is what
+    LangChain's FAISS.delete assumes when it renumbers index_to_docstore_id. IVF keeps the
+    old ids of the remaining vectors and HNSW can't remove at all.
+    """
+    return isinstance(faiss.downcast_index(index), faiss.IndexFlatCodes)
+
+
+def mmap_read_flag(index):
+    """
+    faiss.read_index flag that memory-maps the vector data of this index type, or None.
+    IO_FLAG_MMAP only covers IVF inverted lists; flat-codes indexes (Flat, PQ, SQ) need
+    IO_FLAG_MMAP_IFC, which older faiss releases don't have. HNSW graphs and wrapped
+    indexes (e.g. OPQ pre-transforms) are always read onto the heap. A mapped index
+    is read-only: load with mmap=False to add or delete vectors.
+    """
+    index = faiss.downcast_index(index)
+    if isinstance(index, faiss.IndexIVF):
+        return faiss.IO_FLAG_MMAP
+    if isinstance(index, faiss.IndexFlatCodes) and hasattr(faiss, "IO_FLAG_MMAP_IFC"):
+        return faiss.IO_FLAG_MMAP_IFC
+    return None
+
+
+def set_search_params(faiss_index, params: dict):
+    """
+    Apply search-time parameters (nprobe for IVF, efSearch for HNSW, ...) to the index
+    behind a LangChain FAISS store. They are index state, so they hold for every
+    retriever built on it. Parameters the index type doesn't have are skipped.
+    """
+    if not params:
+        return
+    parameter_space = faiss.ParameterSpace()
+    for name, value in params.items():
+        try:
+            parameter_space.set_index_parameter(faiss_index.index, name, value)
+        except RuntimeError:
+            logger.warning(f"FAISS index {type(faiss_index.index).__name__} has no parameter {name}; ignored.")
+
+
+def build_faiss_index(chunks, model_name=chunking_model_name, index_spec=FAISS_INDEX_SPEC, ids=None):
+    """
+    Embed the chunks and index them with a FAISS factory spec (see build_index_from_vectors).
+    "Flat" gives the same exact index as FAISS.from_documents. ids are the docstore ids
+    of the chunks (random UUIDs if None).
+    """
     if not chunks:
         logger.error("No chunks provided to build the FAISS index.")
         return None
 
-    embedding_model = HuggingFaceEmbeddings(model_name=model_name)
+    embedding_model = get_embedder(model_name)
 
     try:
-        faiss_index = FAISS.from_documents(chunks, embedding_model)
-        logger.info("FAISS index built successfully.")
+        vectors = np.asarray(embedding_model.embed_documents([c.page_content for c in chunks]), dtype=np.float32)
+    except Exception as e:
+        logger.error(f"Error building FAISS index: {e}")
+        return None
+    return build_faiss_index_from_vectors(chunks, vectors, model_name, index_spec, ids)
+
+
+def build_faiss_index_from_vectors(chunks, vectors, model_name=chunking_model_name, index_spec=FAISS_INDEX_SPEC,
+                                   ids=None):
+    """build_faiss_index for chunks that are already embedded (vectors[i] is chunks[i])"""
+    try:
+        index = build_index_from_vectors(vectors, index_spec)
+        ids = list(ids) if ids is not None else [str(uuid.uuid4()) for _ in chunks]
+        faiss_index = FAISS(
+            embedding_function=get_embedder(model_name),
+            index=index,
+            docstore=InMemoryDocstore(dict(zip(ids, chunks))),
+            index_to_docstore_id=dict(enumerate(ids)),
+        )
+        logger.info(f"FAISS index ({index_spec}) built successfully.")
     except Exception as e:
         logger.error(f"Error building FAISS index: {e}")
         return None
@@ -30,8 +132,8 @@ def build_faiss_index(chunks,model_name=chunking_model_name):
 
 def save_faiss_index(faiss_index, path=Path("data")/"faiss_index"):
 
-    if not path.parent.exists():
-        Path.mkdir(parents=True,exist_ok=True)
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
     try:
         faiss_index.save_local(str(path))
         logger.info(f"FAISS index saved successfully at {path}.")
@@ -39,7 +141,13 @@ def save_faiss_index(faiss_index, path=Path("data")/"faiss_index"):
         logger.error(f"Error saving FAISS index: {e}")
 
 
-def load_faiss_index(path=DATA_DIR, model_name=chunking_model_name):
+def load_faiss_index(path=DATA_DIR, model_name=chunking_model_name, mmap=False, search_params=None):
+    """
+    Load the saved index. With mmap=True the vector data is memory-mapped from
+    index.faiss instead of read onto the heap, so forked workers share its pages;
+    only for index types mmap_read_flag() knows, others stay on the heap with a warning.
+    search_params (default FAISS_SEARCH_PARAMS) are applied with set_search_params.
+    """
     path = Path(path)
     logger.debug(f"Attempting to load FAISS index from {path}")
 
@@ -47,10 +155,23 @@ def load_faiss_index(path=DATA_DIR, model_name=chunking_model_name):
         logger.error(f"FAISS index files not found in {path}.")
         return None
 
-    embedding_model = HuggingFaceEmbeddings(model_name=model_name)
+    embedding_model = get_embedder(model_name)
 
     try:
         faiss_index = FAISS.load_local(str(path), embedding_model, allow_dangerous_deserialization=True)
+        if mmap:
+            flag = mmap_read_flag(faiss_index.index)
+            index_type = type(faiss_index.index).__name__
+            if flag is None:
+                logger.warning(f"FAISS_MMAP has no effect on {index_type} with faiss {faiss.__version__}; "
+                               f"the index stays on each worker's heap.")
+            else:
+                try:
+                    faiss_index.index = faiss.read_index(str(path / "index.faiss"), flag)
+                except RuntimeError as e:
+                    logger.warning(f"{index_type} can't be memory-mapped, keeping it in memory: {e}")
+        set_search_params(faiss_index, parse_search_params(FAISS_SEARCH_PARAMS) if search_params is None
+                          else search_params)
         logger.info(f"FAISS index loaded successfully from {path}.")
         return faiss_index
     except Exception as e:
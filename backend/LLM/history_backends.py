@@ -0,0 +1,419 @@
+"""
+External chat history backends
+
+A ChatHistoryBackend persists each session's state (rolling summary plus recent
+messages, as JSON) outside the process, so every uvicorn worker sees the same
+history and it survives restarts. SessionStore (sessions.py) keeps a small
+in-process cache in front of it for the read path.
+
+    sqlite  - one local database file, shared by the workers on a host (WAL mode);
+              writes are coalesced per session and flushed in batches by a
+              background thread
+    redis   - any server speaking the Redis protocol (Redis, Valkey, KeyDB, a local
+              stand-in); expiry uses the server's own key TTLs. Talks RESP over a
+              plain socket, so no client library is needed.
+
+create_history_backend wraps either one in a ProcessLocalBackend, so each process
+(including every pre-forked worker) opens its own connection on first use.
+"""
+
+import atexit
+from abc import ABC, abstractmethod
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+from backend.LLM.config import (
+    CHAT_HISTORY_BACKEND,
+    CHAT_HISTORY_SQLITE_PATH,
+    CHAT_HISTORY_REDIS_URL,
+    MAX_SESSIONS,
+    SESSION_TTL_SECONDS,
+)
+from backend.src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ChatHistoryBackend(ABC):
+    """Storage for session states: {"summary": str, "messages": [message dicts]}"""
+
+    @abstractmethod
+    def load(self, session_id: str) -> Optional[Dict]:
+        """The session's state, or None if it doesn't exist or has expired"""
+
+    @abstractmethod
+    def save(self, session_id: str, state: Dict):
+        """Store the session's state, replacing any previous one"""
+
+    @abstractmethod
+    def delete(self, session_id: str) -> bool:
+        """Remove a session; True if it existed"""
+
+    @abstractmethod
+    def clear(self):
+        """Remove every session"""
+
+    @abstractmethod
+    def ids(self) -> List[str]:
+        """Ids of the sessions that haven't expired"""
+
+    def close(self):
+        pass
+
+
+class SQLiteHistoryBackend(ChatHistoryBackend):
+    """
+    Sessions in one SQLite table. save() only records the latest state per session in
+    memory; a background thread writes the pending states in one transaction every
+    flush_interval seconds (or sooner once batch_size sessions are pending). load()
+    checks the pending states, then the batch being written, so a worker always reads
+    its own writes.
+    """
+
+    def __init__(self, path: str = CHAT_HISTORY_SQLITE_PATH, ttl_seconds: float = SESSION_TTL_SECONDS,
+                 max_sessions: int = MAX_SESSIONS, flush_interval: float = 0.2, batch_size: int = 256):
+        self.path = str(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS chat_sessions "
+            "(session_id TEXT PRIMARY KEY, state TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS chat_sessions_updated ON chat_sessions (updated_at)")
+        self._db_lock = threading.Lock()
+
+        self._pending: Dict[str, Optional[str]] = {}  # session_id -> JSON state, None for a delete
+        self._flushing: Dict[str, Optional[str]] = {}  # the batch being written, until it commits
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # one flush (or clear) at a time
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="chat-history-flush", daemon=True)
+        self._flusher.start()
+
+    def load(self, session_id: str) -> Optional[Dict]:
+        with self._pending_lock:
+            for states in (self._pending, self._flushing):
+                if session_id in states:
+                    state = states[session_id]
+                    return json.loads(state) if state is not None else None
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT state FROM chat_sessions WHERE session_id = ? AND updated_at >= ?",
+                (session_id, time.time() - self.ttl_seconds),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, session_id: str, state: Dict):
+        with self._pending_lock:
+            self._pending[session_id] = json.dumps(state)
+            if len(self._pending) >= self.batch_size:
+                self._wake.set()
+
+    def delete(self, session_id: str) -> bool:
+        existed = self.load(session_id) is not None
+        with self._pending_lock:
+            self._pending[session_id] = None
+        return existed
+
+    def clear(self):
+        # Wait for a running flush, so it can't write back states taken before the clear
+        with self._flush_lock:
+            with self._pending_lock:
+                self._pending.clear()
+            with self._db_lock:
+                self._conn.execute("DELETE FROM chat_sessions")
+
+    def ids(self) -> List[str]:
+        self.flush()
+        with self._db_lock:
+            rows = self._conn.execute(
+                "SELECT session_id FROM chat_sessions WHERE updated_at >= ? ORDER BY updated_at",
+                (time.time() - self.ttl_seconds,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def flush(self):
+        """Write all pending states in one transaction, then drop expired and excess sessions"""
+        with self._flush_lock:
+            with self._pending_lock:
+                if not self._pending:
+                    return
+                # Stays readable through _flushing until the transaction commits
+                pending = self._flushing = self._pending
+                self._pending = {}
+            try:
+                self._write(pending)
+            except Exception:
+                # Put the batch back unless newer states arrived meanwhile
+                with self._pending_lock:
+                    for sid, state in pending.items():
+                        self._pending.setdefault(sid, state)
+                    self._flushing = {}
+                raise
+            with self._pending_lock:
+                self._flushing = {}
+
+    def _write(self, pending: Dict[str, Optional[str]]):
+        """One transaction: the batch's upserts and deletes, then TTL and max_sessions pruning"""
+        now = time.time()
+        upserts = [(sid, state, now) for sid, state in pending.items() if state is not None]
+        deletes = [(sid,) for sid, state in pending.items() if state is None]
+        with self._db_lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO chat_sessions (session_id, state, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(session_id) DO UPDATE SET state = excluded.state, updated_at = excluded.updated_at",
+                    upserts,
+                )
+                self._conn.executemany("DELETE FROM chat_sessions WHERE session_id = ?", deletes)
+                self._conn.execute("DELETE FROM chat_sessions WHERE updated_at < ?", (now - self.ttl_seconds,))
+                self._conn.execute(
+                    "DELETE FROM chat_sessions WHERE session_id IN (SELECT session_id FROM chat_sessions "
+                    "ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_sessions,),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _flush_loop(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Failed to flush chat history: {e}")
+
+    def close(self):
+        self._stop.set()
+        self._wake.set()
+        self._flusher.join(timeout=5)
+        self.flush()
+        with self._db_lock:
+            self._conn.close()
+
+
+class RespConnection:
+    """Minimal blocking Redis protocol (RESP2) client: one socket, one command at a time"""
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._sock = None
+        self._reader = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._reader = self._sock.makefile("rb")
+        if self.password:
+            self._call("AUTH", self.password)
+        if self.db:
+            self._call("SELECT", str(self.db))
+
+    def execute(self, *args):
+        with self._lock:
+            if self._sock is None:
+                self._connect()
+            try:
+                return self._call(*args)
+            except (OSError, ConnectionError):
+                # One reconnect for a dropped connection, then give up
+                self._close()
+                self._connect()
+                return self._call(*args)
+
+    def _call(self, *args):
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self._sock.sendall(b"".join(parts))
+        return self._read()
+
+    def _read(self):
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by server")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            raise RuntimeError(f"Redis error: {rest.decode()}")
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            count = int(rest)
+            return None if count < 0 else [self._read() for _ in range(count)]
+        raise ConnectionError(f"Unexpected reply: {line!r}")
+
+    def _close(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = self._reader = None
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+
+class RedisHistoryBackend(ChatHistoryBackend):
+    """
+    One string key per session, written with SET ... EX so the server expires idle
+    sessions. There is no session-count cap: size the server's maxmemory policy instead.
+    """
+
+    def __init__(self, url: str = CHAT_HISTORY_REDIS_URL, ttl_seconds: float = SESSION_TTL_SECONDS,
+                 prefix: str = "chat:session:"):
+        self.conn = RespConnection(url)
+        self.ttl_seconds = int(ttl_seconds)
+        self.prefix = prefix
+
+    def load(self, session_id: str) -> Optional[Dict]:
+        data = self.conn.execute("GET", self.prefix + session_id)
+        return json.loads(data) if data is not None else None
+
+    def save(self, session_id: str, state: Dict):
+        self.conn.execute("SET", self.prefix + session_id, json.dumps(state), "EX", self.ttl_seconds)
+
+    def delete(self, session_id: str) -> bool:
+        return self.conn.execute("DEL", self.prefix + session_id) > 0
+
+    def _keys(self) -> List[bytes]:
+        keys, cursor = [], "0"
+        while True:
+            cursor, batch = self.conn.execute("SCAN", cursor, "MATCH", self.prefix + "*", "COUNT", 500)
+            keys.extend(batch)
+            cursor = cursor.decode() if isinstance(cursor, bytes) else str(cursor)
+            if cursor == "0":
+                return keys
+
+    def clear(self):
+        keys = self._keys()
+        for start in range(0, len(keys), 500):
+            self.conn.execute("DEL", *keys[start:start + 500])
+
+    def ids(self) -> List[str]:
+        return [key.decode()[len(self.prefix):] for key in self._keys()]
+
+    def close(self):
+        self.conn.close()
+
+
+class ProcessLocalBackend(ChatHistoryBackend):
+    """
+    Creates its backend on first use in each process. SQLite connections, the SQLite
+    flusher thread and Redis sockets don't survive fork, so a pre-forked worker
+    (src/serve.py) builds its own instead of using one inherited from the parent.
+    """
+
+    def __init__(self, factory: Callable[[], ChatHistoryBackend]):
+        self.factory = factory
+        self._backend: Optional[ChatHistoryBackend] = None
+        self._pid: Optional[int] = None
+        # Inherited backends are kept referenced but never used or closed: closing an
+        # SQLite connection opened by another process can drop that process's locks
+        self._inherited: List[ChatHistoryBackend] = []
+        self._lock = threading.Lock()
+        _process_local_backends.append(self)
+
+    @property
+    def backend(self) -> ChatHistoryBackend:
+        pid = os.getpid()
+        if self._pid != pid:
+            with self._lock:
+                if self._pid != pid:
+                    if self._backend is not None:
+                        self._inherited.append(self._backend)
+                    self._backend = self.factory()
+                    self._pid = pid
+        return self._backend
+
+    def load(self, session_id: str) -> Optional[Dict]:
+        return self.backend.load(session_id)
+
+    def save(self, session_id: str, state: Dict):
+        self.backend.save(session_id, state)
+
+    def delete(self, session_id: str) -> bool:
+        return self.backend.delete(session_id)
+
+    def clear(self):
+        self.backend.clear()
+
+    def ids(self) -> List[str]:
+        return self.backend.ids()
+
+    def close(self):
+        """Close this process's backend, flushing its pending writes"""
+        with self._lock:
+            backend, owned = self._backend, self._pid == os.getpid()
+            if owned:
+                self._backend = self._pid = None
+        if backend is not None and owned:
+            backend.close()
+
+
+_process_local_backends: List[ProcessLocalBackend] = []
+
+
+def close_history_backends():
+    """
+    Close the backends this process created. Runs at interpreter exit; a pre-forked
+    worker leaves through os._exit, which skips atexit, so it calls this itself.
+    """
+    for backend in _process_local_backends:
+        try:
+            backend.close()
+        except Exception as e:
+            logger.error(f"Failed to close chat history backend: {e}")
+
+
+atexit.register(close_history_backends)
+
+
+def create_history_backend(kind: str = CHAT_HISTORY_BACKEND) -> Optional[ChatHistoryBackend]:
+    """
+    Backend named by CHAT_HISTORY_BACKEND; None keeps sessions in process memory.
+    The backend itself is created per process, on first use (see ProcessLocalBackend).
+    """
+    if kind == "memory":
+        return None
+    if kind == "sqlite":
+        logger.info(f"Chat history stored in SQLite: {CHAT_HISTORY_SQLITE_PATH}")
+        factory = SQLiteHistoryBackend
+    elif kind == "redis":
+        logger.info(f"Chat history stored in Redis: {urlparse(CHAT_HISTORY_REDIS_URL).hostname}")
+        factory = RedisHistoryBackend
+    else:
+        raise ValueError(f"Unknown chat history backend: {kind}")
+    return ProcessLocalBackend(factory)
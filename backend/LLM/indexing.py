@@ -1,38 +1,204 @@
-from src.utils.logger import get_logger
-from src.embeddings.faiss_indexing import save_faiss_index, build_faiss_index,load_faiss_index
-from src.loaders.pdf_loader import load_from_folder, load_pdfs
-from src.utils.chunking import chunk_documents
+"""
+Incremental ingestion of the PDF corpus into the FAISS index
+
+A manifest next to the index records, per PDF, the SHA-256 of its content and
+the docstore ids of its chunks. Re-indexing hashes the raw folder and only
+touches what changed: chunks of deleted or changed files are removed from the
+index, new and changed files go through the streaming ingestion pipeline
+(parallel parsing, chunking, batched embedding) and are added. The
+result is written to a temporary directory and swapped in place of the old
+index, so a crash never leaves a half-written index behind.
+
+The index is rebuilt from scratch when there is no manifest yet, when the
+embedding model, chunking or index spec changed, with --rebuild, or when the
+index type can't remove vectors in place (anything but Flat/PQ/SQ: IVF, HNSW, OPQ).
+
+Usage:
+    python -m backend.LLM.indexing [--raw-dir backend/LLM/data/raw_data] [--rebuild]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+from backend.LLM.config import EMBED_BATCH_SIZE, FAISS_INDEX_SPEC, INGEST_WORKERS, chunking_model_name
+from backend.LLM.embeddings import get_embedder
+from backend.LLM.faiss_indexing import (
+    DATA_DIR,
+    build_faiss_index_from_vectors,
+    load_faiss_index,
+    save_faiss_index,
+    supports_removal,
+)
+from backend.LLM.ingestion import IngestionProgress, ingest
+from backend.src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+RAW_DATA_DIR = Path(__file__).resolve().parent / "data" / "raw_data"
+MANIFEST_FILE = "manifest.json"
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_manifest(index_dir: Path) -> Dict:
+    path = Path(index_dir) / MANIFEST_FILE
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _settings(chunk_size: int, chunk_overlap: int, index_spec: str) -> Dict:
+    return {"model_name": chunking_model_name, "chunk_size": chunk_size, "chunk_overlap": chunk_overlap,
+            "index_spec": index_spec}
 
-def main():
-    # Initialize logger
-    logger = get_logger(__name__)
 
-    # Load documents from folder
-    folder_path = "data/raw_data"
-    documents = load_from_folder(folder_path)
+def _recover(index_dir: Path):
+    """Finish a swap interrupted between its two renames"""
+    backup = index_dir.with_name(index_dir.name + ".old")
+    if not index_dir.exists() and backup.exists():
+        os.rename(backup, index_dir)
+    elif backup.exists():
+        shutil.rmtree(backup)
 
-    if not documents:
-        logger.error("No documents loaded. Exiting.")
-        return
 
-    # Chunk documents
-    chunks = chunk_documents(documents, chunk_size=500, chunk_overlap=50)
+def _save_atomically(faiss_index, manifest: Dict, index_dir: Path):
+    """Write index + manifest to a sibling directory, then swap it in with two renames"""
+    tmp_dir = index_dir.with_name(f".{index_dir.name}.tmp-{uuid.uuid4().hex[:8]}")
+    save_faiss_index(faiss_index, tmp_dir)
+    if not (tmp_dir / "index.faiss").exists():
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise RuntimeError(f"Failed to write the index to {tmp_dir}")
+    with open(tmp_dir / MANIFEST_FILE, "w") as f:
+        json.dump(manifest, f, indent=2)
 
-    if not chunks:
-        logger.error("No chunks created. Exiting.")
-        return
+    backup = index_dir.with_name(index_dir.name + ".old")
+    if index_dir.exists():
+        os.rename(index_dir, backup)
+    os.rename(tmp_dir, index_dir)
+    shutil.rmtree(backup, ignore_errors=True)
 
-    # Build FAISS index
-    faiss_index = build_faiss_index(chunks)
 
-    if not faiss_index:
-        logger.error("FAISS index could not be built. Exiting.")
-        return
+def update_index(raw_dir=RAW_DATA_DIR, index_dir=DATA_DIR, chunk_size: int = 500, chunk_overlap: int = 50,
+                 index_spec: str = FAISS_INDEX_SPEC, rebuild: bool = False, workers: int = INGEST_WORKERS,
+                 batch_size: int = EMBED_BATCH_SIZE) -> Dict:
+    """
+    Bring the index in index_dir up to date with the PDFs in raw_dir
+
+    Returns:
+        {"added": [...], "changed": [...], "deleted": [...], "unchanged": int, "rebuilt": bool, "seconds": float,
+         "failed": [...]}
+    """
+    start = time.perf_counter()
+    raw_dir, index_dir = Path(raw_dir), Path(index_dir)
+    _recover(index_dir)
+
+    hashes = {path.name: file_sha256(path) for path in sorted(raw_dir.glob("*.pdf"))}
+    manifest = read_manifest(index_dir)
+    settings = _settings(chunk_size, chunk_overlap, index_spec)
+    known = manifest.get("files", {})
+
+    faiss_index = None
+    if not rebuild and known and manifest.get("settings") == settings:
+        faiss_index = load_faiss_index(index_dir)
+    if faiss_index is None:
+        known = {}
+
+    added = [name for name in hashes if name not in known]
+    changed = [name for name in hashes if name in known and known[name]["sha256"] != hashes[name]]
+    deleted = [name for name in known if name not in hashes]
+    unchanged = len(hashes) - len(added) - len(changed)
+    summary = {"added": added, "changed": changed, "deleted": deleted, "unchanged": unchanged,
+               "rebuilt": faiss_index is None}
+
+    if faiss_index is not None and not (added or changed or deleted):
+        logger.info(f"Index is up to date ({unchanged} files).")
+        return {**summary, "seconds": time.perf_counter() - start}
+
+    # Remove the vectors of deleted and changed files
+    stale_ids = [doc_id for name in deleted + changed for doc_id in known[name]["ids"]]
+    if faiss_index is not None and stale_ids and not supports_removal(faiss_index.index):
+        logger.info(f"{type(faiss_index.index).__name__} can't remove vectors in place; rebuilding from scratch.")
+        faiss_index = None
+        summary["rebuilt"] = True
+    if faiss_index is not None:
+        if stale_ids:
+            faiss_index.delete(stale_ids)
+        files = {name: entry for name, entry in known.items() if name not in deleted and name not in changed}
+        to_ingest = [raw_dir / name for name in added + changed]
+    else:
+        files = {}
+        to_ingest = [raw_dir / name for name in hashes]
+
+    # Embed and add new and changed files. An existing index takes each batch as it is embedded;
+    # a new one needs all vectors first (IVF/PQ train on them).
+    progress = IngestionProgress(len(to_ingest))
+    ingested_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+    all_chunks, all_vectors, all_ids = [], [], []
+    for names, chunks, vectors in ingest(to_ingest, get_embedder(), chunk_size, chunk_overlap, batch_size,
+                                         workers, progress):
+        ids = [str(uuid.uuid4()) for _ in chunks]
+        for name, doc_id in zip(names, ids):
+            files.setdefault(name, {"sha256": hashes[name], "ids": [], "ingested_at": ingested_at})["ids"].append(doc_id)
+        if faiss_index is None:
+            all_chunks.extend(chunks)
+            all_vectors.append(vectors)
+            all_ids.extend(ids)
+        else:
+            faiss_index.add_embeddings(zip([c.page_content for c in chunks], vectors),
+                                       metadatas=[c.metadata for c in chunks], ids=ids)
+
+    # Files that parsed but yielded no text still count as ingested; failed ones are retried next run
+    for path in to_ingest:
+        if path.name not in progress.failed:
+            files.setdefault(path.name, {"sha256": hashes[path.name], "ids": [], "ingested_at": ingested_at})
+
+    if faiss_index is None:
+        if not all_chunks:
+            raise RuntimeError("No text could be extracted from the PDFs; nothing to index.")
+        faiss_index = build_faiss_index_from_vectors(all_chunks, np.vstack(all_vectors), index_spec=index_spec,
+                                                     ids=all_ids)
+        if faiss_index is None:
+            raise RuntimeError("FAISS index could not be built.")
+
+    _save_atomically(faiss_index, {"version": 1, "settings": settings, "files": files}, index_dir)
+    summary["seconds"] = time.perf_counter() - start
+    summary["failed"] = sorted(progress.failed)
+    logger.info(f"Index updated in {summary['seconds']:.1f}s: {len(added)} added, {len(changed)} changed, "
+                f"{len(deleted)} deleted, {unchanged} unchanged, {progress.embedded} chunks embedded.")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--raw-dir", default=str(RAW_DATA_DIR))
+    parser.add_argument("--index-dir", default=str(DATA_DIR))
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--chunk-overlap", type=int, default=50)
+    parser.add_argument("--index-spec", default=FAISS_INDEX_SPEC)
+    parser.add_argument("--rebuild", action="store_true", help="Ignore the manifest and rebuild everything")
+    parser.add_argument("--workers", type=int, default=INGEST_WORKERS, help="PDF parser processes (0 = cores - 1)")
+    parser.add_argument("--batch-size", type=int, default=EMBED_BATCH_SIZE, help="Chunks per embedder call")
+    args = parser.parse_args()
+
+    update_index(args.raw_dir, args.index_dir, args.chunk_size, args.chunk_overlap, args.index_spec, args.rebuild,
+                 args.workers, args.batch_size)
 
-    # Save FAISS index
-    save_faiss_index(faiss_index)
-    logger.info("FAISS index creation and saving completed successfully.")
 
 if __name__ == "__main__":
     main()
-    load_faiss_index()
\ No newline at end of file
@@ -0,0 +1,110 @@
+"""
+Streaming ingestion pipeline: parse -> chunk -> embed
+
+PDFs are parsed in a process pool (pdf_loader.iter_pdfs). Their pages are
+split into chunks as each file arrives, while the other workers keep parsing.
+Chunks are queued and sent to the embedder in fixed-size batches, so the model
+always sees full batches and memory holds one batch of pending chunks, not the
+whole corpus. Progress and throughput are logged as the pipeline runs.
+"""
+
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from backend.LLM.chunking import make_splitter
+from backend.LLM.config import EMBED_BATCH_SIZE, INGEST_WORKERS
+from backend.LLM.pdf_loader import iter_pdfs
+from backend.src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class IngestionProgress:
+    """Counters for one ingestion run, logged every log_interval seconds"""
+
+    def __init__(self, total_files: int, log_interval: float = 10):
+        self.total_files = total_files
+        self.log_interval = log_interval
+        self.files = 0
+        self.pages = 0
+        self.chunks = 0
+        self.embedded = 0
+        self.failed: Dict[str, str] = {}
+        self.started = time.perf_counter()
+        self._last_log = self.started
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def summary(self) -> str:
+        elapsed = max(self.elapsed, 1e-9)
+        return (f"{self.files}/{self.total_files} files, {self.pages} pages, {self.chunks} chunks, "
+                f"{self.embedded} embedded in {elapsed:.1f}s "
+                f"({self.files / elapsed:.1f} files/s, {self.embedded / elapsed:.0f} chunks/s)")
+
+    def maybe_log(self):
+        if time.perf_counter() - self._last_log >= self.log_interval:
+            self._last_log = time.perf_counter()
+            logger.info(f"Ingesting: {self.summary()}")
+
+
+def iter_file_chunks(pdf_paths, chunk_size: int = 500, chunk_overlap: int = 50, workers: int = INGEST_WORKERS,
+                     progress: IngestionProgress = None) -> Iterator[Tuple[str, List]]:
+    """Yield (file name, chunks) per PDF, in the order the parsers finish"""
+    splitter = make_splitter(chunk_size, chunk_overlap)
+    for path, pages, error in iter_pdfs(pdf_paths, workers):
+        if error is not None:
+            logger.warning(f"Could not parse {path.name}: {error}")
+            if progress is not None:
+                progress.failed[path.name] = str(error)
+            continue
+        chunks = splitter.split_documents(pages) if pages else []
+        if progress is not None:
+            progress.files += 1
+            progress.pages += len(pages)
+            progress.chunks += len(chunks)
+            progress.maybe_log()
+        yield path.name, chunks
+
+
+def iter_embedded_batches(file_chunks: Iterator[Tuple[str, List]], embedder, batch_size: int = EMBED_BATCH_SIZE,
+                          progress: IngestionProgress = None) -> Iterator[Tuple[List[str], List, np.ndarray]]:
+    """
+    Regroup per-file chunks into batches of batch_size (the last one may be smaller) and
+    embed each. Yields (file names, chunks, float32 vectors), aligned row by row.
+    """
+    names, chunks = [], []
+
+    def flush():
+        vectors = np.asarray(embedder.embed_documents([c.page_content for c in chunks]), dtype=np.float32)
+        if progress is not None:
+            progress.embedded += len(chunks)
+            progress.maybe_log()
+        return names, chunks, vectors
+
+    for name, chunks_of_file in file_chunks:
+        for chunk in chunks_of_file:
+            names.append(name)
+            chunks.append(chunk)
+            if len(chunks) == batch_size:
+                yield flush()
+                names, chunks = [], []
+    if chunks:
+        yield flush()
+
+
+def ingest(pdf_paths, embedder, chunk_size: int = 500, chunk_overlap: int = 50, batch_size: int = EMBED_BATCH_SIZE,
+           workers: int = INGEST_WORKERS, progress: IngestionProgress = None):
+    """The full pipeline over pdf_paths: yields (file names, chunks, vectors) batches"""
+    pdf_paths = [Path(p) for p in pdf_paths]
+    if progress is None:
+        progress = IngestionProgress(len(pdf_paths))
+    file_chunks = iter_file_chunks(pdf_paths, chunk_size, chunk_overlap, workers, progress)
+    yield from iter_embedded_batches(file_chunks, embedder, batch_size, progress)
+    logger.info(f"Ingestion finished: {progress.summary()}")
+    if progress.failed:
+        logger.warning(f"{len(progress.failed)} files could not be parsed: {', '.join(sorted(progress.failed))}")
@@ -0,0 +1,53 @@
+"""
+In-process counters and latency windows for the chat pipeline, exposed at GET /chat/metrics
+"""
+
+import threading
+from collections import defaultdict, deque
+from typing import Dict
+
+import numpy as np
+
+
+class ChatMetrics:
+    """Thread-safe named counters plus the last `window` observations per latency"""
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self._counters: Dict[str, int] = defaultdict(int)
+        self._latencies: Dict[str, deque] = defaultdict(lambda: deque(maxlen=self.window))
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: int = 1):
+        with self._lock:
+            self._counters[name] += value
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            self._latencies[name].append(seconds * 1000)
+
+    def snapshot(self) -> Dict:
+        """{"counters": {...}, "latency_ms": {name: {count, p50, p95, max}}}"""
+        with self._lock:
+            counters = dict(self._counters)
+            latencies = {name: np.array(values) for name, values in self._latencies.items() if values}
+        return {
+            "counters": counters,
+            "latency_ms": {
+                name: {
+                    "count": len(values),
+                    "p50": float(np.percentile(values, 50)),
+                    "p95": float(np.percentile(values, 95)),
+                    "max": float(values.max()),
+                }
+                for name, values in latencies.items()
+            },
+        }
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._latencies.clear()
+
+
+chat_metrics = ChatMetrics()
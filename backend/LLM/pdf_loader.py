@@ -1,3 +1,7 @@
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
 from langchain_community.document_loaders import PyPDFLoader
 from pathlib import Path
 from backend.src.utils.logger import get_logger
@@ -5,6 +9,10 @@ from backend.src.utils.logger import get_logger
 # Initialize logger
 logger=get_logger(__name__)
 
+# Function to load the pages of one PDF (top-level so worker processes can run it)
+def load_pdf(path):
+    return PyPDFLoader(str(path)).load()
+
 #Function to load PDFs from a list of paths
 def load_pdfs(pdf_paths):
     documents = []
@@ -13,12 +21,51 @@ def load_pdfs(pdf_paths):
         if not pdf_path.exists():
             logger.warning(f"File {pdf_path} does not exist. Skipping.")
             continue
-        loader=PyPDFLoader(str(pdf_path))
-        docs=loader.load()
-        print(f"[Info] Loaded {len(docs)} documents from {pdf_path.name}")
+        docs=load_pdf(pdf_path)
+        logger.info(f"Loaded {len(docs)} documents from {pdf_path.name}")
         documents.extend(docs)
     return documents
 
+def iter_pdfs(pdf_paths, workers=0):
+    """
+    Parse PDFs in a process pool and yield (path, pages, error) as each one finishes,
+    in completion order. workers=0 uses one process per core minus one; workers=1
+    parses in this process. At most 2 x workers files are in flight, so pages never
+    pile up faster than the caller consumes them.
+    """
+    paths = [Path(p) for p in pdf_paths]
+    for path in [p for p in paths if not p.exists()]:
+        logger.warning(f"File {path} does not exist. Skipping.")
+    paths = [p for p in paths if p.exists()]
+
+    workers = workers or max(1, (os.cpu_count() or 2) - 1)
+    if workers == 1 or len(paths) <= 1:
+        for path in paths:
+            try:
+                yield path, load_pdf(path), None
+            except Exception as e:
+                yield path, [], e
+        return
+
+    # spawn: the parent may already run torch threads, which don't survive a fork
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        pending = {}
+        queue = iter(paths)
+        while True:
+            for path in queue:
+                pending[pool.submit(load_pdf, path)] = path
+                if len(pending) >= 2 * workers:
+                    break
+            if not pending:
+                return
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                try:
+                    yield path, future.result(), None
+                except Exception as e:
+                    yield path, [], e
+
 # Function to load all PDF paths from a folder
 def load_from_folder(folder_path):
     folder=Path(folder_path)
@@ -26,4 +73,4 @@ def load_from_folder(folder_path):
     if not pdf_files:
         logger.warning(f"No PDF files found in folder {folder_path}.")
         return []
-    return load_pdfs([str(f) for f in pdf_files])
\ No newline at end of file
+    return load_pdfs([str(f) for f in pdf_files])
@@ -7,34 +7,53 @@ from operator import itemgetter
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.runnables.history import RunnableWithMessageHistory
-from langchain_core.chat_history import InMemoryChatMessageHistory
-from langchain_classic.chains import create_history_aware_retriever, create_retrieval_chain
+from langchain_classic.chains import create_retrieval_chain
 from langchain_classic.chains.combine_documents import create_stuff_documents_chain
-from langchain_core.runnables import RunnablePassthrough, RunnableMap
+from langchain_core.runnables import RunnablePassthrough, RunnableMap, RunnableLambda
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.messages import AIMessage, HumanMessage
 import tiktoken
-from backend.LLM.config import MAX_INPUT_TOKENS, model_name
+import re
 
+from backend.LLM.config import MAX_INPUT_TOKENS, model_name, SKIP_REWRITE_FOR_STANDALONE
+from backend.LLM.metrics import chat_metrics
+from backend.LLM.history_backends import create_history_backend
+from backend.LLM.sessions import SessionStore
+
+import asyncio
 import json
-from typing import AsyncIterator
+from typing import AsyncIterator, Optional
 
 load_dotenv()
 logger = get_logger(__name__)
 
-# Session management
-session_store = {}
+# Tag on the answer-generating LLM run, so streaming can tell its tokens apart
+# from those of the question-rewriting LLM in the history-aware retriever
+ANSWER_TAG = "qa_answer"
+
+# Semantic cache of first-turn answers (see answer_cache.py); set by the LLM service
+answer_cache = None
+
+
+def set_answer_cache(cache):
+    global answer_cache
+    answer_cache = cache
+
+
+# Session management: bounded LRU/TTL store of windowed histories (see sessions.py),
+# optionally backed by SQLite or Redis so all workers share them (CHAT_HISTORY_BACKEND)
+session_store = SessionStore(backend=create_history_backend())
 
 
 # TODO: Cloud deployement
 def get_session_history(session_id: str):
-    if session_id not in session_store:
-        session_store[session_id] = InMemoryChatMessageHistory()
-    return session_store[session_id]
+    """Trimmed history of a session: rolling summary plus the most recent turns"""
+    return session_store.get(session_id)
 
 
 def clear_session(session_id: str):
     """Clear a specific session's chat history"""
-    if session_id in session_store:
-        del session_store[session_id]
+    if session_store.delete(session_id):
         logger.info(f"Cleared session: {session_id}")
         return True
     return False
@@ -48,7 +67,35 @@ def clear_all_sessions():
 
 def get_active_sessions():
     """Get list of active session IDs"""
-    return list(session_store.keys())
+    return session_store.ids()
+
+
+# Conditional question rewrite
+
+# Words that usually point back into the conversation ("is it safe?", "what about those?")
+_REFERRING_WORDS = re.compile(
+    r"\b(it|its|it's|this|that|these|those|they|them|their|there|he|she|him|her|his|one|ones|"
+    r"above|previous|earlier|same|else|instead|also|too|more|again)\b",
+    re.IGNORECASE,
+)
+_FOLLOW_UP_OPENERS = re.compile(r"^\s*(and|but|so|or|what about|how about|then|ok|okay)\b", re.IGNORECASE)
+
+
+def is_standalone_question(question: str, min_words: int = 4) -> bool:
+    """
+    Cheap local check that a question can be retrieved for without the chat history:
+    long enough, not opening like a follow-up, and free of words referring back.
+    Errs towards False, which only costs the rewrite call it would have saved.
+    """
+    if len(question.split()) < min_words:
+        return False
+    if _FOLLOW_UP_OPENERS.search(question):
+        return False
+    return _REFERRING_WORDS.search(question) is None
+
+
+def _record_rewrite(run):
+    chat_metrics.observe("rewrite", (run.end_time - run.start_time).total_seconds())
 
 
 # Setting Input Token Limits
@@ -104,8 +151,24 @@ def create_qa_chain(faiss_index, model_name, streaming=False, ):
             MessagesPlaceholder(variable_name="chat_history"),
             ("human", "{input}")
         ])
-        history_aware_retriever = create_history_aware_retriever(
-            llm, retriever, contextualize_q_prompt
+        rewrite_question = (contextualize_q_prompt | llm | StrOutputParser()).with_listeners(
+            on_end=_record_rewrite
+        )
+
+        def contextualize(inputs):
+            """Question to retrieve with: rewritten only when it may depend on the history"""
+            if not inputs.get("chat_history"):
+                chat_metrics.increment("rewrite_skipped_empty_history")
+                return inputs["input"]
+            if SKIP_REWRITE_FOR_STANDALONE and is_standalone_question(inputs["input"]):
+                chat_metrics.increment("rewrite_skipped_standalone")
+                return inputs["input"]
+            chat_metrics.increment("rewrite_calls")
+            # A returned runnable is invoked with the same inputs (sync or async)
+            return rewrite_question
+
+        history_aware_retriever = (RunnableLambda(contextualize) | retriever).with_config(
+            run_name="chat_retriever_chain"
         )
 
         # --- 2. Document Combination Chain (Answer Generation) ---
@@ -127,7 +190,7 @@ def create_qa_chain(faiss_index, model_name, streaming=False, ):
             MessagesPlaceholder(variable_name="chat_history"),
             ("human", "{input}")
         ])
-        document_combiner = create_stuff_documents_chain(llm, qa_prompt)
+        document_combiner = create_stuff_documents_chain(llm.with_config(tags=[ANSWER_TAG]), qa_prompt)
 
         # --- 3. Final Retrieval Chain ---
         final_retrieval_chain = create_retrieval_chain(
@@ -160,6 +223,54 @@ def create_qa_chain(faiss_index, model_name, streaming=False, ):
         return None
 
 
+def _source_names(documents) -> set:
+    """File names of the retrieved documents"""
+    sources_info = set()
+    for doc in documents:
+        metadata = getattr(doc, "metadata", {})
+        source_path = metadata.get("source") or metadata.get("file_name") or "unknown"
+        sources_info.add(os.path.basename(source_path))
+    return sources_info
+
+
+def _format_response(response: dict, session_id: str, history=None) -> dict:
+    """Answer, source file names and full session history for a chain response"""
+    # Get answer text (now both 'answer' and 'output' should exist)
+    answer = response.get("answer") or response.get("output") or ""
+
+    # Get sources (documents)
+    sources_info = _source_names(response.get("context", []))
+
+    # Fetch full chat history from session store (async callers pass it in, fetched with aget)
+    history_obj = history if history is not None else get_session_history(session_id)
+    chat_history_list = [{"role": msg.type, "content": msg.content} for msg in history_obj.messages]
+
+    return {
+        "answer": answer,
+        "sources": list(sources_info),
+        "session_id": session_id,
+        "chat_history": chat_history_list
+    }
+
+
+def _is_first_turn(history) -> bool:
+    # Only first-turn answers are cached: later ones depend on the conversation
+    return answer_cache is not None and not history.messages
+
+
+def _cached_answer(question: str, session_id: str) -> Optional[dict]:
+    """Cached response for a first-turn question, recorded in the session like a generated answer"""
+    hit = answer_cache.lookup(question)
+    if hit is None:
+        return None
+    logger.info(f"Answer cache hit for session {session_id} (similarity {hit['similarity']:.3f})")
+    get_session_history(session_id).add_messages([HumanMessage(content=question), AIMessage(content=hit["answer"])])
+    response = _format_response({"answer": hit["answer"]}, session_id)
+    response["sources"] = hit["sources"]
+    response["cached"] = True
+    return response
+
+
 def chat(chat_chain, question: str, session_id: str):
     """
     Send a question to the memory-aware chat chain and return a consistent output including chat history.
@@ -186,35 +297,142 @@ def chat(chat_chain, question: str, session_id: str):
 
         question = enforce_token_limit(question, model_name=model_name, max_tokens=MAX_INPUT_TOKENS)
 
+        first_turn = _is_first_turn(get_session_history(session_id))
+        if first_turn:
+            cached = _cached_answer(question, session_id)
+            if cached is not None:
+                return cached
+
         # Invoke chain with memory
         response = chat_chain.invoke(
             {"input": question},
             config={"configurable": {"session_id": session_id}}
         )
 
-        # Get answer text (now both 'answer' and 'output' should exist)
-        answer = response.get("answer") or response.get("output") or ""
-
-        # Get sources (documents)
-        sources = response.get("context", [])
-        sources_info = set()
-        for doc in sources:
-            metadata = getattr(doc, "metadata", {})
-            source_path = metadata.get("source") or metadata.get("file_name") or "unknown"
-            sources_info.add(os.path.basename(source_path))
-
-        # Fetch full chat history from session store
-        history_obj = get_session_history(session_id)
-        chat_history_list = [{"role": msg.type, "content": msg.content} for msg in history_obj.messages]
-
-        return {
-            "answer": answer,
-            "sources": list(sources_info),
-            "session_id": session_id,
-            "chat_history": chat_history_list
-        }
+        result = _format_response(response, session_id)
+        if first_turn:
+            answer_cache.store(question, result["answer"], result["sources"])
+        return result
+
+    except Exception as e:
+        logger.error(f"Error processing chat: {e}")
+        return None
+
+
+async def achat(chat_chain, question: str, session_id: str, timeout: Optional[float] = None):
+    """
+    Async chat(): runs the chain with ainvoke, so the event loop keeps serving other
+    requests while the LLM round-trips are in flight.
+
+    Args:
+        chat_chain: The initialized QA chain
+        question: User's question
+        session_id: Unique identifier for the user/session
+        timeout: Seconds before the chain is cancelled (no limit if None)
+
+    Returns:
+        The same dict as chat(), or None if the chain fails
+
+    Raises:
+        asyncio.TimeoutError: If the chain doesn't finish within timeout
+    """
+    if chat_chain is None:
+        logger.error("Chat chain is None. Cannot process the question.")
+        return None
+
+    logger.info(f"Processing question: {question} for session: {session_id}")
+    question = enforce_token_limit(question, model_name=model_name, max_tokens=MAX_INPUT_TOKENS)
+
+    # History reads from an external backend block; aget does them in a worker thread and
+    # leaves the history cached for the chain's own synchronous get_session_history call
+    first_turn = _is_first_turn(await session_store.aget(session_id))
+    if first_turn:
+        # Embedding the question is CPU work; keep it off the event loop
+        cached = await asyncio.to_thread(_cached_answer, question, session_id)
+        if cached is not None:
+            return cached
 
+    try:
+        response = await asyncio.wait_for(
+            chat_chain.ainvoke({"input": question}, config={"configurable": {"session_id": session_id}}),
+            timeout=timeout,
+        )
+    except asyncio.TimeoutError:
+        logger.warning(f"Chat for session {session_id} timed out after {timeout}s")
+        raise
     except Exception as e:
         logger.error(f"Error processing chat: {e}")
         return None
 
+    result = _format_response(response, session_id, await session_store.aget(session_id))
+    if first_turn:
+        await asyncio.to_thread(answer_cache.store, question, result["answer"], result["sources"])
+    return result
+
+
+async def chat_stream(chat_chain, question: str, session_id: str) -> AsyncIterator[dict]:
+    """
+    Stream an answer from the memory-aware chat chain as events, in the order they are produced:
+
+        {"type": "session_init", "session_id": str}
+        {"type": "sources", "sources": List[str]}    once the retriever has returned
+        {"type": "token", "content": str}            one per answer token delta
+        {"type": "done", "session_id": str, "answer": str, "sources": List[str], "cached": bool}
+        {"type": "error", "content": str}            instead of "done" if the chain fails
+
+    The session history is updated when the chain finishes, as with chat(). An answer
+    cache hit is sent as a single token event.
+
+    Args:
+        chat_chain: The streaming QA chain (create_qa_chain(..., streaming=True))
+        question: User's question
+        session_id: Unique identifier for the user/session
+    """
+    yield {"type": "session_init", "session_id": session_id}
+
+    if chat_chain is None:
+        logger.error("Chat chain is None. Cannot process the question.")
+        yield {"type": "error", "content": "Chat service unavailable."}
+        return
+
+    logger.info(f"Streaming question: {question} for session: {session_id}")
+    question = enforce_token_limit(question, model_name=model_name, max_tokens=MAX_INPUT_TOKENS)
+
+    first_turn = _is_first_turn(await session_store.aget(session_id))
+    if first_turn:
+        cached = await asyncio.to_thread(_cached_answer, question, session_id)
+        if cached is not None:
+            yield {"type": "sources", "sources": cached["sources"]}
+            yield {"type": "token", "content": cached["answer"]}
+            yield {"type": "done", "session_id": session_id, "answer": cached["answer"],
+                   "sources": cached["sources"], "cached": True}
+            return
+
+    answer_parts = []
+    sources = []
+    try:
+        # The chain ends in a plain function, which buffers astream() output until the
+        # answer is complete; astream_events reports the inner runs as they happen
+        async for event in chat_chain.astream_events(
+            {"input": question},
+            config={"configurable": {"session_id": session_id}},
+            version="v2",
+        ):
+            kind = event["event"]
+            if kind == "on_retriever_end" and not sources:
+                sources = sorted(_source_names(event["data"].get("output") or []))
+                yield {"type": "sources", "sources": sources}
+            elif kind == "on_chat_model_stream" and ANSWER_TAG in event.get("tags", []):
+                delta = event["data"]["chunk"].content
+                if delta:
+                    answer_parts.append(delta)
+                    yield {"type": "token", "content": delta}
+    except Exception as e:
+        logger.error(f"Error streaming chat: {e}", exc_info=True)
+        yield {"type": "error", "content": "Error processing question"}
+        return
+
+    answer = "".join(answer_parts)
+    if first_turn:
+        await asyncio.to_thread(answer_cache.store, question, answer, sources)
+    yield {"type": "done", "session_id": session_id, "answer": answer, "sources": sources, "cached": False}
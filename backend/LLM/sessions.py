@@ -0,0 +1,243 @@
+"""
+Bounded chat session store
+
+Sessions live in an LRU map with a maximum size and an idle TTL. Each session
+keeps only a window of recent turns within a token budget; turns that fall out
+of the window are folded into a rolling summary, which is replayed to the
+chain as a single system message ahead of the recent turns. Prompt size per
+turn is therefore bounded no matter how long a conversation runs.
+
+With an external ChatHistoryBackend (history_backends.py) the backend holds the
+sessions and the LRU map becomes a read cache whose entries are reused for
+HISTORY_CACHE_TTL_SECONDS; every change is written through to the backend.
+Async callers use SessionStore.aget, which does those backend reads in a worker
+thread instead of on the event loop.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, List, Optional, Sequence
+
+import tiktoken
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import BaseMessage, SystemMessage, messages_from_dict, messages_to_dict
+
+from backend.LLM.config import (
+    model_name,
+    MAX_SESSIONS,
+    SESSION_TTL_SECONDS,
+    HISTORY_MAX_TURNS,
+    HISTORY_MAX_TOKENS,
+    SUMMARY_MAX_TOKENS,
+    HISTORY_CACHE_TTL_SECONDS,
+)
+from backend.LLM.history_backends import ChatHistoryBackend
+from backend.src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:"
+
+
+@lru_cache(maxsize=8)
+def _encoding(name: str):
+    try:
+        return tiktoken.encoding_for_model(name)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def count_message_tokens(messages: Sequence[BaseMessage]) -> int:
+    enc = _encoding(model_name)
+    return sum(len(enc.encode(str(m.content))) for m in messages)
+
+
+def truncate_tokens(text: str, max_tokens: int, keep: str = "end") -> str:
+    """Cut text to max_tokens, keeping its start or its end"""
+    enc = _encoding(model_name)
+    tokens = enc.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return enc.decode(tokens[-max_tokens:] if keep == "end" else tokens[:max_tokens])
+
+
+def extractive_summary(summary: str, evicted: List[BaseMessage]) -> str:
+    """
+    Default summarizer: appends a shortened line per evicted message and keeps the
+    most recent SUMMARY_MAX_TOKENS of the result. No LLM call on the request path.
+    """
+    roles = {"human": "User", "ai": "Assistant"}
+    lines = [summary] if summary else []
+    for message in evicted:
+        text = truncate_tokens(" ".join(str(message.content).split()), 60, keep="start")
+        lines.append(f"{roles.get(message.type, message.type)}: {text}")
+    return truncate_tokens("\n".join(lines), SUMMARY_MAX_TOKENS, keep="end")
+
+
+class WindowedChatMessageHistory(BaseChatMessageHistory):
+    """
+    Chat history that keeps the last max_turns turns within max_tokens and a rolling
+    summary of everything older. `messages` is the trimmed view sent to the chain.
+    """
+
+    def __init__(self, max_turns: int = HISTORY_MAX_TURNS, max_tokens: int = HISTORY_MAX_TOKENS,
+                 summarizer: Callable[[str, List[BaseMessage]], str] = extractive_summary):
+        self.max_turns = max_turns
+        self.max_tokens = max_tokens
+        self.summarizer = summarizer
+        self.summary = ""
+        self.recent: List[BaseMessage] = []
+        # Token count of each message in recent, so trimming never re-tokenizes the window
+        self._token_counts: List[int] = []
+        # Called with the history after every change, e.g. to write it to a backend
+        self.on_change: Optional[Callable[["WindowedChatMessageHistory"], None]] = None
+
+    def to_state(self) -> dict:
+        return {"summary": self.summary, "messages": messages_to_dict(self.recent)}
+
+    def load_state(self, state: dict):
+        self.summary = state.get("summary", "")
+        self.recent = messages_from_dict(state.get("messages", []))
+        self._token_counts = [count_message_tokens([m]) for m in self.recent]
+
+    @property
+    def messages(self) -> List[BaseMessage]:
+        if not self.summary:
+            return list(self.recent)
+        return [SystemMessage(content=f"{SUMMARY_PREFIX}\n{self.summary}")] + self.recent
+
+    def add_messages(self, messages: Sequence[BaseMessage]) -> None:
+        self.recent.extend(messages)
+        self._token_counts.extend(count_message_tokens([m]) for m in messages)
+        self._trim()
+        if self.on_change:
+            self.on_change(self)
+
+    def _trim(self):
+        # A turn is a human message plus the answer, so the window is counted in message pairs
+        start, remaining, tokens = 0, len(self.recent), sum(self._token_counts)
+        while remaining > 0 and (remaining > 2 * self.max_turns or (remaining > 2 and tokens > self.max_tokens)):
+            tokens -= sum(self._token_counts[start:start + 2])
+            start += 2
+            remaining -= 2
+        if start:
+            evicted = self.recent[:start]
+            self.recent = self.recent[start:]
+            self._token_counts = self._token_counts[start:]
+            self.summary = self.summarizer(self.summary, evicted)
+
+    def clear(self) -> None:
+        self.summary = ""
+        self.recent = []
+        self._token_counts = []
+        if self.on_change:
+            self.on_change(self)
+
+
+class SessionStore:
+    """
+    Thread-safe LRU of chat histories: at most max_sessions sessions, each dropped
+    after ttl_seconds without use. With a backend, the LRU caches what the backend
+    holds and entries older than cache_ttl_seconds are reloaded from it.
+    """
+
+    def __init__(self, max_sessions: int = MAX_SESSIONS, ttl_seconds: float = SESSION_TTL_SECONDS,
+                 history_factory: Callable[[], WindowedChatMessageHistory] = WindowedChatMessageHistory,
+                 backend: Optional[ChatHistoryBackend] = None,
+                 cache_ttl_seconds: float = HISTORY_CACHE_TTL_SECONDS):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.history_factory = history_factory
+        self.backend = backend
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self._sessions: "OrderedDict[str, tuple]" = OrderedDict()  # id -> (history, last_used, loaded_at)
+        self._lock = threading.Lock()
+
+    def _cached(self, session_id: str, now: float) -> Optional[BaseChatMessageHistory]:
+        """The cached history if it is still fresh, marked most recently used"""
+        with self._lock:
+            self._evict_expired(now)
+            entry = self._sessions.get(session_id)
+            if entry and (self.backend is None or now - entry[2] <= self.cache_ttl_seconds):
+                self._sessions.move_to_end(session_id)
+                self._sessions[session_id] = (entry[0], now, entry[2])
+                return entry[0]
+        return None
+
+    def get(self, session_id: str) -> BaseChatMessageHistory:
+        """The session's history, created if missing or expired; marks it most recently used"""
+        now = time.monotonic()
+        history = self._cached(session_id, now)
+        if history is not None:
+            return history
+
+        # Miss or stale cache entry: read the backend outside the lock
+        history = self.history_factory()
+        if self.backend is not None:
+            state = self.backend.load(session_id)
+            if state:
+                history.load_state(state)
+            history.on_change = lambda h: self.backend.save(session_id, h.to_state())
+
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            self._sessions[session_id] = (history, now, now)
+            while len(self._sessions) > self.max_sessions:
+                evicted_id, _ = self._sessions.popitem(last=False)
+                logger.info(f"Evicted least recently used session: {evicted_id}")
+        return history
+
+    async def aget(self, session_id: str) -> BaseChatMessageHistory:
+        """
+        get() for the event loop: a fresh cache entry is returned directly, a backend
+        read runs in a worker thread. The entry it loads is then fresh, so a get() for
+        the same session right after (e.g. by RunnableWithMessageHistory) is a cache hit.
+        """
+        if self.backend is None:
+            return self.get(session_id)
+        history = self._cached(session_id, time.monotonic())
+        if history is not None:
+            return history
+        return await asyncio.to_thread(self.get, session_id)
+
+    def _evict_expired(self, now: float):
+        # Oldest first, so stop at the first session still within its TTL
+        while self._sessions:
+            session_id, (_, last_used, _) = next(iter(self._sessions.items()))
+            if now - last_used <= self.ttl_seconds:
+                break
+            self._sessions.popitem(last=False)
+            logger.info(f"Evicted idle session: {session_id}")
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            cached = self._sessions.pop(session_id, None) is not None
+        if self.backend is not None:
+            return self.backend.delete(session_id)
+        return cached
+
+    def clear(self):
+        with self._lock:
+            self._sessions.clear()
+        if self.backend is not None:
+            self.backend.clear()
+
+    def ids(self) -> List[str]:
+        if self.backend is not None:
+            return self.backend.ids()
+        with self._lock:
+            self._evict_expired(time.monotonic())
+            return list(self._sessions.keys())
+
+    def close(self):
+        if self.backend is not None:
+            self.backend.close()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: Optional[str]) -> bool:
+        return session_id in self._sessions
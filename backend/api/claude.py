@@ -21,6 +21,12 @@ Usage:
     client.devices.send_command(device_id="device-123", command="POWER_ON")
 """
 
+import contextlib
+import json
+import os
+import tempfile
+import time
+
 import requests
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
@@ -722,7 +728,8 @@ class HarviaAPI:
     ENDPOINTS_URL = "https://prod.api.harvia.io/endpoints"
 
     def __init__(self, username: Optional[str] = None, password: Optional[str] = None,
-                 auto_authenticate: bool = True):
+                 auto_authenticate: bool = True, config_cache_path: Optional[str] = None,
+                 config_ttl: float = 86400):
         """
         Initialize Harvia API client
 
@@ -730,8 +737,12 @@ class HarviaAPI:
             username: User's username/email (optional if not auto_authenticating)
             password: User's password (optional if not auto_authenticating)
             auto_authenticate: Automatically authenticate on initialization
+            config_cache_path: JSON file caching the /endpoints configuration (no cache if None)
+            config_ttl: Seconds a cached configuration stays fresh
         """
-        self.config = self._fetch_configuration()
+        self.config_cache_path = config_cache_path
+        self.config_ttl = config_ttl
+        self.config = self._load_configuration()
         self.auth = HarviaAuth(self.config["generic_rest_api_url"])
 
         # Initialize services with proper REST API URLs
@@ -756,6 +767,47 @@ class HarviaAPI:
         if auto_authenticate and username and password:
             self.authenticate(username, password)
 
+    def _load_configuration(self) -> Dict[str, Any]:
+        """
+        Configuration from the on-disk cache while it is fresh, otherwise from /endpoints.
+        A stale cache is still used if the endpoints request fails.
+
+        Returns:
+            Configuration dictionary
+        """
+        cached = None
+        if self.config_cache_path and os.path.exists(self.config_cache_path):
+            try:
+                with open(self.config_cache_path) as f:
+                    cached = json.load(f)
+            except (OSError, ValueError):
+                cached = None
+            if cached is not None and time.time() - os.path.getmtime(self.config_cache_path) < self.config_ttl:
+                return cached
+
+        try:
+            config = self._fetch_configuration()
+        except APIRequestError:
+            if cached is not None:
+                return cached
+            raise
+
+        if self.config_cache_path:
+            cache_dir = os.path.dirname(os.path.abspath(self.config_cache_path))
+            os.makedirs(cache_dir, exist_ok=True)
+            # Unique temp file per writer: pre-forked workers refresh the cache concurrently
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=f"{os.path.basename(self.config_cache_path)}.",
+                                            suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(config, f)
+                os.replace(tmp_path, self.config_cache_path)
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_path)
+                raise
+        return config
+
     def _fetch_configuration(self) -> Dict[str, Any]:
         """
         Fetch API configuration from endpoints
@@ -839,7 +891,7 @@ class HarviaAPI:
 # # Example usage
 # if __name__ == "__main__":
 #     # Initialize client
-#     client = HarviaAPI(username="harviahackathon2025@gmail.com", password="junction25!")
+#     client = HarviaAPI(username=os.environ["HARVIA_USERNAME"], password=os.environ["HARVIA_PASSWORD"])
 #
 #
 #     print(f"API Version: {client.get_api_version()}")
@@ -0,0 +1,79 @@
+"""
+Benchmark cold loading of the preprocessing state: legacy pickles vs. the NumPy-only artifact
+
+Each variant runs in a fresh interpreter so import cost (sklearn for the
+pickles, NumPy only for the artifact) is included, as it is at service start.
+The artifact is converted from the pickles into a temporary directory first.
+
+Usage:
+    python -m backend.benchmarks.benchmark_artifacts [--scaler backend/predictive_model/sauna_scaler.pkl] [--runs 10]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from backend.predictive_model.artifacts import convert_pickles
+
+PREDICTIVE_DIR = Path(__file__).resolve().parent.parent / "predictive_model"
+
+PICKLE_SNIPPET = """
+import pickle, time
+start = time.perf_counter()
+with open({scaler!r}, 'rb') as f:
+    scaler = pickle.load(f)
+with open({encoders!r}, 'rb') as f:
+    encoders = pickle.load(f)
+print(time.perf_counter() - start)
+"""
+
+ARTIFACT_SNIPPET = """
+import time
+start = time.perf_counter()
+from backend.predictive_model.artifacts import load_preprocessing
+scaler, metadata = load_preprocessing({artifact!r})
+print(time.perf_counter() - start)
+"""
+
+
+def time_cold_load(snippet: str, runs: int):
+    """Median in-process load time and median wall time of a fresh interpreter, in ms"""
+    load_times, wall_times = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, "-c", snippet], capture_output=True, text=True, check=True)
+        wall_times.append((time.perf_counter() - start) * 1000)
+        load_times.append(float(output.stdout.strip().splitlines()[-1]) * 1000)
+    return statistics.median(load_times), statistics.median(wall_times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scaler", default=str(PREDICTIVE_DIR / "sauna_scaler.pkl"))
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    encoders = args.scaler.replace('.pkl', '_encoders.pkl')
+    with tempfile.TemporaryDirectory() as tmp:
+        artifact = convert_pickles(args.scaler, str(Path(tmp) / "sauna_scaler.bin"))
+        variants = [
+            ("pickle + sklearn", PICKLE_SNIPPET.format(scaler=args.scaler, encoders=encoders)),
+            ("artifact (numpy)", ARTIFACT_SNIPPET.format(artifact=str(artifact))),
+        ]
+
+        print(f"\n{'format':<18} {'load (ms)':>10} {'process (ms)':>13} {'size (bytes)':>13}")
+        sizes = {
+            "pickle + sklearn": Path(args.scaler).stat().st_size + Path(encoders).stat().st_size,
+            "artifact (numpy)": artifact.stat().st_size,
+        }
+        for name, snippet in variants:
+            load_ms, wall_ms = time_cold_load(snippet, args.runs)
+            print(f"{name:<18} {load_ms:>10.1f} {wall_ms:>13.1f} {sizes[name]:>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Load test: do concurrent /chat/ask requests overlap or serialize?
+
+Fires --concurrency chat requests at once against a running server, while a
+prober hits /health every 50 ms. If the handler blocked the event loop, the
+wall time would approach the sum of the request latencies (overlap ~1x) and
+/health would stall for whole LLM round-trips. With the async path the wall
+time stays near the slowest single request and /health stays fast.
+
+Needs a server with a loaded FAISS index and OPENAI_API_KEY, e.g.:
+    uvicorn backend.src.main:app --port 8000
+
+Usage:
+    python -m backend.benchmarks.benchmark_chat_concurrency [--url http://127.0.0.1:8000] [--concurrency 1 4 16]
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+QUESTIONS = [
+    "What are the cardiovascular benefits of regular sauna use?",
+    "How long should a sauna session last for muscle recovery?",
+    "Is sauna bathing safe after exercise?",
+    "Does sauna use improve sleep quality?",
+]
+
+
+def ask(url: str, question: str):
+    """(latency seconds, HTTP status) of one /chat/ask request"""
+    body = json.dumps({"question": question}).encode()
+    request = urllib.request.Request(f"{url}/chat/ask", data=body, headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=120) as response:
+            response.read()
+            code = response.status
+    except urllib.error.HTTPError as e:
+        code = e.code
+    return time.perf_counter() - start, code
+
+
+def probe_health(url: str, stop: threading.Event, latencies: list):
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            urllib.request.urlopen(f"{url}/health", timeout=30).read()
+            latencies.append((time.perf_counter() - start) * 1000)
+        except urllib.error.URLError:
+            pass
+        stop.wait(0.05)
+
+
+def run(url: str, concurrency: int):
+    stop = threading.Event()
+    health_latencies = []
+    prober = threading.Thread(target=probe_health, args=(url, stop, health_latencies), daemon=True)
+    prober.start()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda i: ask(url, QUESTIONS[i % len(QUESTIONS)]), range(concurrency)))
+    wall = time.perf_counter() - start
+
+    stop.set()
+    prober.join()
+    latencies = [latency for latency, _ in results]
+    errors = sum(1 for _, code in results if code != 200)
+    health_latencies.sort()
+    health_p99 = health_latencies[max(0, int(len(health_latencies) * 0.99) - 1)] if health_latencies else float("nan")
+    return {
+        "wall": wall,
+        "median": statistics.median(latencies),
+        # Sum of latencies over wall time: ~concurrency when requests overlap, ~1 when they serialize
+        "overlap": sum(latencies) / wall,
+        "errors": errors,
+        "health_max": max(health_latencies, default=float("nan")),
+        "health_p99": health_p99,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+
+    print(f"\n{'concurrent':>10} {'wall (s)':>9} {'median (s)':>11} {'overlap':>8} {'errors':>7} "
+          f"{'health p99 (ms)':>16} {'health max (ms)':>16}")
+    for concurrency in args.concurrency:
+        r = run(args.url, concurrency)
+        print(f"{concurrency:>10} {r['wall']:>9.2f} {r['median']:>11.2f} {r['overlap']:>7.1f}x {r['errors']:>7} "
+              f"{r['health_p99']:>16.1f} {r['health_max']:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
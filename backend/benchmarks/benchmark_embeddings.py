@@ -0,0 +1,86 @@
+"""
+Benchmark per-query retrieval latency by embedding backend, with and without the query cache
+
+For each backend, times faiss_index.similarity_search(query, k) on the saved
+document index (or a small synthetic one if none is saved), first with unique
+queries (every query embedded by the model) and then with repeated queries
+(served from the LRU of query vectors). Backends whose dependencies are
+missing fall back to torch and are reported as such in the log.
+
+Usage:
+    python -m backend.benchmarks.benchmark_embeddings [--backends torch onnx onnx-int8] [--queries 200]
+"""
+
+import argparse
+import statistics
+import time
+
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+
+from backend.LLM.embeddings import get_embedder
+from backend.LLM.faiss_indexing import DATA_DIR, load_faiss_index
+
+QUESTIONS = [
+    "Is sauna good for sleep?",
+    "How often should I use the sauna for cardiovascular health?",
+    "What temperature is best for muscle recovery?",
+    "Can sauna bathing lower blood pressure?",
+    "Is it safe to use a sauna after drinking alcohol?",
+    "Does sauna use reduce the risk of dementia?",
+    "How long should a session be for stress relief?",
+    "Should I drink water before a sauna session?",
+]
+
+
+def synthetic_index(embedder, size: int = 2000):
+    topics = ["heart rate", "sleep", "muscle soreness", "blood pressure", "stress", "hydration", "longevity"]
+    docs = [Document(page_content=f"Study {i}: effects of repeated sauna bathing on {topics[i % len(topics)]} "
+                                  f"in a cohort of {50 + i % 400} adults.", metadata={"source": f"paper_{i % 40}.pdf"})
+            for i in range(size)]
+    return FAISS.from_documents(docs, embedder)
+
+
+def time_queries(index, queries, k: int):
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        index.similarity_search(query, k=k)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[max(0, int(len(timings) * 0.99) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=["torch", "onnx", "onnx-int8"])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=3)
+    args = parser.parse_args()
+
+    base_index = load_faiss_index(DATA_DIR)
+    rows = []
+    for backend in args.backends:
+        start = time.perf_counter()
+        embedder = get_embedder(backend=backend)
+        load_seconds = time.perf_counter() - start
+
+        if base_index is not None:
+            index = base_index
+            index.embedding_function = embedder
+        else:
+            index = synthetic_index(embedder)
+
+        unique = [f"{QUESTIONS[i % len(QUESTIONS)]} ({i})" for i in range(args.queries)]
+        repeated = [QUESTIONS[i % len(QUESTIONS)] for i in range(args.queries)]
+        time_queries(index, QUESTIONS, args.k)  # fill the cache for the repeated run
+        rows.append((backend, load_seconds, time_queries(index, unique, args.k), time_queries(index, repeated, args.k)))
+
+    print(f"\nindex: {'saved ' + str(DATA_DIR) if base_index is not None else 'synthetic'}, k={args.k}")
+    print(f"{'backend':<10} {'load (s)':>9} {'uncached p50':>13} {'uncached p99':>13} {'cached p50':>11} {'cached p99':>11}  (ms)")
+    for backend, load_seconds, (u50, u99), (c50, c99) in rows:
+        print(f"{backend:<10} {load_seconds:>9.2f} {u50:>13.2f} {u99:>13.2f} {c50:>11.3f} {c99:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
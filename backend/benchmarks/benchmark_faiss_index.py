@@ -0,0 +1,113 @@
+"""
+Compare FAISS index types for the RAG corpus: recall@k against Flat, latency and memory
+
+Vectors come from the saved document index (reconstructed from it when it is
+a Flat index) when there is one and it is large enough, otherwise from --rows synthetic
+clustered 384-d vectors shaped like MiniLM embeddings. Queries are held-out
+vectors. Each spec is built with build_index_from_vectors and searched one
+query at a time, as the retriever does, under each of its search parameter
+settings.
+
+Usage:
+    python -m backend.benchmarks.benchmark_faiss_index [--rows 100000] [--queries 500] [--k 3]
+    python -m backend.benchmarks.benchmark_faiss_index --specs Flat HNSW32 "IVF1024,PQ48"
+"""
+
+import argparse
+import statistics
+import time
+
+import faiss
+import numpy as np
+
+from backend.LLM.faiss_indexing import DATA_DIR, build_index_from_vectors
+
+# spec -> search parameter settings to try
+DEFAULT_SPECS = {
+    "Flat": [{}],
+    "HNSW32": [{"efSearch": 16}, {"efSearch": 64}, {"efSearch": 256}],
+    "IVF1024,Flat": [{"nprobe": 4}, {"nprobe": 16}, {"nprobe": 64}],
+    "IVF1024,PQ48": [{"nprobe": 16}, {"nprobe": 64}],
+    "IVF1024,PQ48x4fs,RFlat": [{"nprobe": 16}],
+}
+
+
+def saved_vectors():
+    path = DATA_DIR / "index.faiss"
+    if not path.exists():
+        return None
+    index = faiss.read_index(str(path))
+    if not isinstance(faiss.downcast_index(index), faiss.IndexFlat):
+        # IVF/PQ/HNSW don't reconstruct (or only lossily), so they're no source of ground truth
+        print(f"Saved index is {type(faiss.downcast_index(index)).__name__}, not Flat; using synthetic vectors")
+        return None
+    return index.reconstruct_n(0, index.ntotal)
+
+
+def synthetic_vectors(rows: int, dim: int = 384, clusters: int = 200, seed: int = 42):
+    """Unit vectors around random topic centres, closer to text embeddings than uniform noise"""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, dim)).astype(np.float32)
+    vectors = centres[rng.integers(0, clusters, rows)] + 0.6 * rng.standard_normal((rows, dim)).astype(np.float32)
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def search_one_by_one(index, queries, k: int):
+    ids = np.empty((len(queries), k), dtype=np.int64)
+    timings = []
+    for i, query in enumerate(queries):
+        start = time.perf_counter()
+        _, ids[i] = index.search(query[None, :], k)
+        timings.append((time.perf_counter() - start) * 1e6)
+    timings.sort()
+    return ids, statistics.median(timings), timings[max(0, int(len(timings) * 0.99) - 1)]
+
+
+def recall_at_k(found: np.ndarray, truth: np.ndarray) -> float:
+    k = truth.shape[1]
+    return float(np.mean([len(set(f) & set(t)) / k for f, t in zip(found, truth)]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--specs", nargs="+", default=None, help="Factory specs (default: a preset list)")
+    args = parser.parse_args()
+
+    vectors = saved_vectors()
+    source = f"saved index {DATA_DIR}"
+    if vectors is None or len(vectors) < 20 * args.queries:
+        vectors, source = synthetic_vectors(args.rows + args.queries), "synthetic"
+    corpus, queries = vectors[:-args.queries], vectors[-args.queries:]
+    specs = {spec: DEFAULT_SPECS.get(spec, [{}]) for spec in args.specs} if args.specs else DEFAULT_SPECS
+
+    truth = build_index_from_vectors(corpus, "Flat").search(queries, args.k)[1]
+
+    print(f"\n{len(corpus):,} x {corpus.shape[1]}-d vectors ({source}), {len(queries)} queries, k={args.k}")
+    print(f"{'index':<24} {'params':<14} {'build (s)':>9} {'size (MB)':>10} {'p50 (us)':>9} {'p99 (us)':>9} "
+          f"{'recall@k':>9}")
+    for spec, settings in specs.items():
+        try:
+            start = time.perf_counter()
+            index = build_index_from_vectors(corpus, spec)
+            build_seconds = time.perf_counter() - start
+        except RuntimeError as e:
+            print(f"{spec:<24} failed: {e}")
+            continue
+        size_mb = faiss.serialize_index(index).nbytes / 1e6
+
+        parameter_space = faiss.ParameterSpace()
+        for params in settings:
+            for name, value in params.items():
+                parameter_space.set_index_parameter(index, name, value)
+            found, p50, p99 = search_one_by_one(index, queries, args.k)
+            label = ",".join(f"{n}={v}" for n, v in params.items()) or "-"
+            print(f"{spec:<24} {label:<14} {build_seconds:>9.2f} {size_mb:>10.1f} {p50:>9.1f} {p99:>9.1f} "
+                  f"{recall_at_k(found, truth):>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark goal_matching.find_optimal_settings against the original row-wise
+implementation (df.apply per goal + one DataFrame filter per user).
+
+Synthetic data is shaped like a real sweep: each user profile is repeated
+with --settings-per-user different sauna settings. The row-wise reference is
+O(users x rows) and only runs up to --reference-max-rows; where both run the
+outputs are checked for exact equality.
+
+Usage:
+    python -m backend.benchmarks.benchmark_goal_matching --sizes 10000 100000 1000000 10000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from backend.predictive_model.goal_matching import GOAL_FUNCTIONS, USER_COLUMNS, find_optimal_settings
+from backend.predictive_model.synthetic_data_generation import generate_sauna_environmental_data_csv
+
+
+def reference_optimal_settings(df):
+    """The original inverse_dataset loop, kept here as the correctness baseline"""
+    df = df.copy()
+    for goal_name, func in GOAL_FUNCTIONS.items():
+        df[goal_name + "_score"] = df.apply(func, axis=1)
+
+    optimal_settings = []
+    users = df[USER_COLUMNS].drop_duplicates()
+    for _, user in users.iterrows():
+        user_data = df[(df['age'] == user['age']) &
+                       (df['BMI'] == user['BMI']) &
+                       (df['body_mass'] == user['body_mass'])]
+        for goal_name in GOAL_FUNCTIONS.keys():
+            best_row = user_data.loc[user_data[goal_name + '_score'].idxmax()]
+            optimal_settings.append({
+                'age': user['age'],
+                'BMI': user['BMI'],
+                'body_mass': user['body_mass'],
+                'goal': goal_name,
+                'best_temp': best_row['SaunaTemp'],
+                'best_humidity': best_row['Humidity'],
+                'best_session': best_row['SessionLength']
+            })
+    return pd.DataFrame(optimal_settings)
+
+
+def make_dataset(n_rows: int, settings_per_user: int) -> pd.DataFrame:
+    df = generate_sauna_environmental_data_csv(N=n_rows, filename=None)
+    # Repeat each user profile across several consecutive setting rows
+    profile_rows = np.arange(n_rows) // settings_per_user
+    df[USER_COLUMNS] = df[USER_COLUMNS].to_numpy()[profile_rows]
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--settings-per-user", type=int, default=50)
+    parser.add_argument("--reference-max-rows", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} {'users':>10} {'vectorized (s)':>15} {'rows/s':>14} {'reference (s)':>14} {'identical':>10}")
+    for n_rows in args.sizes:
+        df = make_dataset(n_rows, args.settings_per_user)
+
+        start = time.perf_counter()
+        result = find_optimal_settings(df)
+        vectorized = time.perf_counter() - start
+
+        reference_time, identical = "-", "-"
+        if n_rows <= args.reference_max_rows:
+            start = time.perf_counter()
+            expected = reference_optimal_settings(df)
+            reference_time = f"{time.perf_counter() - start:.2f}"
+            identical = str(result.equals(expected))
+
+        print(f"{n_rows:>12,} {len(result) // len(GOAL_FUNCTIONS):>10,} {vectorized:>15.3f} "
+              f"{n_rows / vectorized:>14,.0f} {reference_time:>14} {identical:>10}")
+
+
+if __name__ == "__main__":
+    main()
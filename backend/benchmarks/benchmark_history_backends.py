@@ -0,0 +1,88 @@
+"""
+Benchmark chat history backends on the chat hot path
+
+Replays --turns question/answer turns over --sessions sessions, timing the two
+calls the chain makes per turn: get_session_history(...).messages before the
+LLM call and add_messages() after it. Compares process memory, SQLite and a
+Redis-protocol server. Without --redis-url the Redis backend is measured
+against StandInRedisServer (backend/tests/stand_in_redis.py), a minimal
+in-process server for the handful of commands the backend uses.
+
+Usage:
+    python -m backend.benchmarks.benchmark_history_backends [--sessions 200] [--turns 20]
+    python -m backend.benchmarks.benchmark_history_backends --redis-url redis://localhost:6379/0
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from backend.LLM.history_backends import RedisHistoryBackend, SQLiteHistoryBackend
+from backend.LLM.sessions import SessionStore
+from backend.tests.stand_in_redis import StandInRedisServer
+
+
+def replay(store: SessionStore, sessions: int, turns: int):
+    """Per-turn latencies (us) of reading the history and of appending the turn"""
+    read_us, write_us = [], []
+    answer = "Regular sauna use is associated with lower blood pressure. " * 4
+    for turn in range(turns):
+        for s in range(sessions):
+            start = time.perf_counter()
+            history = store.get(f"session-{s}")
+            history.messages
+            read_us.append((time.perf_counter() - start) * 1e6)
+
+            start = time.perf_counter()
+            history.add_messages([HumanMessage(content=f"Question {turn} about sauna benefits?"),
+                                  AIMessage(content=answer)])
+            write_us.append((time.perf_counter() - start) * 1e6)
+    return read_us, write_us
+
+
+def p99(values):
+    values = sorted(values)
+    return values[max(0, int(len(values) * 0.99) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--redis-url", default=None, help="Real server; defaults to the in-process stand-in")
+    args = parser.parse_args()
+
+    stand_in = None
+    redis_url = args.redis_url
+    if redis_url is None:
+        stand_in = StandInRedisServer().start()
+        redis_url = stand_in.url
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stores = {
+            "memory": SessionStore(),
+            "sqlite": SessionStore(backend=SQLiteHistoryBackend(str(Path(tmp) / "history.sqlite3"))),
+            "redis" + (" (stand-in)" if stand_in else ""): SessionStore(backend=RedisHistoryBackend(redis_url)),
+        }
+
+        print(f"\n{args.sessions} sessions x {args.turns} turns")
+        print(f"{'backend':<18} {'read p50 (us)':>14} {'read p99 (us)':>14} {'write p50 (us)':>15} "
+              f"{'write p99 (us)':>15} {'stored':>7}")
+        for name, store in stores.items():
+            store.clear()
+            read_us, write_us = replay(store, args.sessions, args.turns)
+            stored = len(store.ids())
+            print(f"{name:<18} {statistics.median(read_us):>14.1f} {p99(read_us):>14.1f} "
+                  f"{statistics.median(write_us):>15.1f} {p99(write_us):>15.1f} {stored:>7}")
+            store.close()
+
+    if stand_in:
+        stand_in.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Measure ingestion throughput (files/s, chunks/s) by number of PDF parser processes
+
+Runs the streaming pipeline (parse in a process pool -> chunk -> batched embed)
+over a folder of PDFs once per --workers value, without touching the saved
+index. Use --no-embed to time parsing and chunking alone, i.e. the part that
+scales with cores. "sequential" is the old path: load_pdfs then chunk_documents.
+
+Usage:
+    python -m backend.benchmarks.benchmark_ingestion [--folder backend/LLM/data/raw_data] [--workers 1 2 4 8]
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from backend.LLM.chunking import chunk_documents
+from backend.LLM.config import EMBED_BATCH_SIZE
+from backend.LLM.indexing import RAW_DATA_DIR
+from backend.LLM.ingestion import IngestionProgress, ingest, iter_file_chunks
+from backend.LLM.pdf_loader import load_pdfs
+
+
+class _NoEmbedder:
+    def embed_documents(self, texts):
+        return [[0.0] for _ in texts]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--folder", default=str(RAW_DATA_DIR))
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--batch-size", type=int, default=EMBED_BATCH_SIZE)
+    parser.add_argument("--no-embed", action="store_true", help="Parse and chunk only")
+    args = parser.parse_args()
+
+    paths = sorted(Path(args.folder).glob("*.pdf"))
+    if not paths:
+        raise SystemExit(f"No PDFs in {args.folder}")
+    if args.no_embed:
+        embedder = _NoEmbedder()
+    else:
+        from backend.LLM.embeddings import get_embedder
+        embedder = get_embedder()
+
+    rows = []
+    start = time.perf_counter()
+    chunks = chunk_documents(load_pdfs(paths))
+    if not args.no_embed:
+        for i in range(0, len(chunks), args.batch_size):
+            embedder.embed_documents([c.page_content for c in chunks[i:i + args.batch_size]])
+    rows.append(("sequential", time.perf_counter() - start, len(chunks)))
+
+    for workers in args.workers:
+        progress = IngestionProgress(len(paths))
+        if args.no_embed:
+            chunk_count = sum(len(c) for _, c in iter_file_chunks(paths, workers=workers, progress=progress))
+        else:
+            chunk_count = sum(len(c) for _, c, _ in ingest(paths, embedder, batch_size=args.batch_size,
+                                                           workers=workers, progress=progress))
+        rows.append((f"{workers} workers", progress.elapsed, chunk_count))
+
+    print(f"\n{len(paths)} PDFs from {args.folder}, {'parse + chunk' if args.no_embed else 'parse + chunk + embed'}")
+    print(f"{'pipeline':<12} {'seconds':>8} {'files/s':>8} {'chunks/s':>9} {'speedup':>8}")
+    baseline = rows[0][1]
+    for label, seconds, chunk_count in rows:
+        print(f"{label:<12} {seconds:>8.2f} {len(paths) / seconds:>8.2f} {chunk_count / seconds:>9.0f} "
+              f"{baseline / seconds:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
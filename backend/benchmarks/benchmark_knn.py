@@ -0,0 +1,79 @@
+"""
+Benchmark the k-NN backend against SaunaRecommendationEngine.predict
+
+The k-NN index is built from the training rows only (same split as train()),
+and both engines are scored on the held-out test rows: per-call predict()
+latency and per-output MAE against the table's best settings.
+
+Usage:
+    python -m backend.benchmarks.benchmark_knn [--k 8] [--repeats 2000]
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from backend.predictive_model.nearest_neighbour import NearestNeighbourEngine, build_knn_index
+from backend.predictive_model.neural_network import SaunaRecommendationEngine
+
+PREDICTIVE_DIR = Path(__file__).resolve().parent.parent / "predictive_model"
+OUTPUTS = ['temperature', 'humidity', 'session_length']
+
+
+def evaluate(engine, test_df: pd.DataFrame, repeats: int):
+    timings = []
+    errors = []
+    rows = list(test_df.itertuples(index=False))
+    for i in range(repeats):
+        row = rows[i % len(rows)]
+        start = time.perf_counter()
+        prediction = engine.predict(age=row.age, gender="Male", height=row.height, weight=row.body_mass,
+                                    selected_goals=[row.goal])
+        timings.append((time.perf_counter() - start) * 1e6)
+        if i < len(rows):
+            predicted = np.array([prediction[k] for k in OUTPUTS])
+            errors.append(np.abs(predicted - np.array([row.best_temp, row.best_humidity, row.best_session])))
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.99) - 1], np.mean(errors, axis=0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default=str(PREDICTIVE_DIR / "optimal_sauna_settings_with_height.csv"))
+    parser.add_argument("--model", default=str(PREDICTIVE_DIR / "sauna_recommendation_model.pth"))
+    parser.add_argument("--scaler", default=str(PREDICTIVE_DIR / "sauna_scaler.bin"))
+    parser.add_argument("--k", type=int, default=8)
+    parser.add_argument("--repeats", type=int, default=2000)
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.csv)
+    nn_engine = SaunaRecommendationEngine(model_path=args.model, scaler_path=args.scaler)
+
+    # Split row positions exactly like train() splits its feature rows
+    positions = np.arange(len(df)).reshape(-1, 1)
+    train_pos, _, test_pos, _, _, _ = nn_engine.split_data(positions, np.zeros(len(df)))
+    train_df, test_df = df.iloc[train_pos[:, 0]], df.iloc[test_pos[:, 0]]
+
+    with tempfile.TemporaryDirectory() as index_dir:
+        start = time.perf_counter()
+        build_knn_index(train_df, index_dir)
+        build_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        knn_engine = NearestNeighbourEngine(index_dir, k=args.k)
+        load_seconds = time.perf_counter() - start
+
+        print(f"\nIndex build {build_seconds * 1000:.1f} ms, load {load_seconds * 1000:.1f} ms, "
+              f"{len(train_df)} train rows, {len(test_df)} test rows")
+        print(f"{'engine':<16} {'p50 (us)':>10} {'p99 (us)':>10} {'MAE temp':>9} {'MAE hum':>8} {'MAE sess':>9}")
+        for name, engine in (("neural network", nn_engine), (f"k-NN (k={args.k})", knn_engine)):
+            p50, p99, mae = evaluate(engine, test_df, args.repeats)
+            print(f"{name:<16} {p50:>10.1f} {p99:>10.1f} {mae[0]:>9.3f} {mae[1]:>8.3f} {mae[2]:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark eager vs TorchScript vs dynamic-int8 serving of the recommendation model
+
+Reports single-request and full-batch latency plus MAE on the held-out test
+split that SaunaRecommendationEngine.train() creates (same split_data seed).
+
+Usage:
+    python -m backend.benchmarks.benchmark_serving [--threads 1] [--repeats 2000]
+"""
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from backend.predictive_model.neural_network import SaunaRecommendationEngine
+from backend.predictive_model.serving import build_serving_module
+
+PREDICTIVE_DIR = Path(__file__).resolve().parent.parent / "predictive_model"
+
+
+def time_forward(model, features: torch.Tensor, repeats: int):
+    """Per-call latencies in microseconds"""
+    timings = []
+    with torch.inference_mode():
+        for _ in range(10):
+            model(features)
+        for _ in range(repeats):
+            start = time.perf_counter()
+            model(features)
+            timings.append((time.perf_counter() - start) * 1e6)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default=str(PREDICTIVE_DIR / "optimal_sauna_settings_with_height.csv"))
+    parser.add_argument("--model", default=str(PREDICTIVE_DIR / "sauna_recommendation_model.pth"))
+    parser.add_argument("--scaler", default=str(PREDICTIVE_DIR / "sauna_scaler.bin"))
+    parser.add_argument("--threads", type=int, default=1, help="Pinned intra-op threads")
+    parser.add_argument("--repeats", type=int, default=2000)
+    args = parser.parse_args()
+
+    torch.set_num_threads(args.threads)
+
+    engine = SaunaRecommendationEngine(model_path=args.model, scaler_path=args.scaler)
+    engine.model.cpu().eval()
+
+    features, targets = engine.prepare_features(engine.load_data(args.csv))
+    _, _, X_test, _, _, y_test = engine.split_data(features, targets)
+    X_test = torch.as_tensor(engine.scaler.transform(X_test), dtype=torch.float32)
+    single = X_test[:1]
+
+    backends = {
+        "eager": engine.model,
+        "scripted": build_serving_module(engine.model),
+        "int8": build_serving_module(engine.model, quantize=True),
+    }
+
+    print(f"Test samples: {len(X_test)}, threads: {args.threads}")
+    header = f"{'backend':<10} {'p50 1-row (us)':>15} {'p99 1-row (us)':>15} {'batch (ms)':>11} " \
+             f"{'MAE temp':>9} {'MAE hum':>8} {'MAE sess':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, model in backends.items():
+        single_timings = sorted(time_forward(model, single, args.repeats))
+        batch_timings = time_forward(model, X_test, max(args.repeats // 20, 10))
+        with torch.inference_mode():
+            predictions = model(X_test).numpy()
+        mae = np.mean(np.abs(predictions - y_test), axis=0)
+        print(f"{name:<10} {statistics.median(single_timings):>15.1f} "
+              f"{single_timings[int(len(single_timings) * 0.99) - 1]:>15.1f} "
+              f"{statistics.median(batch_timings) / 1000:>11.2f} "
+              f"{mae[0]:>9.3f} {mae[1]:>8.3f} {mae[2]:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Cold-import profile of the API application
+
+Imports backend.src.main in a fresh interpreter under -X importtime and
+reports wall time, peak RSS, the slowest modules by cumulative import time
+and which heavy dependencies were pulled in at import. With --check it exits
+non-zero when the median import time or RSS is over budget or a deferred
+dependency is imported eagerly again, so it can run as a CI gate. The same
+budget is asserted by backend/tests/test_startup.py.
+
+Usage:
+    python -m backend.benchmarks.benchmark_startup [--runs 5] [--top 25]
+    python -m backend.benchmarks.benchmark_startup --check [--max-seconds 1.5] [--max-rss-mb 150]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+TARGET = "backend.src.main"
+MAX_SECONDS = 1.5
+MAX_RSS_MB = 150
+
+# Only needed on specific code paths; none of them should load when the app is imported
+DEFERRED_MODULES = ["torch", "sklearn", "pandas", "matplotlib", "langchain_core", "langchain_community",
+                    "langchain_openai", "tiktoken", "faiss", "transformers", "firebase_admin"]
+
+SNIPPET = """
+import json, resource, sys, time
+start = time.perf_counter()
+import {target}
+elapsed = time.perf_counter() - start
+# ru_maxrss survives fork+exec on Linux, so it would include a large parent's peak; VmHWM doesn't
+try:
+    with open("/proc/self/status") as f:
+        rss_kb = next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+except (OSError, StopIteration):
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        rss_kb //= 1024
+print(json.dumps({{"seconds": elapsed, "rss_mb": rss_kb / 1024,
+                  "modules": sorted(name for name in sys.modules if "." not in name)}}))
+"""
+
+
+def parse_importtime(stderr: str):
+    """(cumulative_us, self_us, module) rows from -X importtime output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    return rows
+
+
+def run_once(target: str, importtime: bool):
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", SNIPPET.format(target=target)]
+    output = subprocess.run(command, capture_output=True, text=True, check=True, cwd=REPO_ROOT)
+    return json.loads(output.stdout.strip().splitlines()[-1]), output.stderr
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", default=TARGET)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--check", action="store_true", help="Exit 1 if over budget")
+    parser.add_argument("--max-seconds", type=float, default=MAX_SECONDS)
+    parser.add_argument("--max-rss-mb", type=float, default=MAX_RSS_MB)
+    args = parser.parse_args()
+
+    # Timed runs without -X importtime, which adds its own overhead
+    results = [run_once(args.target, importtime=False)[0] for _ in range(args.runs)]
+    seconds = statistics.median(r["seconds"] for r in results)
+    rss_mb = statistics.median(r["rss_mb"] for r in results)
+    _, stderr = run_once(args.target, importtime=True)
+    rows = parse_importtime(stderr)
+
+    print(f"\nimport {args.target}: {seconds * 1000:.0f} ms median of {args.runs}, peak RSS {rss_mb:.1f} MB")
+    print(f"\n{'cumulative (ms)':>15} {'self (ms)':>10}  module")
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>15.1f} {self_us / 1000:>10.1f}  {name}")
+
+    eager = [name for name in DEFERRED_MODULES if name in results[0]["modules"]]
+    print(f"\nDeferred dependencies imported eagerly: {', '.join(eager) or 'none'}")
+
+    if args.check:
+        failures = []
+        if seconds > args.max_seconds:
+            failures.append(f"import time {seconds:.2f}s > {args.max_seconds:.2f}s")
+        if rss_mb > args.max_rss_mb:
+            failures.append(f"RSS {rss_mb:.1f} MB > {args.max_rss_mb:.1f} MB")
+        if eager:
+            failures.append(f"eagerly imported: {', '.join(eager)}")
+        if failures:
+            print("\nFAIL: " + "; ".join(failures))
+            sys.exit(1)
+        print("\nOK: within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark the DataLoader training loop against the tensor-resident fast mode
+
+Reports epochs per second (training + validation, excluding data loading) on
+the bundled 6,000-row CSV and on a synthetic set of --synthetic-rows rows.
+
+Usage:
+    python -m backend.benchmarks.benchmark_training [--synthetic-rows 10000000] [--fast-batch-size 4096]
+"""
+
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from backend.predictive_model.neural_network import SaunaRecommendationEngine
+
+PREDICTIVE_DIR = Path(__file__).resolve().parent.parent / "predictive_model"
+GOALS = ['stress_relief', 'muscle_recovery', 'cold_recovery', 'longevity', 'sleep_quality', 'cardiovascular_health']
+
+
+def make_training_set(n_rows: int, path: Path, seed: int = 42) -> Path:
+    """Random rows in the optimal_sauna_settings_with_height schema, written as Parquet"""
+    rng = np.random.default_rng(seed)
+    body_mass = rng.uniform(58, 110, n_rows).astype(np.float32)
+    bmi = rng.uniform(17, 34, n_rows).astype(np.float32)
+    df = pd.DataFrame({
+        'age': rng.integers(19, 27, n_rows).astype(np.float32),
+        'BMI': bmi,
+        'body_mass': body_mass,
+        'goal': rng.choice(GOALS, n_rows),
+        'best_temp': rng.uniform(65, 95, n_rows).astype(np.float32),
+        'best_humidity': rng.uniform(5, 20, n_rows).astype(np.float32),
+        'best_session': rng.uniform(10, 30, n_rows).astype(np.float32),
+        'height': np.sqrt(body_mass / bmi),
+    })
+    df.to_parquet(path, index=False)
+    return path
+
+
+def run(data_path: str, epochs: int, **train_kwargs) -> float:
+    engine = SaunaRecommendationEngine()
+    results = engine.train(csv_path=str(data_path), epochs=epochs, save_model=False, **train_kwargs)
+    return results['epochs_trained'] / results['train_seconds']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default=str(PREDICTIVE_DIR / "optimal_sauna_settings_with_height.csv"))
+    parser.add_argument("--synthetic-rows", type=int, default=10_000_000)
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--loader-epochs-large", type=int, default=1,
+                        help="Epochs for the DataLoader loop on the synthetic set (it is slow)")
+    parser.add_argument("--fast-batch-size", type=int, default=4096)
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        datasets = [("bundled CSV", args.csv, args.epochs)]
+        if args.synthetic_rows:
+            synthetic = make_training_set(args.synthetic_rows, Path(tmp) / "synthetic.parquet")
+            datasets.append((f"synthetic {args.synthetic_rows:,}", synthetic, args.loader_epochs_large))
+
+        for name, path, loader_epochs in datasets:
+            rows.append((name, "DataLoader, bs=32", run(path, loader_epochs, batch_size=32)))
+            rows.append((name, "fast, bs=32", run(path, args.epochs, batch_size=32, fast=True)))
+            rows.append((name, f"fast, bs={args.fast_batch_size}, scaled lr",
+                         run(path, args.epochs, batch_size=args.fast_batch_size, fast=True, scale_lr=True)))
+
+    print()
+    print(f"{'dataset':<22} {'mode':<32} {'epochs/s':>10}")
+    for name, mode, epochs_per_second in rows:
+        print(f"{name:<22} {mode:<32} {epochs_per_second:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
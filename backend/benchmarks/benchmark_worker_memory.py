@@ -0,0 +1,147 @@
+"""
+Report per-worker memory (RSS, PSS, private) of a multi-worker API deployment
+
+Starts the server with each worker count in --workers, waits for /ready, sends
+a few recommendation requests so every lazily touched page is in, then reads
+/proc/<pid>/smaps_rollup for the server and all its descendants. PSS charges
+shared pages to each sharer proportionally, so the PSS total is the real
+footprint: with pre-forking it should stay near-flat as workers are added,
+with `uvicorn --workers` it grows by a full copy per worker. Linux only.
+
+Usage:
+    python -m backend.benchmarks.benchmark_worker_memory [--mode prefork|uvicorn] [--workers 1 2 4]
+    python -m backend.benchmarks.benchmark_worker_memory --pid 12345   # report a running server
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+
+COMMANDS = {
+    "prefork": lambda workers, port: [sys.executable, "-m", "backend.src.serve",
+                                      "--workers", str(workers), "--port", str(port)],
+    "uvicorn": lambda workers, port: [sys.executable, "-m", "uvicorn", "backend.src.main:app",
+                                      "--workers", str(workers), "--port", str(port)],
+}
+
+RECOMMENDATION_REQUEST = {"age": 25, "gender": "Male", "height": 175, "weight": 75,
+                          "goals": ["stress_relief", "longevity"]}
+
+
+def smaps_rollup(pid: int) -> dict:
+    """{field: kB} from /proc/<pid>/smaps_rollup"""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return fields
+
+
+def process_tree(root_pid: int):
+    """root_pid and all of its descendants"""
+    parents = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    # The command name can contain spaces; ppid is the second field after it
+                    parents[int(entry)] = int(f.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, IndexError):
+                continue
+    tree = [root_pid]
+    for pid in tree:
+        tree.extend(child for child, parent in parents.items() if parent == pid)
+    return tree
+
+
+def report(root_pid: int, label: str):
+    print(f"\n{label}")
+    print(f"{'pid':>8} {'role':<8} {'RSS (MB)':>9} {'PSS (MB)':>9} {'private (MB)':>13}")
+    total_pss = 0
+    for pid in process_tree(root_pid):
+        try:
+            fields = smaps_rollup(pid)
+        except OSError:
+            continue
+        private = fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+        total_pss += fields.get("Pss", 0)
+        role = "parent" if pid == root_pid else "worker"
+        print(f"{pid:>8} {role:<8} {fields.get('Rss', 0) / 1024:>9.1f} {fields.get('Pss', 0) / 1024:>9.1f} "
+              f"{private / 1024:>13.1f}")
+    print(f"{'':>8} {'total':<8} {'':>9} {total_pss / 1024:>9.1f}")
+    return total_pss / 1024
+
+
+def wait_ready(port: int, timeout: float):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/ready", timeout=2) as response:
+                if response.status == 200:
+                    return
+        except (urllib.error.URLError, ConnectionError):
+            pass
+        time.sleep(0.5)
+    raise TimeoutError(f"Server on port {port} not ready after {timeout:.0f}s")
+
+
+def warm(port: int, requests: int):
+    """Send recommendation requests; any failure aborts, as the PSS numbers would leave out the model pages"""
+    body = json.dumps(RECOMMENDATION_REQUEST).encode()
+    for _ in range(requests):
+        request = urllib.request.Request(f"http://127.0.0.1:{port}/sauna/recommendations", data=body,
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            raise RuntimeError(f"Warm-up request failed with {e.code}: {e.read()[:300]!r}") from e
+        if status != 200:
+            raise RuntimeError(f"Warm-up request returned {status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=sorted(COMMANDS), default="prefork")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--warm-requests", type=int, default=50)
+    parser.add_argument("--timeout", type=float, default=180)
+    parser.add_argument("--pid", type=int, default=None, help="Report an already running server instead")
+    args = parser.parse_args()
+
+    if args.pid:
+        report(args.pid, f"server {args.pid}")
+        return
+
+    totals = []
+    for workers in args.workers:
+        server = subprocess.Popen(COMMANDS[args.mode](workers, args.port), cwd=REPO_ROOT)
+        try:
+            wait_ready(args.port, args.timeout)
+            warm(args.port, args.warm_requests)
+            time.sleep(1)
+            totals.append((workers, report(server.pid, f"{args.mode}, {workers} workers")))
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=30)
+
+    print(f"\n{'workers':>8} {'total PSS (MB)':>15}")
+    for workers, total in totals:
+        print(f"{workers:>8} {total:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
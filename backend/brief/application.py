@@ -1,12 +1,13 @@
 #ADD INSTAGRAM STORY SHEARING
 
 if __name__ == "__main__":
-    from backend.api.claude import HarviaAPI
+    from backend.src.core.client import get_client, get_device
     from qa_brief import provide_brief, brief_setup
 
     ##Frontenden çek
-    client = HarviaAPI(username="harviahackathon2025@gmail.com", password="junction25!")
-    device = client.devices.get_device_by_serial("2513005304")
+    # Credentials come from HARVIA_USERNAME / HARVIA_PASSWORD (see src/core/config.py)
+    client = get_client()
+    device = get_device()
     client.devices.send_command(device_id=device.device_id, state="on")
     client.devices.change_profile(device_id=device.device_id, profile="3")
     client.devices.set_target(device_id=device.device_id, temperature=84, humidity=10)
@@ -0,0 +1,149 @@
+"""
+Pickle-free preprocessing artifact for the sauna recommendation engine
+
+Replaces sauna_scaler.pkl + sauna_scaler_encoders.pkl with one file that loads
+with only NumPy and never executes code from the file:
+
+    b"SAUNAPP1"                 magic + format version
+    uint32 (little endian)      length of the JSON header
+    JSON header                 goal columns/mapping, model config and an
+                                {name: {dtype, shape, offset}} table of arrays
+    raw array bytes             float64 mean/scale, 8-byte aligned
+
+Usage (convert existing trusted pickles):
+    python -m backend.predictive_model.artifacts --scaler backend/predictive_model/sauna_scaler.pkl
+"""
+
+import argparse
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+MAGIC = b"SAUNAPP1"
+ARTIFACT_SUFFIX = ".bin"
+
+
+class ArrayScaler:
+    """NumPy-only stand-in for a fitted StandardScaler: (X - mean) / scale"""
+
+    def __init__(self, mean: np.ndarray, scale: np.ndarray):
+        self.mean_ = np.asarray(mean, dtype=np.float64)
+        self.scale_ = np.asarray(scale, dtype=np.float64)
+        self.n_features_in_ = len(self.mean_)
+
+    def transform(self, X) -> np.ndarray:
+        return (np.asarray(X, dtype=np.float64) - self.mean_) / self.scale_
+
+
+def artifact_path(scaler_path: str) -> Path:
+    """Preprocessing artifact path that belongs to a (legacy) scaler path"""
+    return Path(scaler_path).with_suffix(ARTIFACT_SUFFIX)
+
+
+def save_preprocessing(path: str, mean: np.ndarray, scale: np.ndarray, metadata: Dict):
+    """
+    Write the preprocessing artifact atomically
+
+    Args:
+        path: Output file
+        mean: Per-feature scaler mean
+        scale: Per-feature scaler scale
+        metadata: JSON-serializable goal columns, mappings and model config
+    """
+    arrays = {
+        'mean': np.ascontiguousarray(mean, dtype='<f8'),
+        'scale': np.ascontiguousarray(scale, dtype='<f8'),
+    }
+    offset = 0
+    table = {}
+    for name, array in arrays.items():
+        table[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+        offset += array.nbytes
+
+    header = json.dumps({**metadata, 'format_version': 1, 'arrays': table}).encode()
+    # Pad the header so the arrays start 8-byte aligned
+    header += b" " * (-(len(MAGIC) + 4 + len(header)) % 8)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<I', len(header)))
+        f.write(header)
+        for array in arrays.values():
+            f.write(array.tobytes())
+    os.replace(tmp_path, path)
+
+
+def load_preprocessing(path: str):
+    """
+    Read a preprocessing artifact
+
+    Returns:
+        (ArrayScaler, metadata dict)
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"Not a sauna preprocessing artifact: {path}")
+    (header_len,) = struct.unpack_from('<I', data, len(MAGIC))
+    header_end = len(MAGIC) + 4 + header_len
+    metadata = json.loads(data[len(MAGIC) + 4:header_end])
+
+    arrays = {}
+    for name, spec in metadata.pop('arrays').items():
+        dtype = np.dtype(spec['dtype'])
+        count = int(np.prod(spec['shape']))
+        arrays[name] = np.frombuffer(data, dtype=dtype, count=count,
+                                     offset=header_end + spec['offset']).reshape(spec['shape'])
+
+    return ArrayScaler(arrays['mean'], arrays['scale']), metadata
+
+
+def convert_pickles(scaler_path: str, output_path: str = None) -> Path:
+    """
+    Convert a trusted sauna_scaler.pkl (+ _encoders.pkl) pair to the new artifact.
+    Only run this on files you produced yourself: unpickling executes code.
+    """
+    import pickle
+
+    with open(scaler_path, 'rb') as f:
+        scaler = pickle.load(f)
+
+    encoders = {}
+    encoder_path = scaler_path.replace('.pkl', '_encoders.pkl')
+    if os.path.exists(encoder_path):
+        with open(encoder_path, 'rb') as f:
+            encoders = pickle.load(f)
+
+    all_goals = list(encoders.get('all_goals', []))
+    goal_columns = encoders.get('goal_columns') or sorted(f'goal_{g}' for g in all_goals)
+    goal_encoder = encoders.get('goal_encoder')
+    metadata = {
+        'goal_columns': list(goal_columns),
+        'all_goals': all_goals,
+        'goal_mapping': dict(encoders.get('goal_mapping', {})),
+        'goal_classes': [str(c) for c in getattr(goal_encoder, 'classes_', [])],
+        'model_config': encoders.get('model_config', {}),
+    }
+
+    output_path = Path(output_path) if output_path else artifact_path(scaler_path)
+    save_preprocessing(str(output_path), scaler.mean_, scaler.scale_, metadata)
+    print(f"Converted {scaler_path} -> {output_path}")
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert scaler/encoder pickles to the NumPy-only artifact")
+    parser.add_argument("--scaler", required=True, help="Path to sauna_scaler.pkl")
+    parser.add_argument("--output", default=None, help="Defaults to the scaler path with a .bin suffix")
+    args = parser.parse_args()
+    convert_pickles(args.scaler, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,82 +1,189 @@
-def inverse_dataset():
-    import numpy as np
-    import pandas as pd
+import numpy as np
+import pandas as pd
 
-    # Load your forward dataset
-    df = pd.read_csv("synthetic_sauna_env_data.csv")
+# Columns that identify a user profile in the forward dataset
+USER_COLUMNS = ['age', 'BMI', 'body_mass']
+# Sauna settings the inverse dataset recommends
+SETTING_COLUMNS = ['SaunaTemp', 'Humidity', 'SessionLength']
 
-    # Define goal functions
-    def stress_reduction(row):
-        return -row['HRavg'] - row['HRpeak'] - 0.5*row['DBP_after'] - row['Lactic_acid'] + 0.2*(row['Temp_after'] - row['Temp_before'])
 
-    def cardiovascular_health(row):
-        return row['VO2avg'] + row['VO2max'] + 0.5*row['Energy_expenditure'] - 0.3*abs(row['HRavg']-120) - 0.2*abs(row['SBP_after']-120)
+# Goal functions, written as column expressions so they score the whole
+# dataset at once (they also still work on a single row)
+def stress_reduction(df):
+    return -df['HRavg'] - df['HRpeak'] - 0.5*df['DBP_after'] - df['Lactic_acid'] + 0.2*(df['Temp_after'] - df['Temp_before'])
 
 
-    def muscle_recovery(row):
-        return row['VO2max'] + 0.05*row['Energy_expenditure'] - 0.5*row['Lactic_acid'] - 0.2*abs(row['HRpeak']-130)
+def cardiovascular_health(df):
+    return df['VO2avg'] + df['VO2max'] + 0.5*df['Energy_expenditure'] - 0.3*np.abs(df['HRavg']-120) - 0.2*np.abs(df['SBP_after']-120)
 
-    def sleep_quality(row):
-        return -row['HRavg'] - row['HRpeak'] - 0.5*row['DBP_after'] + row['Recovery_time'] - 0.3*row['Lactic_acid']
 
+def muscle_recovery(df):
+    return df['VO2max'] + 0.05*df['Energy_expenditure'] - 0.5*df['Lactic_acid'] - 0.2*np.abs(df['HRpeak']-130)
 
-    def cold_recovery(row):
-        return -abs(row['HRpeak']-110) + 0.05*row['Energy_expenditure'] + 0.3*(row['Temp_after']-row['Temp_before']) + 0.2*(row['RRavg']-16)
+
+def sleep_quality(df):
+    return -df['HRavg'] - df['HRpeak'] - 0.5*df['DBP_after'] + df['Recovery_time'] - 0.3*df['Lactic_acid']
+
+
+def cold_recovery(df):
+    return -np.abs(df['HRpeak']-110) + 0.05*df['Energy_expenditure'] + 0.3*(df['Temp_after']-df['Temp_before']) + 0.2*(df['RRavg']-16)
+
+
+def longevity(df):
+    return df['VO2max'] + df['HDL'] - df['Glucose'] - 0.2*np.abs(df['HRavg']-80) - 0.2*np.abs(df['SBP_after']-120) + 0.1*df['Energy_expenditure']
 
 
-    def longevity(row):
-        return row['VO2max'] + row['HDL'] - row['Glucose'] - 0.2*abs(row['HRavg']-80) - 0.2*abs(row['SBP_after']-120) + 0.1*row['Energy_expenditure']
-
-
-    # Map goal names to functions
-    goal_functions = {
-        "stress_relief": stress_reduction,
-        "muscle_recovery": muscle_recovery,
-        "cold_recovery": cold_recovery,
-        "longevity": longevity,
-        "sleep_quality": sleep_quality,
-        "cardiovascular_health": cardiovascular_health,
-    }
-
-    # Create a new column for each goal
-    for goal_name, func in goal_functions.items():
-        df[goal_name + "_score"] = df.apply(func, axis=1)
-
-    optimal_settings = []
-
-    # Loop through each unique user (age, BMI, body_mass)
-    users = df[['age', 'BMI', 'body_mass']].drop_duplicates()
-
-    for _, user in users.iterrows():
-        user_data = df[(df['age'] == user['age']) &
-                       (df['BMI'] == user['BMI']) &
-                       (df['body_mass'] == user['body_mass'])]
-
-        for goal_name in goal_functions.keys():
-            best_row = user_data.loc[user_data[goal_name + '_score'].idxmax()]
-
-            optimal_settings.append({
-                'age': user['age'],
-                'BMI': user['BMI'],
-                'body_mass': user['body_mass'],
-                'goal': goal_name,
-                'best_temp': best_row['SaunaTemp'],
-                'best_humidity': best_row['Humidity'],
-                'best_session': best_row['SessionLength']
-            })
-
-    optimal_df = pd.DataFrame(optimal_settings)
-
-
-    print(optimal_df.head())
-    # Optional: save to CSV
-    optimal_df.to_csv("optimal_sauna_settings.csv", index=False)
+# Forward-dataset columns read by the goal functions
+SCORE_COLUMNS = ['HRavg', 'HRpeak', 'RRavg', 'DBP_after', 'SBP_after', 'Lactic_acid', 'Temp_before', 'Temp_after',
+                 'VO2avg', 'VO2max', 'Energy_expenditure', 'Recovery_time', 'HDL', 'Glucose']
+
+
+# Map goal names to functions
+GOAL_FUNCTIONS = {
+    "stress_relief": stress_reduction,
+    "muscle_recovery": muscle_recovery,
+    "cold_recovery": cold_recovery,
+    "longevity": longevity,
+    "sleep_quality": sleep_quality,
+    "cardiovascular_health": cardiovascular_health,
+}
+
+
+def score_goals(df):
+    """Score every row for every goal; returns a DataFrame with one '<goal>_score' column per goal"""
+    # Plain float64 arrays skip pandas index alignment on every operation
+    columns = {col: df[col].to_numpy(dtype=np.float64) for col in SCORE_COLUMNS}
+    return pd.DataFrame(
+        {goal_name + "_score": func(columns) for goal_name, func in GOAL_FUNCTIONS.items()},
+        index=df.index,
+    )
+
+
+def find_optimal_settings(df, include_score=False):
+    """
+    For each unique user (age, BMI, body_mass) and each goal, pick the sauna
+    settings of the row with the highest goal score.
+
+    Rows come out in order of each user's first appearance, then in
+    GOAL_FUNCTIONS order; ties go to the first row, like idxmax.
+    With include_score=True the winning score is kept as 'best_score'.
+    """
+    scores = score_goals(df)
+
+    # One groupby over all six score columns instead of one filter per user
+    user_ids = df.groupby(USER_COLUMNS, sort=False).ngroup().to_numpy()
+    best_rows = scores.groupby(user_ids, sort=False).idxmax().to_numpy().ravel()
+
+    goals = list(GOAL_FUNCTIONS.keys())
+    users = df[USER_COLUMNS].drop_duplicates().astype(np.float64)
+    best = df.loc[best_rows]
+
+    optimal_df = pd.DataFrame({
+        'age': np.repeat(users['age'].to_numpy(), len(goals)),
+        'BMI': np.repeat(users['BMI'].to_numpy(), len(goals)),
+        'body_mass': np.repeat(users['body_mass'].to_numpy(), len(goals)),
+        'goal': np.tile(goals, len(users)),
+        'best_temp': best['SaunaTemp'].to_numpy(dtype=np.float64),
+        'best_humidity': best['Humidity'].to_numpy(dtype=np.float64),
+        'best_session': best['SessionLength'].to_numpy(dtype=np.float64),
+    })
+    if include_score:
+        positions = df.index.get_indexer(best_rows)
+        goal_positions = np.tile(np.arange(len(goals)), len(users))
+        optimal_df['best_score'] = scores.to_numpy()[positions, goal_positions]
+    return optimal_df
+
+
+def iter_optimal_settings_chunked(chunks, buckets=64, spill_dir=None):
+    """
+    Same rows as find_optimal_settings over the concatenation of chunks, yielded
+    as one DataFrame per bucket so neither the forward dataset nor the result is
+    ever held in memory at once.
+
+    Each chunk is reduced to its per-user best rows, which are spilled to one
+    Parquet file per bucket (users hashed on USER_COLUMNS). Every user then lives
+    in a single bucket, so a user whose rows span chunks is still reduced
+    correctly; earlier chunks win ties, matching idxmax on the full dataset.
+    Rows come out bucket by bucket, not in order of first appearance.
+    Peak memory is about one chunk plus one bucket.
+    """
+    import tempfile
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    with tempfile.TemporaryDirectory(dir=spill_dir, prefix="goal_matching-") as tmp_dir:
+        writers = {}
+        try:
+            for chunk in chunks:
+                partial = find_optimal_settings(chunk, include_score=True)
+                bucket_ids = pd.util.hash_pandas_object(partial[USER_COLUMNS], index=False).to_numpy() % buckets
+                for bucket, rows in partial.groupby(bucket_ids, sort=False):
+                    table = pa.Table.from_pandas(rows, preserve_index=False)
+                    if bucket not in writers:
+                        writers[bucket] = pq.ParquetWriter(f"{tmp_dir}/bucket-{bucket:05d}.parquet", table.schema)
+                    writers[bucket].write_table(table)
+        finally:
+            for writer in writers.values():
+                writer.close()
+
+        for bucket in sorted(writers):
+            combined = pd.read_parquet(f"{tmp_dir}/bucket-{bucket:05d}.parquet")
+            best = combined.groupby(USER_COLUMNS + ['goal'], sort=False)['best_score'].idxmax()
+            yield combined.loc[best.to_numpy()].drop(columns='best_score').reset_index(drop=True)
+
+
+def inverse_dataset(input_path="synthetic_sauna_env_data.csv", output_csv="optimal_sauna_settings.csv"):
+    """
+    Build the inverse (per-user optimal settings) dataset from the forward dataset.
+    input_path can be a CSV file or a Parquet file/part directory written by
+    synthetic_data_generation.generate_sauna_environmental_data_parquet; Parquet
+    input is streamed in batches, only the needed columns are read, and the result
+    is written to output_csv bucket by bucket (see iter_optimal_settings_chunked).
+
+    Returns the inverse DataFrame for CSV input, the output path for Parquet input.
+    """
+    input_path = str(input_path)
+    if input_path.endswith(".csv"):
+        # Load your forward dataset
+        df = pd.read_csv(input_path)
+        optimal_df = find_optimal_settings(df)
+        print(optimal_df.head())
+        # Optional: save to CSV (or float32-friendly Parquet for large datasets)
+        if str(output_csv).endswith(".parquet"):
+            optimal_df.to_parquet(output_csv, index=False)
+        else:
+            optimal_df.to_csv(output_csv, index=False)
+        return optimal_df
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from backend.predictive_model.synthetic_data_generation import iter_parquet_chunks
+
+    columns = USER_COLUMNS + SETTING_COLUMNS + SCORE_COLUMNS
+    parts = iter_optimal_settings_chunked(iter_parquet_chunks(input_path, columns=columns))
+    writer = None
+    rows = 0
+    try:
+        for i, part in enumerate(parts):
+            if i == 0:
+                print(part.head())
+            if str(output_csv).endswith(".parquet"):
+                table = pa.Table.from_pandas(part, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(str(output_csv), table.schema)
+                writer.write_table(table)
+            else:
+                part.to_csv(output_csv, index=False, mode="w" if i == 0 else "a", header=i == 0)
+            rows += len(part)
+    finally:
+        if writer is not None:
+            writer.close()
+    print(f"Inverse dataset saved to '{output_csv}' ({rows:,} rows).")
+    return output_csv
 
 
 def edit_dataset():
-    import numpy as np
-    import pandas as pd
-
     # Load inverse dataset
     inverse_df = pd.read_csv("optimal_sauna_settings.csv")
 
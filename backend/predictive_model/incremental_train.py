@@ -0,0 +1,68 @@
+"""
+Incremental (warm-start) retraining of the Sauna Recommendation Neural Network
+Fine-tunes the current model on new rows, e.g. outcomes collected from real
+sessions, with a replay sample of the original training data. Meant for
+nightly updates: it takes seconds instead of a full from-scratch run.
+
+Usage:
+    python -m backend.predictive_model.incremental_train --new-data new_sessions.csv
+    python -m backend.predictive_model.incremental_train --new-data new_sessions.csv --publish
+"""
+
+import argparse
+from pathlib import Path
+
+from backend.predictive_model.neural_network import SaunaRecommendationEngine
+
+
+def main():
+    script_dir = Path(__file__).parent
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--new-data", required=True,
+                        help="CSV/Parquet in the optimal_sauna_settings_with_height.csv schema")
+    parser.add_argument("--replay-data", default=str(script_dir / "optimal_sauna_settings_with_height.csv"))
+    parser.add_argument("--replay-ratio", type=float, default=1.0, help="Replay rows per new row")
+    parser.add_argument("--model", default=str(script_dir / "sauna_recommendation_model.pth"))
+    parser.add_argument("--scaler", default=str(script_dir / "sauna_scaler.bin"))
+    parser.add_argument("--output-dir", default=str(script_dir / "incremental"))
+    parser.add_argument("--epochs", type=int, default=20)
+    parser.add_argument("--learning-rate", type=float, default=1e-4)
+    parser.add_argument("--publish", action="store_true",
+                        help="Publish the result as a new model registry version")
+    args = parser.parse_args()
+
+    engine = SaunaRecommendationEngine(model_path=args.model, scaler_path=args.scaler)
+    if engine.model is None:
+        print(f"Error: model not found at {args.model}")
+        return
+
+    # Never overwrite the serving model in place; write next to it and publish
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    engine.model_path = str(output_dir / "sauna_recommendation_model.pth")
+    engine.scaler_path = str(output_dir / "sauna_scaler.bin")
+
+    results = engine.fine_tune(
+        new_data_path=args.new_data,
+        replay_data_path=args.replay_data,
+        replay_ratio=args.replay_ratio,
+        epochs=args.epochs,
+        learning_rate=args.learning_rate,
+    )
+
+    print(f"\nFine-tuning results:")
+    for key, value in results.items():
+        print(f"  - {key}: {value}")
+
+    if args.publish:
+        from backend.predictive_model.model_registry import ModelRegistry
+        from backend.src.core.config import MODEL_REGISTRY_DIR
+
+        metrics = {k: float(v) for k, v in results.items()}
+        version = ModelRegistry(MODEL_REGISTRY_DIR).publish(engine.model_path, engine.scaler_path,
+                                                            metrics=metrics)
+        print(f"\nPublished registry version {version}")
+
+
+if __name__ == "__main__":
+    main()
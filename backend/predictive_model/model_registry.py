@@ -0,0 +1,245 @@
+"""
+Versioned model registry for the sauna recommendation engine
+
+Layout:
+    registry/
+        manifest.json           # active version, history and per-version checksums
+        <version>/
+            sauna_recommendation_model.pth
+            sauna_scaler.bin                         # NumPy-only preprocessing artifact
+            sauna_scaler.pkl                         # legacy pickles, if published from them
+            sauna_scaler_encoders.pkl
+            sauna_recommendation_model.scripted.pt   # optional serving artifacts
+            sauna_recommendation_model.int8.pt
+
+The manifest is always rewritten atomically (temp file + os.replace), so a
+reader either sees the old or the new manifest, never a partial one.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+MANIFEST_NAME = "manifest.json"
+MODEL_FILE = "sauna_recommendation_model.pth"
+SCALER_FILE = "sauna_scaler.pkl"
+PREPROCESSING_FILE = "sauna_scaler.bin"
+ENCODERS_FILE = "sauna_scaler_encoders.pkl"
+SCRIPTED_FILE = "sauna_recommendation_model.scripted.pt"
+QUANTIZED_FILE = "sauna_recommendation_model.int8.pt"
+
+
+class ModelRegistryError(Exception):
+    """Raised for missing versions, bad manifests and checksum mismatches"""
+    pass
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Compute the SHA-256 of a file without reading it into memory at once"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _atomic_write_json(path: Path, data: Dict):
+    """Write JSON next to the target and rename it into place"""
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class ModelRegistry:
+    """Directory of versioned model artifacts with a checksummed manifest"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.manifest_path = self.root / MANIFEST_NAME
+
+    def read_manifest(self) -> Dict:
+        """Return the manifest, or an empty one if the registry has not been used yet"""
+        if not self.manifest_path.exists():
+            return {"active": None, "history": [], "versions": {}}
+        with open(self.manifest_path) as f:
+            return json.load(f)
+
+    def manifest_mtime(self) -> Optional[float]:
+        """Modification time of the manifest, used to detect new deployments"""
+        try:
+            return self.manifest_path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+    def list_versions(self) -> List[str]:
+        return sorted(self.read_manifest()["versions"].keys())
+
+    def active_version(self) -> Optional[str]:
+        return self.read_manifest()["active"]
+
+    def version_dir(self, version: str) -> Path:
+        return self.root / version
+
+    def publish(self, model_path: str, scaler_path: str, version: Optional[str] = None,
+                activate: bool = True, metrics: Optional[Dict] = None) -> str:
+        """
+        Copy a trained model and its scaler/encoders into a new version directory
+
+        Files are staged in a temporary directory and renamed into place, so a
+        half-copied version is never visible to the loader.
+
+        Returns:
+            The new version name
+        """
+        version = version or datetime.now(timezone.utc).strftime("v%Y%m%d%H%M%S")
+        manifest = self.read_manifest()
+        if version in manifest["versions"]:
+            raise ModelRegistryError(f"Version already exists: {version}")
+
+        sources = {MODEL_FILE: Path(model_path)}
+        preprocessing_path = Path(scaler_path).with_suffix('.bin')
+        if preprocessing_path.exists():
+            sources[PREPROCESSING_FILE] = preprocessing_path
+        else:
+            # Legacy scaler/encoder pickles
+            sources[SCALER_FILE] = Path(scaler_path).with_suffix('.pkl')
+            encoders_path = Path(str(sources[SCALER_FILE]).replace('.pkl', '_encoders.pkl'))
+            if encoders_path.exists():
+                sources[ENCODERS_FILE] = encoders_path
+        # Optional TorchScript serving artifacts exported next to the model
+        for name, suffix in ((SCRIPTED_FILE, '.scripted.pt'), (QUANTIZED_FILE, '.int8.pt')):
+            artifact = Path(model_path).with_name(Path(model_path).stem + suffix)
+            if artifact.exists():
+                sources[name] = artifact
+
+        for source in sources.values():
+            if not source.exists():
+                raise ModelRegistryError(f"Artifact not found: {source}")
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(dir=str(self.root), prefix=f".{version}."))
+        try:
+            checksums = {}
+            for name, source in sources.items():
+                shutil.copy2(source, staging / name)
+                checksums[name] = file_sha256(staging / name)
+            os.replace(staging, self.version_dir(version))
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        manifest["versions"][version] = {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "files": checksums,
+            "metrics": metrics or {},
+        }
+        if activate:
+            self._set_active(manifest, version)
+        _atomic_write_json(self.manifest_path, manifest)
+        return version
+
+    def verify(self, version: str) -> Dict[str, Path]:
+        """
+        Check every artifact of a version against its manifest checksum
+
+        Returns:
+            Mapping of artifact file name to its path
+        """
+        manifest = self.read_manifest()
+        entry = manifest["versions"].get(version)
+        if entry is None:
+            raise ModelRegistryError(f"Unknown model version: {version}")
+
+        paths = {}
+        for name, expected in entry["files"].items():
+            path = self.version_dir(version) / name
+            if not path.exists():
+                raise ModelRegistryError(f"Missing artifact for {version}: {name}")
+            actual = file_sha256(path)
+            if actual != expected:
+                raise ModelRegistryError(f"Checksum mismatch for {version}/{name}")
+            paths[name] = path
+        return paths
+
+    def _set_active(self, manifest: Dict, version: str):
+        if manifest["active"] and manifest["active"] != version:
+            manifest["history"].append(manifest["active"])
+        manifest["active"] = version
+
+    def activate(self, version: str):
+        """Point the manifest at an existing version"""
+        manifest = self.read_manifest()
+        if version not in manifest["versions"]:
+            raise ModelRegistryError(f"Unknown model version: {version}")
+        self._set_active(manifest, version)
+        _atomic_write_json(self.manifest_path, manifest)
+
+    def rollback(self) -> str:
+        """
+        Re-activate the previously active version
+
+        Returns:
+            The version that is active after the rollback
+        """
+        manifest = self.read_manifest()
+        if not manifest["history"]:
+            raise ModelRegistryError("No previous version to roll back to")
+        manifest["active"] = manifest["history"].pop()
+        _atomic_write_json(self.manifest_path, manifest)
+        return manifest["active"]
+
+
+def main():
+    """Publish, activate or roll back registry versions from the command line"""
+    from backend.src.core.config import MODEL_REGISTRY_DIR, MODEL_PATH, SCALER_PATH
+
+    parser = argparse.ArgumentParser(description="Manage the sauna model registry")
+    parser.add_argument("--registry", default=str(MODEL_REGISTRY_DIR))
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    publish_parser = subparsers.add_parser("publish", help="Publish trained artifacts as a new version")
+    publish_parser.add_argument("--model", default=str(MODEL_PATH))
+    publish_parser.add_argument("--scaler", default=str(SCALER_PATH))
+    publish_parser.add_argument("--version", default=None)
+    publish_parser.add_argument("--no-activate", action="store_true")
+
+    activate_parser = subparsers.add_parser("activate", help="Activate an existing version")
+    activate_parser.add_argument("version")
+
+    subparsers.add_parser("rollback", help="Re-activate the previous version")
+    subparsers.add_parser("list", help="List versions")
+
+    args = parser.parse_args()
+    registry = ModelRegistry(Path(args.registry))
+
+    if args.command == "publish":
+        version = registry.publish(args.model, args.scaler, version=args.version,
+                                   activate=not args.no_activate)
+        print(f"Published {version}")
+    elif args.command == "activate":
+        registry.activate(args.version)
+        print(f"Activated {args.version}")
+    elif args.command == "rollback":
+        print(f"Rolled back to {registry.rollback()}")
+    else:
+        active = registry.active_version()
+        for version in registry.list_versions():
+            print(f"{'*' if version == active else ' '} {version}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Nearest-neighbour recommendation backend
+Answers straight from the optimal-settings table: for each goal, a KD-tree
+over standardized (age, BMI, body_mass, height) finds the k closest profiles
+and their best settings are combined with inverse-distance weights.
+
+The index is built once into a directory of .npy arrays plus a JSON header and
+loaded with np.load(mmap_mode='r'). The header records the SHA-256 of the table
+it was built from, so index_is_current() can tell when the table was regenerated.
+
+The per-goal KD-trees are not persisted (that would take a pickle): they are
+rebuilt from the mapped points on every load, in each process that loads the
+engine. A tree references the mapped points without copying them and only adds
+an int64 index per row plus small per-node arrays. The build costs about
+5 ms for the shipped 6k-row table and about 1.3 s per million rows. The pre-fork
+server (src/serve.py) loads the engine once in the parent, so its workers share
+the trees instead of building their own.
+"""
+
+import argparse
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KDTree
+
+from backend.predictive_model.neural_network import SaunaRecommendationEngine
+
+FEATURE_COLUMNS = ['age', 'BMI', 'body_mass', 'height']
+TARGET_COLUMNS = ['best_temp', 'best_humidity', 'best_session']
+META_FILE = "knn_index.json"
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def index_is_current(index_dir: str, source_path: str) -> bool:
+    """Whether index_dir holds an index built from the current contents of source_path"""
+    meta_path = Path(index_dir) / META_FILE
+    if not meta_path.exists():
+        return False
+    with open(meta_path) as f:
+        meta = json.load(f)
+    return meta.get('source_sha256') == file_sha256(source_path)
+
+
+def build_knn_index(df: pd.DataFrame, index_dir: str, source_path: Optional[str] = None) -> Path:
+    """
+    Write a per-goal nearest-neighbour index for a training table
+
+    Args:
+        df: Rows in the optimal_sauna_settings_with_height.csv schema
+        index_dir: Output directory
+        source_path: File df was read from; its hash is recorded for index_is_current()
+
+    Returns:
+        Path to the index directory
+    """
+    index_dir = Path(index_dir)
+    index_dir.mkdir(parents=True, exist_ok=True)
+
+    features = df[FEATURE_COLUMNS].to_numpy(dtype=np.float64)
+    mean = features.mean(axis=0)
+    scale = features.std(axis=0)
+    scale[scale == 0] = 1.0
+
+    goals = sorted(df['goal'].unique())
+    for goal in goals:
+        rows = (df['goal'] == goal).to_numpy()
+        np.save(index_dir / f"{goal}_points.npy", (features[rows] - mean) / scale)
+        np.save(index_dir / f"{goal}_targets.npy", df.loc[rows, TARGET_COLUMNS].to_numpy(dtype=np.float64))
+
+    with open(index_dir / META_FILE, 'w') as f:
+        json.dump({
+            'goals': goals,
+            'feature_columns': FEATURE_COLUMNS,
+            'mean': mean.tolist(),
+            'scale': scale.tolist(),
+            'source_sha256': file_sha256(source_path) if source_path else None,
+        }, f, indent=2)
+    print(f"k-NN index for {len(goals)} goals saved to {index_dir}")
+    return index_dir
+
+
+class NearestNeighbourEngine(SaunaRecommendationEngine):
+    """
+    Drop-in alternative to the neural network engine: same predict() signature,
+    strategies and per-goal breakdown, answered by distance-weighted k-NN
+    """
+
+    def __init__(self, index_dir: str, k: int = 8):
+        super().__init__()
+        self.k = k
+        self.trees: Dict[str, KDTree] = {}
+        self.targets: Dict[str, np.ndarray] = {}
+        self.load_index(index_dir)
+
+    def load_index(self, index_dir: str):
+        index_dir = Path(index_dir)
+        meta_path = index_dir / META_FILE
+        if not meta_path.exists():
+            raise FileNotFoundError(f"k-NN index not found: {meta_path}")
+
+        with open(meta_path) as f:
+            meta = json.load(f)
+        self.feature_mean = np.asarray(meta['mean'])
+        self.feature_scale = np.asarray(meta['scale'])
+
+        for goal in meta['goals']:
+            points = np.load(index_dir / f"{goal}_points.npy", mmap_mode='r')
+            self.trees[goal] = KDTree(points)
+            self.targets[goal] = np.load(index_dir / f"{goal}_targets.npy", mmap_mode='r')
+
+        self.all_goals = sorted(meta['goals'])
+        self.goal_columns = [f'goal_{g}' for g in self.all_goals]
+        print(f"k-NN index loaded from {index_dir}")
+
+    def is_ready(self) -> bool:
+        return bool(self.trees)
+
+    def predict_batch(self, features: np.ndarray) -> np.ndarray:
+        """Distance-weighted k-NN over the tree of each row's goal"""
+        numeric = (features[:, :4] - self.feature_mean) / self.feature_scale
+        goal_index = features[:, 4:].argmax(axis=1)
+
+        predictions = np.empty((len(features), 3))
+        for row, (point, col) in enumerate(zip(numeric, goal_index)):
+            goal = self.goal_columns[col][len('goal_'):]
+            tree, targets = self.trees[goal], self.targets[goal]
+            distances, indices = tree.query(point[None, :], k=min(self.k, len(targets)))
+            distances, indices = distances[0], indices[0]
+
+            if distances[0] == 0:
+                # Exact profile match
+                predictions[row] = targets[indices[0]]
+            else:
+                weights = 1.0 / distances
+                predictions[row] = (targets[indices] * weights[:, None]).sum(axis=0) / weights.sum()
+        return predictions
+
+
+def main():
+    script_dir = Path(__file__).parent
+    parser = argparse.ArgumentParser(description="Build the k-NN recommendation index")
+    parser.add_argument("--csv", default=str(script_dir / "optimal_sauna_settings_with_height.csv"))
+    parser.add_argument("--index-dir", default=str(script_dir / "knn_index"))
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.csv) if args.csv.endswith('.csv') else pd.read_parquet(args.csv)
+    build_knn_index(df, args.index_dir, source_path=args.csv)
+
+
+if __name__ == "__main__":
+    main()
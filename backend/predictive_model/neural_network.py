@@ -10,14 +10,19 @@ import torch.optim as optim
 from torch.utils.data import Dataset, DataLoader
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.model_selection import train_test_split
 import pickle
 import os
+import random
+import time
 from typing import Dict, List, Tuple, Optional
+
+from backend.predictive_model.artifacts import artifact_path, save_preprocessing, load_preprocessing
+from backend.src.utils.logger import get_logger
 import warnings
 warnings.filterwarnings('ignore')
 
+logger = get_logger(__name__)
+
 
 class SaunaDataset(Dataset):
     """PyTorch Dataset for sauna recommendation data"""
@@ -33,6 +38,41 @@ class SaunaDataset(Dataset):
         return self.features[idx], self.targets[idx]
 
 
+class TensorBatchLoader:
+    """
+    DataLoader replacement for data that fits in (device) memory
+    
+    Keeps features/targets as resident tensors, shuffles with one permutation
+    per epoch and yields contiguous slices, so there is no per-sample
+    __getitem__ or collate work.
+    """
+    
+    def __init__(self, features: torch.Tensor, targets: torch.Tensor, batch_size: int,
+                 shuffle: bool = False, drop_singleton: bool = False):
+        self.features = features
+        self.targets = targets
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        # BatchNorm cannot train on a batch of one sample
+        self.drop_singleton = drop_singleton
+    
+    def __len__(self):
+        n_batches = (len(self.features) + self.batch_size - 1) // self.batch_size
+        if self.drop_singleton and n_batches > 1 and len(self.features) % self.batch_size == 1:
+            n_batches -= 1
+        return n_batches
+    
+    def __iter__(self):
+        features, targets = self.features, self.targets
+        if self.shuffle:
+            permutation = torch.randperm(len(features), device=features.device)
+            features, targets = features[permutation], targets[permutation]
+        
+        for i in range(len(self)):
+            start = i * self.batch_size
+            yield features[start:start + self.batch_size], targets[start:start + self.batch_size]
+
+
 class SaunaRecommendationModel(nn.Module):
     """Neural Network for predicting optimal sauna settings"""
     
@@ -62,11 +102,23 @@ class SaunaRecommendationModel(nn.Module):
 class SaunaRecommendationEngine:
     """Main engine for sauna recommendations using neural network"""
     
-    def __init__(self, model_path: Optional[str] = None, scaler_path: Optional[str] = None):
+    # Safety bounds per output: temperature (°C), humidity (%), session length (minutes)
+    OUTPUT_BOUNDS = np.array([[60.0, 100.0], [5.0, 25.0], [10.0, 30.0]])
+    
+    COMBINE_STRATEGIES = ('weighted_mean', 'min', 'max')
+    
+    def __init__(self, model_path: Optional[str] = None, scaler_path: Optional[str] = None,
+                 hidden_sizes: Optional[List[int]] = None, dropout_rate: float = 0.3,
+                 allow_pickle: bool = False):
         self.model = None
-        self.scaler = StandardScaler()
-        self.goal_encoder = LabelEncoder()
-        self.gender_encoder = LabelEncoder()
+        # Architecture used by train(); load_model() restores it from the saved encoders
+        self.hidden_sizes = list(hidden_sizes) if hidden_sizes else [128, 64, 32]
+        self.dropout_rate = dropout_rate
+        # scikit-learn is only imported when training; serving uses the NumPy-only
+        # preprocessing artifact (see artifacts.py)
+        self.scaler = None
+        self.goal_encoder = None
+        self.gender_encoder = None
         
         # Goal mapping from frontend to CSV
         self.goal_mapping = {
@@ -89,14 +141,19 @@ class SaunaRecommendationEngine:
         self.goal_columns = None
         
         self.model_path = model_path or 'sauna_recommendation_model.pth'
-        self.scaler_path = scaler_path or 'sauna_scaler.pkl'
+        self.scaler_path = scaler_path or 'sauna_scaler.bin'
+        
+        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
         
         if model_path and os.path.exists(model_path):
-            self.load_model(model_path, scaler_path)
+            self.load_model(model_path, scaler_path or self.scaler_path, allow_pickle=allow_pickle)
     
     def load_data(self, csv_path: str) -> pd.DataFrame:
-        """Load and prepare data from CSV"""
-        df = pd.read_csv(csv_path)
+        """Load and prepare data from CSV, or from a Parquet file/part directory"""
+        if str(csv_path).endswith('.csv'):
+            df = pd.read_csv(csv_path)
+        else:
+            df = pd.read_parquet(csv_path)
         return df
     
     def prepare_features(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
@@ -105,7 +162,10 @@ class SaunaRecommendationEngine:
         Features: age, BMI, body_mass, height, goal (one-hot encoded)
         Targets: best_temp, best_humidity, best_session
         """
+        from sklearn.preprocessing import LabelEncoder
+        
         # Encode goals
+        self.goal_encoder = LabelEncoder()
         df['goal_encoded'] = self.goal_encoder.fit_transform(df['goal'])
         
         # One-hot encode goals - ensure consistent column order
@@ -133,11 +193,50 @@ class SaunaRecommendationEngine:
         
         return features, targets
     
+    def split_data(self, features: np.ndarray, targets: np.ndarray, test_size: float = 0.2,
+                   validation_size: float = 0.1) -> Tuple[np.ndarray, ...]:
+        """
+        Deterministic train/validation/test split used by train()
+        
+        Returns:
+            X_train, X_val, X_test, y_train, y_val, y_test
+        """
+        from sklearn.model_selection import train_test_split
+        
+        X_train, X_temp, y_train, y_temp = train_test_split(
+            features, targets, test_size=(test_size + validation_size), random_state=42
+        )
+        
+        val_size_adjusted = validation_size / (test_size + validation_size)
+        X_val, X_test, y_val, y_test = train_test_split(
+            X_temp, y_temp, test_size=(1 - val_size_adjusted), random_state=42
+        )
+        return X_train, X_val, X_test, y_train, y_val, y_test
+    
     def train(self, csv_path: str, epochs: int = 100, batch_size: int = 32, 
               learning_rate: float = 0.001, test_size: float = 0.2, 
-              validation_size: float = 0.1, save_model: bool = True, ):
+              validation_size: float = 0.1, save_model: bool = True,
+              fast: bool = False, scale_lr: bool = False, eval_batch_size: int = 8192,
+              patience: int = 20, weight_decay: float = 1e-5,
+              checkpoint_path: Optional[str] = None, checkpoint_every: int = 10, resume: bool = False):
         """
         Train the neural network model
+        
+        Args:
+            fast: Keep the scaled data as resident tensors and slice batches directly
+                  (TensorBatchLoader) instead of going through SaunaDataset/DataLoader
+            scale_lr: Scale learning_rate linearly with batch_size relative to the
+                      reference batch size of 32, for large-batch training
+            eval_batch_size: Batch size for validation/test in fast mode
+            patience: Epochs without validation improvement before early stopping
+            weight_decay: Adam weight decay
+            checkpoint_path: Where to write periodic full training checkpoints
+                             (model, optimizer, scheduler, RNG state, epoch)
+            checkpoint_every: Epochs between checkpoints
+            resume: Continue from checkpoint_path if it exists
+        
+        The best weights are kept in memory, restored before test evaluation and
+        written to disk once at the end when save_model is set.
         """
         print("Loading data...")
         df = self.load_data(csv_path)
@@ -147,13 +246,8 @@ class SaunaRecommendationEngine:
         features, targets = self.prepare_features(df)
         
         # Split data: train -> validation -> test
-        X_train, X_temp, y_train, y_temp = train_test_split(
-            features, targets, test_size=(test_size + validation_size), random_state=42
-        )
-        
-        val_size_adjusted = validation_size / (test_size + validation_size)
-        X_val, X_test, y_val, y_test = train_test_split(
-            X_temp, y_temp, test_size=(1 - val_size_adjusted), random_state=42
+        X_train, X_val, X_test, y_train, y_val, y_test = self.split_data(
+            features, targets, test_size=test_size, validation_size=validation_size
         )
         
         print(f"Train samples: {len(X_train)}")
@@ -162,42 +256,121 @@ class SaunaRecommendationEngine:
         
         # Scale features
         print("Scaling features...")
+        from sklearn.preprocessing import StandardScaler
+        
+        self.scaler = StandardScaler()
         X_train_scaled = self.scaler.fit_transform(X_train)
         X_val_scaled = self.scaler.transform(X_val)
         X_test_scaled = self.scaler.transform(X_test)
         
-        # Create datasets and data loaders
-        train_dataset = SaunaDataset(X_train_scaled, y_train)
-        val_dataset = SaunaDataset(X_val_scaled, y_val)
-        test_dataset = SaunaDataset(X_test_scaled, y_test)
+        device = self.device
+        
+        if fast:
+            # Move everything to the device once; batches are slices of these tensors
+            def to_tensor(array):
+                return torch.as_tensor(np.asarray(array, dtype=np.float32), device=device)
+            
+            train_loader = TensorBatchLoader(to_tensor(X_train_scaled), to_tensor(y_train), batch_size,
+                                             shuffle=True, drop_singleton=True)
+            val_loader = TensorBatchLoader(to_tensor(X_val_scaled), to_tensor(y_val), eval_batch_size)
+            test_loader = TensorBatchLoader(to_tensor(X_test_scaled), to_tensor(y_test), eval_batch_size)
+        else:
+            # Create datasets and data loaders
+            train_dataset = SaunaDataset(X_train_scaled, y_train)
+            val_dataset = SaunaDataset(X_val_scaled, y_val)
+            test_dataset = SaunaDataset(X_test_scaled, y_test)
+            
+            # BatchNorm cannot train on a batch of one sample, so drop a trailing singleton batch
+            train_loader = DataLoader(train_dataset, batch_size=batch_size, shuffle=True,
+                                      drop_last=len(train_dataset) > 1 and len(train_dataset) % batch_size == 1)
+            val_loader = DataLoader(val_dataset, batch_size=batch_size, shuffle=False)
+            test_loader = DataLoader(test_dataset, batch_size=batch_size, shuffle=False)
         
-        train_loader = DataLoader(train_dataset, batch_size=batch_size, shuffle=True)
-        val_loader = DataLoader(val_dataset, batch_size=batch_size, shuffle=False)
-        test_loader = DataLoader(test_dataset, batch_size=batch_size, shuffle=False)
+        if scale_lr:
+            learning_rate = learning_rate * batch_size / 32
+            print(f"Scaled learning rate to {learning_rate:g} for batch size {batch_size}")
         
         # Initialize model
         input_size = features.shape[1]
-        self.model = SaunaRecommendationModel(input_size=input_size)
+        self.model = SaunaRecommendationModel(input_size=input_size, hidden_sizes=self.hidden_sizes,
+                                              dropout_rate=self.dropout_rate)
         
         # Loss and optimizer
         criterion = nn.MSELoss()
-        optimizer = optim.Adam(self.model.parameters(), lr=learning_rate, weight_decay=1e-5)
+        optimizer = optim.Adam(self.model.parameters(), lr=learning_rate, weight_decay=weight_decay)
         scheduler = optim.lr_scheduler.ReduceLROnPlateau(optimizer, mode='min', factor=0.5, patience=10)
         
         # Training loop
-        device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
         self.model.to(device)
         print(f"Using device: {device}")
         
         best_val_loss = float('inf')
+        best_state = None
         patience_counter = 0
-        patience = 20
+        start_epoch = 0
+        
+        if resume and checkpoint_path and os.path.exists(checkpoint_path):
+            checkpoint = self.load_checkpoint(checkpoint_path, optimizer, scheduler)
+            start_epoch = checkpoint['epoch'] + 1
+            best_val_loss = checkpoint['best_val_loss']
+            best_state = checkpoint['best_state']
+            patience_counter = checkpoint['patience_counter']
+            print(f"Resumed from {checkpoint_path} at epoch {start_epoch}")
         
         print("\nStarting training...")
-        for epoch in range(epochs):
+        train_start = time.perf_counter()
+        best_val_loss, epochs_trained = self._run_epochs(
+            train_loader, val_loader, criterion, optimizer, scheduler, epochs=epochs, patience=patience,
+            start_epoch=start_epoch, best_val_loss=best_val_loss, best_state=best_state,
+            patience_counter=patience_counter, checkpoint_path=checkpoint_path,
+            checkpoint_every=checkpoint_every
+        )
+        train_seconds = time.perf_counter() - train_start
+        
+        if save_model:
+            self.save_model(self.model_path, self.scaler_path)
+        
+        # Test evaluation
+        print("\nEvaluating on test set...")
+        results = self.evaluate(test_loader, criterion)
+        
+        print(f"\nTest Results:")
+        print(f"Test Loss: {results['test_loss']:.4f}")
+        print(f"MAE - Temperature: {results['mae_temp']:.2f}°C")
+        print(f"MAE - Humidity: {results['mae_humidity']:.2f}%")
+        print(f"MAE - Session Length: {results['mae_session']:.2f} minutes")
+        
+        results.update({
+            'best_val_loss': best_val_loss,
+            'epochs_trained': epochs_trained,
+            'train_seconds': train_seconds
+        })
+        return results
+    
+    def _run_epochs(self, train_loader, val_loader, criterion, optimizer, scheduler, epochs: int,
+                    patience: int, start_epoch: int = 0, best_val_loss: float = float('inf'),
+                    best_state: Optional[Dict] = None, patience_counter: int = 0,
+                    checkpoint_path: Optional[str] = None, checkpoint_every: int = 10) -> Tuple[float, int]:
+        """
+        Epoch loop shared by train() and fine_tune(): train, validate, early stop,
+        checkpoint. The best weights are kept in memory and loaded into the model
+        when the loop ends. A checkpoint is written every checkpoint_every epochs and
+        always on the last epoch run, whether that is the final epoch or an early stop;
+        resuming an early-stopped checkpoint trains no further.
+        
+        Returns:
+            best_val_loss, number of epochs trained (including resumed ones)
+        """
+        device = self.device
+        epochs_trained = start_epoch
+        if patience_counter >= patience:
+            print(f"Already stopped early after epoch {start_epoch}")
+            start_epoch = epochs
+        for epoch in range(start_epoch, epochs):
             # Training
             self.model.train()
-            train_loss = 0.0
+            # Accumulate on the device to avoid a host sync per batch
+            train_loss = torch.zeros((), device=device)
             for batch_features, batch_targets in train_loader:
                 batch_features = batch_features.to(device)
                 batch_targets = batch_targets.to(device)
@@ -208,52 +381,67 @@ class SaunaRecommendationEngine:
                 loss.backward()
                 optimizer.step()
                 
-                train_loss += loss.item()
+                train_loss += loss.detach()
             
             # Validation
-            self.model.eval()
-            val_loss = 0.0
-            with torch.no_grad():
-                for batch_features, batch_targets in val_loader:
-                    batch_features = batch_features.to(device)
-                    batch_targets = batch_targets.to(device)
-                    
-                    outputs = self.model(batch_features)
-                    loss = criterion(outputs, batch_targets)
-                    val_loss += loss.item()
+            val_loss = self._validation_loss(val_loader, criterion)
             
-            train_loss /= len(train_loader)
-            val_loss /= len(val_loader)
+            train_loss = train_loss.item() / len(train_loader)
+            epochs_trained = epoch + 1
             
             scheduler.step(val_loss)
             
-            # Early stopping
+            # Early stopping; keep the best weights in memory instead of saving every improvement
             if val_loss < best_val_loss:
                 best_val_loss = val_loss
+                best_state = {k: v.detach().clone() for k, v in self.model.state_dict().items()}
                 patience_counter = 0
-                if save_model:
-                    self.save_model(self.model_path, self.scaler_path)
             else:
                 patience_counter += 1
             
+            stopping = patience_counter >= patience
+            if checkpoint_path and ((epoch + 1) % checkpoint_every == 0 or stopping or epoch + 1 == epochs):
+                self.save_checkpoint(checkpoint_path, optimizer, scheduler, epoch=epoch,
+                                     best_val_loss=best_val_loss, best_state=best_state,
+                                     patience_counter=patience_counter)
+            
             if (epoch + 1) % 10 == 0:
                 print(f"Epoch [{epoch+1}/{epochs}] - Train Loss: {train_loss:.4f}, Val Loss: {val_loss:.4f}")
             
-            if patience_counter >= patience:
+            if stopping:
                 print(f"Early stopping at epoch {epoch+1}")
                 break
         
-        # Test evaluation
-        print("\nEvaluating on test set...")
+        if best_state is not None:
+            self.model.load_state_dict(best_state)
+        return best_val_loss, epochs_trained
+    
+    def _validation_loss(self, loader, criterion) -> float:
+        """Mean of per-batch losses over a loader, in eval mode"""
+        self.model.eval()
+        total_loss = 0.0
+        with torch.no_grad():
+            for batch_features, batch_targets in loader:
+                batch_features = batch_features.to(self.device)
+                batch_targets = batch_targets.to(self.device)
+                
+                outputs = self.model(batch_features)
+                loss = criterion(outputs, batch_targets)
+                total_loss += loss.item()
+        return total_loss / len(loader)
+    
+    def evaluate(self, loader, criterion=None) -> Dict[str, float]:
+        """Loss and per-output MAE of the current model over a loader"""
+        criterion = criterion or nn.MSELoss()
         self.model.eval()
         test_loss = 0.0
         predictions = []
         actuals = []
         
         with torch.no_grad():
-            for batch_features, batch_targets in test_loader:
-                batch_features = batch_features.to(device)
-                batch_targets = batch_targets.to(device)
+            for batch_features, batch_targets in loader:
+                batch_features = batch_features.to(self.device)
+                batch_targets = batch_targets.to(self.device)
                 
                 outputs = self.model(batch_features)
                 loss = criterion(outputs, batch_targets)
@@ -262,65 +450,152 @@ class SaunaRecommendationEngine:
                 predictions.append(outputs.cpu().numpy())
                 actuals.append(batch_targets.cpu().numpy())
         
-        test_loss /= len(test_loader)
+        test_loss /= len(loader)
         predictions = np.vstack(predictions)
         actuals = np.vstack(actuals)
         
         # Calculate metrics
-        mae_temp = np.mean(np.abs(predictions[:, 0] - actuals[:, 0]))
-        mae_humidity = np.mean(np.abs(predictions[:, 1] - actuals[:, 1]))
-        mae_session = np.mean(np.abs(predictions[:, 2] - actuals[:, 2]))
-        
-        print(f"\nTest Results:")
-        print(f"Test Loss: {test_loss:.4f}")
-        print(f"MAE - Temperature: {mae_temp:.2f}°C")
-        print(f"MAE - Humidity: {mae_humidity:.2f}%")
-        print(f"MAE - Session Length: {mae_session:.2f} minutes")
-        
         return {
             'test_loss': test_loss,
-            'mae_temp': mae_temp,
-            'mae_humidity': mae_humidity,
-            'mae_session': mae_session
+            'mae_temp': np.mean(np.abs(predictions[:, 0] - actuals[:, 0])),
+            'mae_humidity': np.mean(np.abs(predictions[:, 1] - actuals[:, 1])),
+            'mae_session': np.mean(np.abs(predictions[:, 2] - actuals[:, 2]))
         }
     
-    def predict(self, age: float, gender: str, height: float, weight: float, 
-                selected_goals: List[str]) -> Dict[str, float]:
+    def transform_features(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Predict optimal sauna settings for a user
+        Same features/targets as prepare_features, but using the goal column
+        order of the already trained model instead of refitting it
+        """
+        if self.goal_columns is None:
+            raise ValueError("Goal columns not set. Please train or load a model first.")
+        
+        goal_onehot = np.zeros((len(df), len(self.goal_columns)), dtype=np.float64)
+        goal_names = ('goal_' + df['goal'].astype(str)).to_numpy()
+        for i, goal_col in enumerate(self.goal_columns):
+            goal_onehot[:, i] = goal_names == goal_col
+        
+        features = np.hstack([df[['age', 'BMI', 'body_mass', 'height']].values, goal_onehot])
+        targets = df[['best_temp', 'best_humidity', 'best_session']].values
+        return features, targets
+    
+    def fine_tune(self, new_data_path: str, replay_data_path: Optional[str] = None,
+                  replay_ratio: float = 1.0, epochs: int = 20, batch_size: int = 256,
+                  learning_rate: float = 1e-4, validation_size: float = 0.1,
+                  patience: int = 5, weight_decay: float = 1e-5, save_model: bool = True,
+                  seed: int = 42) -> Dict[str, float]:
+        """
+        Warm-start training on new rows (e.g. outcomes collected from real sessions)
+        
+        Starts from the loaded weights and keeps the fitted scaler and goal
+        columns, so predictions stay on the same feature scale. A random replay
+        sample of the old training data is mixed in to avoid drifting away from
+        what the model already knows.
         
         Args:
-            age: User's age
-            gender: User's gender (Male, Female, Other, Prefer not to say)
-            height: User's height in meters
-            weight: User's weight in kg
-            selected_goals: List of goal IDs from frontend
+            new_data_path: CSV/Parquet of new rows in the training table schema
+                           (age, BMI, body_mass, height, goal, best_temp, best_humidity, best_session)
+            replay_data_path: Old training data to sample replay rows from
+            replay_ratio: Replay rows per new row
+            epochs: Maximum fine-tuning epochs
+            batch_size: Batch size; fine-tuning always uses resident tensors
+            learning_rate: Usually well below the from-scratch learning rate
+            validation_size: Fraction of the mixed rows held out for early stopping
+            patience: Epochs without validation improvement before stopping
+            save_model: Write the result to self.model_path / self.scaler_path
+            seed: Seed for the replay sample and the validation split
         
         Returns:
-            Dictionary with 'temperature', 'humidity', 'session_length'
+            Validation metrics before and after fine-tuning, plus row counts and timing
         """
         if self.model is None:
             raise ValueError("Model not loaded. Please train or load a model first.")
         
-        # Calculate BMI
-        bmi = weight / (height ** 2)
+        new_df = self.load_data(new_data_path)
+        frames = [new_df]
+        n_replay = 0
+        if replay_data_path and replay_ratio > 0:
+            old_df = self.load_data(replay_data_path)
+            n_replay = min(len(old_df), int(round(len(new_df) * replay_ratio)))
+            frames.append(old_df.sample(n=n_replay, random_state=seed))
+        df = pd.concat(frames, ignore_index=True)
+        print(f"Fine-tuning on {len(new_df)} new rows + {n_replay} replay rows")
+        
+        from sklearn.model_selection import train_test_split
+        
+        features, targets = self.transform_features(df)
+        X_train, X_val, y_train, y_val = train_test_split(
+            features, targets, test_size=validation_size, random_state=seed
+        )
+        # A trailing batch of one sample is dropped below, but a single training row can't be
+        if len(X_train) < 2:
+            raise ValueError(f"Fine-tuning needs at least 2 training rows, got {len(X_train)}: "
+                             f"BatchNorm can't train on a batch of one sample")
+        
+        device = self.device
+        
+        def to_tensor(array):
+            return torch.as_tensor(np.asarray(array, dtype=np.float32), device=device)
+        
+        train_loader = TensorBatchLoader(to_tensor(self.scaler.transform(X_train)), to_tensor(y_train),
+                                         batch_size, shuffle=True, drop_singleton=True)
+        val_loader = TensorBatchLoader(to_tensor(self.scaler.transform(X_val)), to_tensor(y_val), 8192)
+        
+        criterion = nn.MSELoss()
+        before = self.evaluate(val_loader, criterion)
+        
+        optimizer = optim.Adam(self.model.parameters(), lr=learning_rate, weight_decay=weight_decay)
+        scheduler = optim.lr_scheduler.ReduceLROnPlateau(optimizer, mode='min', factor=0.5, patience=2)
+        
+        # Start from the current weights as the best, so fine-tuning never makes validation worse
+        start = time.perf_counter()
+        best_val_loss, epochs_trained = self._run_epochs(
+            train_loader, val_loader, criterion, optimizer, scheduler, epochs=epochs, patience=patience,
+            best_val_loss=before['test_loss'],
+            best_state={k: v.detach().clone() for k, v in self.model.state_dict().items()}
+        )
+        train_seconds = time.perf_counter() - start
+        after = self.evaluate(val_loader, criterion)
+        
+        if save_model:
+            self.save_model(self.model_path, self.scaler_path)
+        
+        print(f"Validation loss {before['test_loss']:.4f} -> {after['test_loss']:.4f} "
+              f"in {epochs_trained} epochs ({train_seconds:.1f}s)")
         
-        # Map frontend goals to CSV goals
+        before['val_loss'] = before.pop('test_loss')
+        after['val_loss'] = after.pop('test_loss')
+        return {
+            **{f'{k}_before': v for k, v in before.items()},
+            **{f'{k}_after': v for k, v in after.items()},
+            'new_rows': len(new_df),
+            'replay_rows': n_replay,
+            'epochs_trained': epochs_trained,
+            'train_seconds': train_seconds
+        }
+    
+    def _map_goals(self, selected_goals: List[str]) -> List[str]:
+        """Map frontend goal IDs to CSV goal names, dropping unknown and duplicate goals"""
         csv_goals = []
         for goal in selected_goals:
             if goal in self.goal_mapping:
-                csv_goals.append(self.goal_mapping[goal])
-            elif goal in self.all_goals:
+                goal = self.goal_mapping[goal]
+            elif goal not in self.all_goals:
+                continue
+            if goal not in csv_goals:
                 csv_goals.append(goal)
         
-        # If multiple goals, we'll use the first one for now
-        # Future enhancement: could average predictions or use multi-goal encoding
         if not csv_goals:
             # Default to stress_relief if no goals provided
             csv_goals = ['stress_relief']
-        
-        primary_goal = csv_goals[0]
-        
+        return csv_goals
+    
+    def _build_goal_features(self, age: float, height: float, weight: float,
+                             csv_goals: List[str]) -> np.ndarray:
+        """
+        Build one feature row per goal in the same column order as training:
+        age, BMI, body_mass, height + goal one-hot
+        """
         # Create one-hot encoding for goals using the same column order as training
         if self.goal_columns is None:
             # Fallback to sorted goals if goal_columns not set (shouldn't happen if model was trained)
@@ -328,84 +603,246 @@ class SaunaRecommendationEngine:
         else:
             goal_cols = self.goal_columns
         
-        # Create feature vector in the same order as training
-        feature_order = ['age', 'BMI', 'body_mass', 'height'] + goal_cols
+        bmi = weight / (height ** 2)
+        features = np.zeros((len(csv_goals), 4 + len(goal_cols)), dtype=np.float32)
+        features[:, :4] = [age, bmi, weight, height]
+        
+        col_index = {col: i for i, col in enumerate(goal_cols)}
+        for row, goal in enumerate(csv_goals):
+            col = col_index.get(f'goal_{goal}')
+            if col is not None:
+                features[row, 4 + col] = 1.0
+        return features
+    
+    def is_ready(self) -> bool:
+        """Whether predict() can be served"""
+        return self.model is not None
+    
+    def predict_batch(self, features: np.ndarray) -> np.ndarray:
+        """Predict raw (unclipped) outputs (n, 3) for unscaled feature rows"""
+        # Scale features, then run all rows in one forward pass
+        return self._forward(self.scaler.transform(features))
+    
+    def _forward(self, features_scaled: np.ndarray) -> np.ndarray:
+        """
+        Run a single batched forward pass and return predictions as (n, 3)
         
-        # Build feature dict with all goals set to 0, then set the primary goal to 1
-        feature_dict = {
-            'age': age,
-            'BMI': bmi,
-            'body_mass': weight,
-            'height': height
-        }
+        The model is moved to self.device and put in eval mode once when it is
+        loaded or trained, not on every request.
+        """
+        with torch.inference_mode():
+            features_tensor = torch.as_tensor(features_scaled, dtype=torch.float32).to(self.device)
+            prediction = self.model(features_tensor)
+        return prediction.cpu().numpy()
+    
+    def combine_predictions(self, predictions: np.ndarray, strategy: str = 'weighted_mean',
+                            weights: Optional[List[float]] = None) -> np.ndarray:
+        """
+        Combine per-goal predictions (n_goals, 3) into a single recommendation
         
-        # Initialize all goal columns to 0
-        for goal_col in goal_cols:
-            feature_dict[goal_col] = 0.0
+        Strategies:
+            weighted_mean: weighted average of the goals (equal weights by default)
+            min: per-output minimum, i.e. the most conservative setting
+            max: per-output maximum, i.e. the most intense setting
         
-        # Set the primary goal to 1
-        primary_goal_col = f'goal_{primary_goal}'
-        if primary_goal_col in feature_dict:
-            feature_dict[primary_goal_col] = 1.0
+        Per-goal predictions are clipped to OUTPUT_BOUNDS before combining so
+        the result always stays within the safety bounds.
+        """
+        predictions = np.clip(predictions, self.OUTPUT_BOUNDS[:, 0], self.OUTPUT_BOUNDS[:, 1])
+        
+        if strategy == 'weighted_mean':
+            if weights is None:
+                weights = np.ones(len(predictions))
+            weights = np.asarray(weights, dtype=np.float64)
+            if weights.shape != (len(predictions),) or np.any(weights < 0) or weights.sum() <= 0:
+                raise ValueError("Goal weights must be non-negative, one per goal, and not all zero")
+            return (predictions * weights[:, None]).sum(axis=0) / weights.sum()
+        if strategy == 'min':
+            return predictions.min(axis=0)
+        if strategy == 'max':
+            return predictions.max(axis=0)
+        raise ValueError(f"Unknown combine strategy: {strategy}. Expected one of {self.COMBINE_STRATEGIES}")
+    
+    def predict(self, age: float, gender: str, height: float, weight: float, 
+                selected_goals: List[str], strategy: str = 'weighted_mean',
+                goal_weights: Optional[Dict[str, float]] = None) -> Dict:
+        """
+        Predict optimal sauna settings for a user
         
-        # Create feature array in the correct order
-        features = np.array([[feature_dict[col] for col in feature_order]], dtype=np.float32)
+        All selected goals are scored in one batched forward pass and combined
+        with the given strategy.
         
-        # Scale features
-        features_scaled = self.scaler.transform(features)
+        Args:
+            age: User's age
+            gender: User's gender (Male, Female, Other, Prefer not to say)
+            height: User's height in meters
+            weight: User's weight in kg
+            selected_goals: List of goal IDs from frontend
+            strategy: How to combine goals: 'weighted_mean', 'min' or 'max'
+            goal_weights: Optional weight per goal (frontend or CSV goal ID) for 'weighted_mean',
+                          goals without a weight default to 1.0. Weights for goals that are
+                          not selected raise ValueError, like invalid weights or strategies.
         
-        # Predict
-        device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
-        self.model.to(device)
-        self.model.eval()
+        Returns:
+            Dictionary with 'temperature', 'humidity', 'session_length', 'goals_used'
+            and a 'per_goal' breakdown keyed by CSV goal name
+        """
+        if not self.is_ready():
+            raise ValueError("Model not loaded. Please train or load a model first.")
         
-        with torch.no_grad():
-            features_tensor = torch.FloatTensor(features_scaled).to(device)
-            prediction = self.model(features_tensor)
-            prediction = prediction.cpu().numpy()[0]
+        csv_goals = self._map_goals(selected_goals)
+        
+        weights = None
+        if goal_weights:
+            csv_weights = {self.goal_mapping.get(goal, goal): weight for goal, weight in goal_weights.items()}
+            unselected = sorted(set(csv_weights) - set(csv_goals))
+            if unselected:
+                raise ValueError(f"Goal weights given for goals that are not selected: {', '.join(unselected)}")
+            weights = [csv_weights.get(goal, 1.0) for goal in csv_goals]
+        
+        features = self._build_goal_features(age, height, weight, csv_goals)
         
-        # Ensure reasonable bounds
-        temperature = max(60, min(100, prediction[0]))  # 60-100°C
-        humidity = max(5, min(25, prediction[1]))       # 5-25%
-        session_length = max(10, min(30, prediction[2])) # 10-30 minutes
+        # Predict all goals in one batch
+        predictions = self.predict_batch(features)
+        
+        combined = self.combine_predictions(predictions, strategy=strategy, weights=weights)
+        result = self._format_prediction(combined)
+        result['goals_used'] = csv_goals
+        result['per_goal'] = {
+            goal: self._format_prediction(prediction)
+            for goal, prediction in zip(csv_goals, predictions)
+        }
+        return result
+    
+    def _format_prediction(self, prediction: np.ndarray) -> Dict[str, float]:
+        """Clip a (3,) prediction to safety bounds and round it"""
+        # Ensure reasonable bounds: 60-100°C, 5-25%, 10-30 minutes
+        temperature, humidity, session_length = np.clip(
+            prediction, self.OUTPUT_BOUNDS[:, 0], self.OUTPUT_BOUNDS[:, 1]
+        )
         
         return {
-            'temperature': round(temperature, 1),
-            'humidity': round(humidity, 1),
-            'session_length': round(session_length, 1)
+            'temperature': round(float(temperature), 1),
+            'humidity': round(float(humidity), 1),
+            'session_length': round(float(session_length), 1)
+        }
+    
+    def save_checkpoint(self, checkpoint_path: str, optimizer, scheduler, epoch: int,
+                        best_val_loss: float, best_state: Optional[Dict], patience_counter: int):
+        """Atomically write everything needed to continue training after `epoch`"""
+        checkpoint = {
+            'epoch': epoch,
+            'model_state': self.model.state_dict(),
+            'optimizer_state': optimizer.state_dict(),
+            'scheduler_state': scheduler.state_dict(),
+            'best_val_loss': best_val_loss,
+            'best_state': best_state,
+            'patience_counter': patience_counter,
+            'model_config': {'hidden_sizes': self.hidden_sizes, 'dropout_rate': self.dropout_rate},
+            'rng_state': {
+                'torch': torch.get_rng_state(),
+                'cuda': torch.cuda.get_rng_state_all() if torch.cuda.is_available() else None,
+                'numpy': np.random.get_state(),
+                'python': random.getstate(),
+            },
         }
+        tmp_path = f"{checkpoint_path}.tmp"
+        torch.save(checkpoint, tmp_path)
+        os.replace(tmp_path, checkpoint_path)
+    
+    def load_checkpoint(self, checkpoint_path: str, optimizer, scheduler) -> Dict:
+        """Restore model, optimizer, scheduler and RNG state from a training checkpoint"""
+        checkpoint = torch.load(checkpoint_path, map_location=self.device, weights_only=False)
+        
+        model_config = checkpoint['model_config']
+        if model_config != {'hidden_sizes': self.hidden_sizes, 'dropout_rate': self.dropout_rate}:
+            raise ValueError(f"Checkpoint architecture {model_config} does not match the engine's")
+        
+        self.model.load_state_dict(checkpoint['model_state'])
+        optimizer.load_state_dict(checkpoint['optimizer_state'])
+        scheduler.load_state_dict(checkpoint['scheduler_state'])
+        
+        rng_state = checkpoint['rng_state']
+        torch.set_rng_state(rng_state['torch'].cpu())
+        if rng_state['cuda'] is not None and torch.cuda.is_available():
+            torch.cuda.set_rng_state_all(rng_state['cuda'])
+        np.random.set_state(rng_state['numpy'])
+        random.setstate(rng_state['python'])
+        return checkpoint
     
     def save_model(self, model_path: str, scaler_path: str):
-        """Save model and scaler"""
+        """
+        Save model and preprocessing
+        
+        The scaler, goal columns and model config go into one NumPy-only artifact
+        (see artifacts.py) next to scaler_path, with a .bin suffix.
+        """
         if self.model is None:
             raise ValueError("No model to save")
         
         torch.save(self.model.state_dict(), model_path)
         
-        with open(scaler_path, 'wb') as f:
-            pickle.dump(self.scaler, f)
-        
-        # Save encoders
-        encoder_path = scaler_path.replace('.pkl', '_encoders.pkl')
-        with open(encoder_path, 'wb') as f:
-            pickle.dump({
-                'goal_encoder': self.goal_encoder,
-                'goal_mapping': self.goal_mapping,
-                'all_goals': self.all_goals,
-                'goal_columns': self.goal_columns
-            }, f)
+        preprocessing_path = artifact_path(scaler_path)
+        save_preprocessing(str(preprocessing_path), self.scaler.mean_, self.scaler.scale_, {
+            'goal_columns': self.goal_columns,
+            'all_goals': self.all_goals,
+            'goal_mapping': self.goal_mapping,
+            'goal_classes': [str(c) for c in getattr(self.goal_encoder, 'classes_', [])],
+            'model_config': {
+                'hidden_sizes': self.hidden_sizes,
+                'dropout_rate': self.dropout_rate
+            }
+        })
         
         print(f"Model saved to {model_path}")
-        print(f"Scaler saved to {scaler_path}")
+        print(f"Scaler saved to {preprocessing_path}")
     
-    def load_model(self, model_path: str, scaler_path: str):
-        """Load model and scaler"""
+    def load_model(self, model_path: str, scaler_path: str, allow_pickle: bool = False):
+        """
+        Load model and preprocessing
+        
+        Reads the NumPy-only artifact (scaler_path with a .bin suffix). Legacy .pkl
+        scaler/encoder pickles are only read with allow_pickle=True, when no artifact
+        exists; only load those from trusted sources, and convert them with artifacts.py.
+        """
         if not os.path.exists(model_path):
             raise FileNotFoundError(f"Model file not found: {model_path}")
         
-        if not os.path.exists(scaler_path):
-            raise FileNotFoundError(f"Scaler file not found: {scaler_path}")
+        preprocessing_path = artifact_path(scaler_path)
+        pickle_path = str(preprocessing_path.with_suffix('.pkl'))
+        if preprocessing_path.exists():
+            self.scaler, metadata = load_preprocessing(str(preprocessing_path))
+            self.goal_mapping = metadata.get('goal_mapping') or self.goal_mapping
+            self.all_goals = metadata.get('all_goals') or self.all_goals
+            self.goal_columns = metadata.get('goal_columns') or sorted([f'goal_{g}' for g in self.all_goals])
+            model_config = metadata.get('model_config', {})
+            self.hidden_sizes = model_config.get('hidden_sizes', self.hidden_sizes)
+            self.dropout_rate = model_config.get('dropout_rate', self.dropout_rate)
+        elif os.path.exists(pickle_path) and allow_pickle:
+            logger.warning(f"Loading legacy scaler pickles from {pickle_path}; convert them with "
+                           f"`python -m backend.predictive_model.artifacts --scaler {pickle_path}`.")
+            self._load_legacy_pickles(pickle_path)
+        elif os.path.exists(pickle_path):
+            raise FileNotFoundError(f"No preprocessing artifact at {preprocessing_path}, only legacy pickles at "
+                                    f"{pickle_path}. Convert them with `python -m backend.predictive_model.artifacts "
+                                    f"--scaler {pickle_path}`, or opt in to loading pickles.")
+        else:
+            raise FileNotFoundError(f"Scaler file not found: {preprocessing_path}")
+        
+        # Determine input size from scaler
+        input_size = self.scaler.n_features_in_
         
+        # Initialize and load model
+        self.model = SaunaRecommendationModel(input_size=input_size, hidden_sizes=self.hidden_sizes,
+                                              dropout_rate=self.dropout_rate)
+        self.model.load_state_dict(torch.load(model_path, map_location='cpu'))
+        self.model.to(self.device)
+        self.model.eval()
+        
+        print(f"Model loaded from {model_path}")
+    
+    def _load_legacy_pickles(self, scaler_path: str):
+        """Load the pre-artifact sauna_scaler.pkl / sauna_scaler_encoders.pkl pair"""
         # Load scaler
         with open(scaler_path, 'rb') as f:
             self.scaler = pickle.load(f)
@@ -419,20 +856,35 @@ class SaunaRecommendationEngine:
                 self.goal_mapping = encoders.get('goal_mapping', self.goal_mapping)
                 self.all_goals = encoders.get('all_goals', self.all_goals)
                 self.goal_columns = encoders.get('goal_columns', None)
+                model_config = encoders.get('model_config', {})
+                self.hidden_sizes = model_config.get('hidden_sizes', self.hidden_sizes)
+                self.dropout_rate = model_config.get('dropout_rate', self.dropout_rate)
                 
                 # If goal_columns not saved, reconstruct from all_goals
                 if self.goal_columns is None:
                     self.goal_columns = sorted([f'goal_{g}' for g in self.all_goals])
+    
+    def load_serving_artifact(self, artifact_path: str, num_threads: Optional[int] = None):
+        """
+        Serve from an exported TorchScript artifact (see serving.export_serving_artifact)
+        instead of the eager model. The scaler and encoders must already be loaded.
         
-        # Determine input size from scaler
-        input_size = self.scaler.n_features_in_
+        Args:
+            artifact_path: Path to a scripted (optionally int8-quantized) model
+            num_threads: Pin torch's intra-op thread count (process-wide)
+        """
+        if not os.path.exists(artifact_path):
+            raise FileNotFoundError(f"Serving artifact not found: {artifact_path}")
         
-        # Initialize and load model
-        self.model = SaunaRecommendationModel(input_size=input_size)
-        self.model.load_state_dict(torch.load(model_path, map_location='cpu'))
+        if num_threads:
+            torch.set_num_threads(num_threads)
+        
+        # Scripted artifacts are exported and quantized for CPU serving
+        self.device = torch.device('cpu')
+        self.model = torch.jit.load(artifact_path, map_location='cpu')
         self.model.eval()
         
-        print(f"Model loaded from {model_path}")
+        print(f"Serving artifact loaded from {artifact_path}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,75 @@
+"""
+Serving artifacts for the sauna recommendation model
+Exports the trained eager model to TorchScript, optionally with dynamic int8
+quantization of the Linear layers, for low-latency CPU inference.
+"""
+
+import argparse
+from pathlib import Path
+
+import torch
+import torch.nn as nn
+
+SCRIPTED_SUFFIX = ".scripted.pt"
+QUANTIZED_SUFFIX = ".int8.pt"
+
+
+def serving_artifact_path(model_path: str, quantize: bool = False) -> Path:
+    """Path of the serving artifact that sits next to a .pth model"""
+    model_path = Path(model_path)
+    suffix = QUANTIZED_SUFFIX if quantize else SCRIPTED_SUFFIX
+    return model_path.with_name(model_path.stem + suffix)
+
+
+def build_serving_module(model: nn.Module, quantize: bool = False) -> torch.jit.ScriptModule:
+    """
+    Convert an eager SaunaRecommendationModel into a frozen TorchScript module
+
+    Args:
+        model: Trained eager model
+        quantize: Apply dynamic int8 quantization to nn.Linear layers
+    """
+    model = model.cpu().eval()
+    if quantize:
+        model = torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+
+    scripted = torch.jit.script(model)
+    # Freezing inlines the eval-mode BatchNorm/Dropout and the weights
+    return torch.jit.freeze(scripted)
+
+
+def export_serving_artifact(engine, output_path: str = None, quantize: bool = False) -> Path:
+    """
+    Export the engine's loaded model as a TorchScript serving artifact
+
+    Returns:
+        Path of the written artifact
+    """
+    if engine.model is None:
+        raise ValueError("No model to export")
+
+    output_path = Path(output_path) if output_path else serving_artifact_path(engine.model_path, quantize)
+    module = build_serving_module(engine.model, quantize=quantize)
+    torch.jit.save(module, str(output_path))
+    print(f"Serving artifact saved to {output_path}")
+    return output_path
+
+
+def main():
+    from backend.predictive_model.neural_network import SaunaRecommendationEngine
+
+    script_dir = Path(__file__).parent
+    parser = argparse.ArgumentParser(description="Export TorchScript serving artifacts")
+    parser.add_argument("--model", default=str(script_dir / "sauna_recommendation_model.pth"))
+    parser.add_argument("--scaler", default=str(script_dir / "sauna_scaler.bin"))
+    parser.add_argument("--quantize", action="store_true", help="Also export a dynamic int8 artifact")
+    args = parser.parse_args()
+
+    engine = SaunaRecommendationEngine(model_path=args.model, scaler_path=args.scaler)
+    export_serving_artifact(engine)
+    if args.quantize:
+        export_serving_artifact(engine, quantize=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Parallel hyperparameter sweep for the sauna recommendation model
+
+Trains every configuration of a grid on a process pool, one configuration per
+worker with its own torch thread budget, using the regular train() loop with
+early stopping. Each finished run is appended to <sweep_dir>/results.csv, so
+an interrupted sweep picks up where it stopped when run again with the same
+sweep directory. The best run by validation loss is recorded in best.json.
+
+Usage:
+    python -m backend.predictive_model.sweep --sweep-dir sweeps/run1 --workers 4
+    python -m backend.predictive_model.sweep --sweep-dir sweeps/run1 --grid grid.json
+"""
+
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List
+
+DEFAULT_GRID = {
+    "hidden_sizes": [[128, 64, 32], [256, 128, 64], [64, 32], [128, 128, 64, 32]],
+    "dropout_rate": [0.1, 0.3],
+    "learning_rate": [1e-3, 3e-3],
+    "batch_size": [32, 256],
+}
+
+RESULT_FIELDS = ["config_id", "config", "best_val_loss", "test_loss", "mae_temp", "mae_humidity",
+                 "mae_session", "epochs_trained", "train_seconds", "model_path"]
+
+
+def expand_grid(grid: Dict[str, List]) -> List[Dict]:
+    """Cartesian product of a {param: [values]} grid"""
+    keys = sorted(grid.keys())
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def config_id(config: Dict) -> str:
+    """Stable short id for a configuration, used as its run directory name"""
+    return hashlib.sha1(json.dumps(config, sort_keys=True).encode()).hexdigest()[:10]
+
+
+def load_results(results_path: Path) -> List[Dict]:
+    if not results_path.exists():
+        return []
+    with open(results_path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def _append_result(results_path: Path, row: Dict):
+    is_new = not results_path.exists()
+    with open(results_path, "a", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        if is_new:
+            writer.writeheader()
+        writer.writerow(row)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _train_config(csv_path: str, config: Dict, run_dir: str, threads: int, epochs: int, seed: int) -> Dict:
+    """Train one configuration in a worker process"""
+    import torch
+    from backend.predictive_model.neural_network import SaunaRecommendationEngine
+
+    torch.set_num_threads(threads)
+    torch.manual_seed(seed)
+
+    train_kwargs = {k: v for k, v in config.items() if k not in ("hidden_sizes", "dropout_rate")}
+    engine = SaunaRecommendationEngine(hidden_sizes=config.get("hidden_sizes"),
+                                       dropout_rate=config.get("dropout_rate", 0.3))
+    os.makedirs(run_dir, exist_ok=True)
+    engine.model_path = os.path.join(run_dir, "sauna_recommendation_model.pth")
+    engine.scaler_path = os.path.join(run_dir, "sauna_scaler.bin")
+
+    # An interrupted run continues from its last checkpoint instead of starting over
+    metrics = engine.train(csv_path=csv_path, epochs=epochs, save_model=True,
+                           checkpoint_path=os.path.join(run_dir, "checkpoint.pt"), resume=True,
+                           **train_kwargs)
+    return {
+        "config_id": config_id(config),
+        "config": json.dumps(config, sort_keys=True),
+        **{k: float(metrics[k]) for k in ("best_val_loss", "test_loss", "mae_temp", "mae_humidity",
+                                          "mae_session", "train_seconds")},
+        "epochs_trained": metrics["epochs_trained"],
+        "model_path": engine.model_path,
+    }
+
+
+def run_sweep(csv_path: str, sweep_dir: str, grid: Dict[str, List] = None, workers: int = None,
+              epochs: int = 200, seed: int = 42) -> Dict:
+    """
+    Train all grid configurations not already in results.csv
+
+    Args:
+        csv_path: Training data (CSV or Parquet)
+        sweep_dir: Directory for results.csv, best.json and one run directory per configuration
+        grid: {param: [values]}; params are hidden_sizes, dropout_rate and any train() keyword
+        workers: Parallel training processes (defaults to the CPU count)
+        epochs: Maximum epochs per run; early stopping still applies
+        seed: torch seed used by every run
+
+    Returns:
+        The best result row by validation loss
+    """
+    sweep_dir = Path(sweep_dir)
+    sweep_dir.mkdir(parents=True, exist_ok=True)
+    results_path = sweep_dir / "results.csv"
+
+    grid = grid or DEFAULT_GRID
+    with open(sweep_dir / "grid.json", "w") as f:
+        json.dump(grid, f, indent=2)
+
+    cpu_count = os.cpu_count() or 1
+    workers = workers or cpu_count
+    # Split the cores between workers so runs don't oversubscribe each other
+    threads = max(1, cpu_count // workers)
+
+    done = {row["config_id"] for row in load_results(results_path)}
+    pending = [c for c in expand_grid(grid) if config_id(c) not in done]
+    print(f"{len(done)} runs already done, {len(pending)} pending, "
+          f"{workers} workers x {threads} threads")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(_train_config, str(csv_path), config, str(sweep_dir / config_id(config)),
+                            threads, epochs, seed): config
+            for config in pending
+        }
+        for future in as_completed(futures):
+            config = futures[future]
+            try:
+                row = future.result()
+            except Exception as e:
+                print(f"[Error] Run {config_id(config)} {config} failed: {e}")
+                continue
+            _append_result(results_path, row)
+            print(f"[Info] {row['config_id']} val_loss={row['best_val_loss']:.4f} {row['config']}")
+
+    results = load_results(results_path)
+    if not results:
+        raise RuntimeError("No successful runs in sweep")
+    best = min(results, key=lambda row: float(row["best_val_loss"]))
+    with open(sweep_dir / "best.json", "w") as f:
+        json.dump(best, f, indent=2)
+    return best
+
+
+def main():
+    script_dir = Path(__file__).parent
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default=str(script_dir / "optimal_sauna_settings_with_height.csv"))
+    parser.add_argument("--sweep-dir", required=True)
+    parser.add_argument("--grid", default=None, help="JSON file with a {param: [values]} grid")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--epochs", type=int, default=200)
+    args = parser.parse_args()
+
+    grid = None
+    if args.grid:
+        with open(args.grid) as f:
+            grid = json.load(f)
+
+    best = run_sweep(args.csv, args.sweep_dir, grid=grid, workers=args.workers, epochs=args.epochs)
+    print(f"\nBest run {best['config_id']}: val_loss={float(best['best_val_loss']):.4f}")
+    print(f"  config: {best['config']}")
+    print(f"  model:  {best['model_path']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,71 +1,89 @@
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import pandas as pd
-import csv
 
 #TODO: Link the variables to their indicators in human body and add columns for difference in before/after measurements
 
-def generate_sauna_environmental_data_csv(N,
-                                          age_range=(19, 26),
-                                          body_mass_range=(58, 110),
-                                          bmi_range=(17, 34),
-                                          temp_range=(65, 95),  # °C
-                                          humidity_range=(5, 20),  # %
-                                          session_range=(10, 30),  # minutes
-                                          filename="synthetic_sauna_env_data.csv"):
-    np.random.seed(42)
-
+DEFAULT_RANGES = dict(
+    age_range=(19, 26),
+    body_mass_range=(58, 110),
+    bmi_range=(17, 34),
+    temp_range=(65, 95),  # °C
+    humidity_range=(5, 20),  # %
+    session_range=(10, 30),  # minutes
+)
+
+
+def _simulate(N, rng,
+              age_range=(19, 26),
+              body_mass_range=(58, 110),
+              bmi_range=(17, 34),
+              temp_range=(65, 95),  # °C
+              humidity_range=(5, 20),  # %
+              session_range=(10, 30)):  # minutes
+    """
+    Draw N synthetic sessions from rng and return the columns as a dict of arrays.
+    rng can be a legacy np.random.RandomState or a np.random.Generator.
+    """
     # Baseline variables
-    age = np.random.randint(age_range[0], age_range[1] + 1, N)
-    body_mass = np.random.uniform(body_mass_range[0], body_mass_range[1], N)
-    BMI = np.random.uniform(bmi_range[0], bmi_range[1], N)
+    if isinstance(rng, np.random.Generator):
+        age = rng.integers(age_range[0], age_range[1] + 1, N)
+    else:
+        age = rng.randint(age_range[0], age_range[1] + 1, N)
+    body_mass = rng.uniform(body_mass_range[0], body_mass_range[1], N)
+    BMI = rng.uniform(bmi_range[0], bmi_range[1], N)
 
     # Environmental variables
-    SaunaTemp = np.random.uniform(temp_range[0], temp_range[1], N)
-    Humidity = np.random.uniform(humidity_range[0], humidity_range[1], N)
-    SessionLength = np.random.uniform(session_range[0], session_range[1], N)
+    SaunaTemp = rng.uniform(temp_range[0], temp_range[1], N)
+    Humidity = rng.uniform(humidity_range[0], humidity_range[1], N)
+    SessionLength = rng.uniform(session_range[0], session_range[1], N)
 
     # Physiological responses
 
     # Heart rate
     HRavg = 70 + (body_mass - 70) * 0.3 + (age - 22) * 0.5 + (SaunaTemp - 80) * 0.8 + (
-                SessionLength - 10) * 0.5 + np.random.normal(0, 5, N)
-    HRpeak = HRavg + 20 + 0.2 * (SaunaTemp - 80) + np.random.normal(0, 5, N)
+                SessionLength - 10) * 0.5 + rng.normal(0, 5, N)
+    HRpeak = HRavg + 20 + 0.2 * (SaunaTemp - 80) + rng.normal(0, 5, N)
 
     # Breathing
-    RRavg = 16 + (HRavg - 70) * 0.05 + np.random.normal(0, 1, N)
-    RRpeak = RRavg + 10 + np.random.normal(0, 2, N)
+    RRavg = 16 + (HRavg - 70) * 0.05 + rng.normal(0, 1, N)
+    RRpeak = RRavg + 10 + rng.normal(0, 2, N)
 
     # Energy expenditure
     Energy_expenditure = 400 + (body_mass - 70) * 5 + 0.05 * HRavg * body_mass + 5 * (
-                SessionLength - 10) + np.random.normal(0, 20, N)
+                SessionLength - 10) + rng.normal(0, 20, N)
 
     # Recovery
-    Recovery_time = 3 + 0.1 * (HRpeak - 70) + 0.05 * (SessionLength - 10) + np.random.normal(0, 1, N)
+    Recovery_time = 3 + 0.1 * (HRpeak - 70) + 0.05 * (SessionLength - 10) + rng.normal(0, 1, N)
 
     # Temperature change
-    Temp_before = 36.5 + np.random.normal(0, 0.2, N)
-    Temp_after = Temp_before + 0.05 * (SaunaTemp - 36.5) * SessionLength / 10 + np.random.normal(0, 0.2, N)
+    Temp_before = 36.5 + rng.normal(0, 0.2, N)
+    Temp_after = Temp_before + 0.05 * (SaunaTemp - 36.5) * SessionLength / 10 + rng.normal(0, 0.2, N)
 
     # Blood/metabolism
-    HR_before = 70 + (age - 22) * 0.3 + np.random.normal(0, 5, N)
-    HR_after = HR_before + (HRavg - 70) * 0.5 + np.random.normal(0, 5, N)
+    HR_before = 70 + (age - 22) * 0.3 + rng.normal(0, 5, N)
+    HR_after = HR_before + (HRavg - 70) * 0.5 + rng.normal(0, 5, N)
 
-    SBP_before = 120 + (BMI - 25) * 0.8 + np.random.normal(0, 5, N)
-    SBP_after = SBP_before - 5 + np.random.normal(0, 5, N)
+    SBP_before = 120 + (BMI - 25) * 0.8 + rng.normal(0, 5, N)
+    SBP_after = SBP_before - 5 + rng.normal(0, 5, N)
 
-    DBP_before = 75 + (BMI - 25) * 0.5 + np.random.normal(0, 5, N)
-    DBP_after = DBP_before - 3 + np.random.normal(0, 3, N)
+    DBP_before = 75 + (BMI - 25) * 0.5 + rng.normal(0, 5, N)
+    DBP_after = DBP_before - 3 + rng.normal(0, 3, N)
 
-    Glucose = 4.5 + (BMI - 25) * 0.05 + np.random.normal(0, 0.3, N)
-    HDL = 60 - (BMI - 25) * 0.5 + np.random.normal(0, 5, N)
-    TG = 120 + (BMI - 25) * 2 + np.random.normal(0, 20, N)
-    Lactic_acid = 1.5 + 0.01 * (HRavg - 70) + 0.02 * (SessionLength - 10) + np.random.normal(0, 0.1, N)
+    Glucose = 4.5 + (BMI - 25) * 0.05 + rng.normal(0, 0.3, N)
+    HDL = 60 - (BMI - 25) * 0.5 + rng.normal(0, 5, N)
+    TG = 120 + (BMI - 25) * 2 + rng.normal(0, 20, N)
+    Lactic_acid = 1.5 + 0.01 * (HRavg - 70) + 0.02 * (SessionLength - 10) + rng.normal(0, 0.1, N)
 
-    VO2avg = 14 - (age - 22) * 0.1 + (body_mass - 70) * -0.05 + np.random.normal(0, 2, N)
-    VO2max = 30 - (age - 22) * 0.2 + (body_mass - 70) * -0.1 + np.random.normal(0, 3, N)
+    VO2avg = 14 - (age - 22) * 0.1 + (body_mass - 70) * -0.05 + rng.normal(0, 2, N)
+    VO2max = 30 - (age - 22) * 0.2 + (body_mass - 70) * -0.1 + rng.normal(0, 3, N)
 
-    # Combine into DataFrame
-    df = pd.DataFrame({
+    return {
         "age": age,
         "body_mass": body_mass,
         "BMI": BMI,
@@ -92,14 +110,130 @@ def generate_sauna_environmental_data_csv(N,
         "Lactic_acid": Lactic_acid,
         "VO2avg": VO2avg,
         "VO2max": VO2max
-    })
+    }
 
-    # Save to CSV
-    df.to_csv(filename, index=False)
-    print(f"Synthetic sauna dataset saved as '{filename}' with {N} samples.")
+
+def generate_sauna_environmental_data_csv(N,
+                                          age_range=(19, 26),
+                                          body_mass_range=(58, 110),
+                                          bmi_range=(17, 34),
+                                          temp_range=(65, 95),  # °C
+                                          humidity_range=(5, 20),  # %
+                                          session_range=(10, 30),  # minutes
+                                          filename="synthetic_sauna_env_data.csv"):
+    # Same draws as the original global np.random.seed(42) stream
+    rng = np.random.RandomState(42)
+
+    # Combine into DataFrame
+    df = pd.DataFrame(_simulate(N, rng,
+                                age_range=age_range,
+                                body_mass_range=body_mass_range,
+                                bmi_range=bmi_range,
+                                temp_range=temp_range,
+                                humidity_range=humidity_range,
+                                session_range=session_range))
+
+    # Save to CSV (pass filename=None to only return the DataFrame)
+    if filename:
+        df.to_csv(filename, index=False)
+        print(f"Synthetic sauna dataset saved as '{filename}' with {N} samples.")
 
     return df
 
+
+def _write_parquet_chunk(args):
+    """Generate one chunk from its own SeedSequence child and write it as a float32 Parquet part"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    index, n_rows, seed_seq, output_dir, ranges = args
+    rng = np.random.Generator(np.random.PCG64(seed_seq))
+    columns = _simulate(n_rows, rng, **ranges)
+    table = pa.table({name: values.astype(np.float32) for name, values in columns.items()})
+
+    path = os.path.join(output_dir, f"part-{index:05d}.parquet")
+    tmp_path = path + ".tmp"
+    pq.write_table(table, tmp_path, compression="zstd")
+    os.replace(tmp_path, path)
+    return index, n_rows
+
+
+def generate_sauna_environmental_data_parquet(N,
+                                              output_dir="synthetic_sauna_env_data",
+                                              chunk_size=1_000_000,
+                                              seed=42,
+                                              workers=None,
+                                              **ranges):
+    """
+    Generate N synthetic sessions as a directory of float32 Parquet parts
+
+    Each chunk gets an independent stream spawned from np.random.SeedSequence(seed),
+    so chunk i is identical no matter how many worker processes generate it.
+    Keep chunk_size fixed to reproduce a dataset. Workers write their own parts,
+    so memory stays at roughly one chunk per worker regardless of N. Parts left in
+    output_dir by an earlier run are deleted first, since readers take the whole directory.
+
+    Args:
+        N: Total number of rows
+        output_dir: Directory that receives part-00000.parquet, part-00001.parquet, ...
+        chunk_size: Rows per part
+        seed: Root seed for the SeedSequence
+        workers: Number of processes (defaults to the CPU count)
+        **ranges: Overrides for DEFAULT_RANGES (age_range, temp_range, ...)
+
+    Returns:
+        Path to the output directory
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    stale = glob.glob(os.path.join(output_dir, "part-*.parquet*"))
+    if stale:
+        print(f"[Info] Removing {len(stale)} parts of a previous dataset from '{output_dir}'")
+        for path in stale:
+            os.remove(path)
+    ranges = {**DEFAULT_RANGES, **ranges}
+
+    n_chunks = (N + chunk_size - 1) // chunk_size
+    seed_seqs = np.random.SeedSequence(seed).spawn(n_chunks)
+    tasks = [
+        (i, min(chunk_size, N - i * chunk_size), seed_seqs[i], output_dir, ranges)
+        for i in range(n_chunks)
+    ]
+
+    start = time.perf_counter()
+    written = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for _, n_rows in executor.map(_write_parquet_chunk, tasks):
+            written += n_rows
+            elapsed = time.perf_counter() - start
+            print(f"[Info] {written:,}/{N:,} rows written ({written / elapsed:,.0f} rows/s)")
+
+    print(f"Synthetic sauna dataset saved to '{output_dir}' with {N} samples in {n_chunks} parts.")
+    return output_dir
+
+
+def iter_parquet_chunks(path, columns=None, batch_size=1_000_000):
+    """
+    Stream a Parquet file or part directory as DataFrames of at most batch_size rows,
+    reading only the requested columns.
+    """
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(str(path), format="parquet")
+    for batch in dataset.to_batches(columns=columns, batch_size=batch_size):
+        yield batch.to_pandas()
+
+
 if __name__ == "__main__":
-    df = generate_sauna_environmental_data_csv(N=1000)
+    parser = argparse.ArgumentParser(description="Generate the synthetic forward sauna dataset")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--parquet", default=None, help="Write chunked Parquet parts to this directory instead of CSV")
+    parser.add_argument("--chunk-size", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.parquet:
+        generate_sauna_environmental_data_parquet(N=args.rows, output_dir=args.parquet,
+                                                  chunk_size=args.chunk_size, workers=args.workers)
+    else:
+        df = generate_sauna_environmental_data_csv(N=args.rows)
 
@@ -27,12 +27,12 @@ def main():
     
     # Initialize the engine
     model_path = script_dir / "sauna_recommendation_model.pth"
-    scaler_path = script_dir / "sauna_scaler.pkl"
+    scaler_path = script_dir / "sauna_scaler.bin"
     
-    engine = SaunaRecommendationEngine(
-        model_path=str(model_path) if model_path.exists() else None,
-        scaler_path=str(scaler_path) if scaler_path.exists() else None
-    )
+    # Training starts from scratch, so there is no need to load the current model
+    engine = SaunaRecommendationEngine()
+    engine.model_path = str(model_path)
+    engine.scaler_path = str(scaler_path)
     
     # Train the model
     print("=" * 60)
@@ -53,7 +53,7 @@ def main():
     print("Training completed!")
     print("=" * 60)
     print(f"\nModel saved to: {model_path}")
-    print(f"Scaler saved to: {scaler_path}")
+    print(f"Preprocessing artifact saved to: {scaler_path}")
     print(f"\nFinal Test Results:")
     print(f"  - Test Loss: {results['test_loss']:.4f}")
     print(f"  - MAE Temperature: {results['mae_temp']:.2f}°C")
@@ -77,6 +77,8 @@ def main():
     print(f"  - Temperature: {sample_prediction['temperature']}°C")
     print(f"  - Humidity: {sample_prediction['humidity']}%")
     print(f"  - Session Length: {sample_prediction['session_length']} minutes")
+    for goal, goal_prediction in sample_prediction['per_goal'].items():
+        print(f"  - {goal}: {goal_prediction}")
 
 
 if __name__ == "__main__":
@@ -1,4 +1,53 @@
-from backend.api.claude import HarviaAPI
+import threading
 
-client = HarviaAPI(username="harviahackathon2025@gmail.com", password="junction25!")
-device = client.devices.get_device_by_serial("2513005304")
\ No newline at end of file
+from backend.api.claude import AuthenticationError, HarviaAPI
+from backend.src.core.config import (
+    HARVIA_USERNAME,
+    HARVIA_PASSWORD,
+    HARVIA_DEVICE_SERIAL,
+    HARVIA_ENDPOINTS_CACHE,
+    HARVIA_ENDPOINTS_TTL_SECONDS,
+)
+from backend.src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Created on first use: building the client signs in and looks up the device over the network
+_client = None
+_device = None
+_lock = threading.Lock()
+
+
+def get_client() -> HarviaAPI:
+    """Returns the signed-in Harvia API client, creating it on first use."""
+    global _client
+    if _client is None:
+        if not (HARVIA_USERNAME and HARVIA_PASSWORD):
+            raise AuthenticationError("Harvia credentials missing: set HARVIA_USERNAME and HARVIA_PASSWORD "
+                                      "in the environment.")
+        with _lock:
+            if _client is None:
+                _client = HarviaAPI(username=HARVIA_USERNAME, password=HARVIA_PASSWORD,
+                                    config_cache_path=str(HARVIA_ENDPOINTS_CACHE),
+                                    config_ttl=HARVIA_ENDPOINTS_TTL_SECONDS)
+    return _client
+
+
+def get_device():
+    """Returns the sauna device handle, looking it up on first use."""
+    global _device
+    if _device is None:
+        client = get_client()
+        with _lock:
+            if _device is None:
+                _device = client.devices.get_device_by_serial(HARVIA_DEVICE_SERIAL)
+    return _device
+
+
+def warm_client():
+    """Create the client and device handle ahead of the first request. Failures are retried on first use."""
+    try:
+        get_device()
+        logger.info("Harvia client ready.")
+    except Exception as e:
+        logger.warning("Harvia client warm-up failed: %s", e)
@@ -8,7 +8,54 @@ load_dotenv()
 # Project Paths
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 MODEL_PATH = PROJECT_ROOT /  "predictive_model" / "sauna_recommendation_model.pth"
-SCALER_PATH = PROJECT_ROOT /  "predictive_model" / "sauna_scaler.pkl"
+SCALER_PATH = PROJECT_ROOT /  "predictive_model" / "sauna_scaler.bin"
+# Also accept legacy sauna_scaler.pkl / _encoders.pkl pickles when no .bin artifact exists.
+# Off by default: unpickling runs code from the file and imports scikit-learn at startup.
+ALLOW_PICKLE_ARTIFACTS = os.getenv("ALLOW_PICKLE_ARTIFACTS", "0") == "1"
+
+# Versioned model registry (see predictive_model/model_registry.py)
+MODEL_REGISTRY_DIR = Path(os.getenv("MODEL_REGISTRY_DIR", PROJECT_ROOT / "predictive_model" / "registry"))
+# Seconds between manifest checks for hot swap; 0 disables the watcher
+MODEL_REGISTRY_POLL_SECONDS = float(os.getenv("MODEL_REGISTRY_POLL_SECONDS", "0"))
+
+# Recommendation engine: "neural_network" or "knn" (nearest neighbours over the optimal-settings table)
+RECOMMENDATION_BACKEND = os.getenv("RECOMMENDATION_BACKEND", "neural_network")
+TRAINING_CSV_PATH = PROJECT_ROOT / "predictive_model" / "optimal_sauna_settings_with_height.csv"
+KNN_INDEX_DIR = Path(os.getenv("KNN_INDEX_DIR", PROJECT_ROOT / "predictive_model" / "knn_index"))
+KNN_NEIGHBOURS = int(os.getenv("KNN_NEIGHBOURS", "8"))
+
+# Recommendation serving backend: "eager", "scripted" (TorchScript) or "int8" (dynamic-quantized TorchScript)
+RECOMMENDATION_SERVING = os.getenv("RECOMMENDATION_SERVING", "eager")
+# Pinned torch intra-op threads for serving; 0 keeps torch's default
+RECOMMENDATION_NUM_THREADS = int(os.getenv("RECOMMENDATION_NUM_THREADS", "0"))
+
+# Startup loading of the recommendation model and LLM components:
+#   "blocking"   - load both concurrently in worker threads before accepting traffic
+#   "background" - accept traffic at once and load concurrently; /ready reports 503 until done
+#   "lazy"       - load each component on its first use
+STARTUP_MODE = os.getenv("STARTUP_MODE", "blocking")
+
+# Harvia Cloud API client (see core/client.py). Credentials come from the environment only;
+# device control fails with a clear error when they are missing.
+HARVIA_USERNAME = os.getenv("HARVIA_USERNAME")
+HARVIA_PASSWORD = os.getenv("HARVIA_PASSWORD")
+HARVIA_DEVICE_SERIAL = os.getenv("HARVIA_DEVICE_SERIAL", "2513005304")
+# Cached /endpoints configuration, refetched once older than the TTL
+HARVIA_ENDPOINTS_CACHE = Path(os.getenv("HARVIA_ENDPOINTS_CACHE", PROJECT_ROOT / ".cache" / "harvia_endpoints.json"))
+HARVIA_ENDPOINTS_TTL_SECONDS = float(os.getenv("HARVIA_ENDPOINTS_TTL_SECONDS", "86400"))
+
+# /chat/ask limits, per process: concurrent chains in flight, seconds a request may wait
+# for a free slot before a 503, and seconds a chain may run before a 504
+CHAT_MAX_CONCURRENCY = int(os.getenv("CHAT_MAX_CONCURRENCY", "16"))
+CHAT_QUEUE_TIMEOUT_SECONDS = float(os.getenv("CHAT_QUEUE_TIMEOUT_SECONDS", "5"))
+CHAT_TIMEOUT_SECONDS = float(os.getenv("CHAT_TIMEOUT_SECONDS", "60"))
+
+# Memory-map the FAISS index instead of reading it onto the heap (shared between pre-forked workers).
+# Works for Flat/PQ/SQ (with a faiss that has IO_FLAG_MMAP_IFC) and IVF indexes; HNSW stays on the heap.
+FAISS_MMAP = os.getenv("FAISS_MMAP", "0") == "1"
+
+# Token required by the /admin routes; admin routes are disabled when unset
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
 
 # OpenAI API Key
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
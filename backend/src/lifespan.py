@@ -1,18 +1,52 @@
+import asyncio
+import contextlib
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from backend.src.core.client import warm_client
+from backend.src.core.config import STARTUP_MODE
 from backend.src.services.llm import initialize_llm_components
-from backend.src.services.recommendation import load_recommendation_model
+from backend.src.services.recommendation import load_recommendation_model, start_registry_watcher, stop_registry_watcher
 from backend.src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+
+async def load_components():
+    """Load the recommendation model and LLM components concurrently in worker threads."""
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await asyncio.gather(
+        asyncio.to_thread(load_recommendation_model),
+        asyncio.to_thread(initialize_llm_components),
+    )
+    logger.info("Components loaded in %.2fs", loop.time() - start)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Handles application startup and shutdown events.
+    See STARTUP_MODE in core/config.py for when components are loaded.
     """
-    logger.info("--- Application Startup ---")
-    load_recommendation_model()
-    initialize_llm_components()
+    logger.info("--- Application Startup (%s) ---", STARTUP_MODE)
+    loading = warming = None
+    if STARTUP_MODE != "lazy":
+        # Device control isn't needed to serve recommendations or chat, so never wait on it
+        warming = asyncio.create_task(asyncio.to_thread(warm_client))
+    if STARTUP_MODE == "blocking":
+        await load_components()
+    elif STARTUP_MODE == "background":
+        loading = asyncio.create_task(load_components())
+    start_registry_watcher()
     yield
-    logger.info("--- Application Shutdown ---")
\ No newline at end of file
+    stop_registry_watcher()
+    if loading is not None and not loading.done():
+        logger.info("Waiting for component loading to finish before shutdown.")
+        await loading
+    if warming is not None and not warming.done():
+        # The worker thread finishes its login on its own; don't hold up shutdown for it
+        logger.info("Cancelling Harvia client warm-up.")
+        warming.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await warming
+    logger.info("--- Application Shutdown ---")
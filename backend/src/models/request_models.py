@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Optional, List, Dict, Literal
 
 from pydantic import BaseModel, Field
 
@@ -21,6 +21,8 @@ class SaunaRecommendationRequest(BaseModel):
     height: int
     weight: int
     goals: List[str]
+    strategy: Literal["weighted_mean", "min", "max"] = "weighted_mean"
+    goal_weights: Optional[Dict[str, float]] = None
 
 #NOT USED
 class ChatMessageRequest(BaseModel):
@@ -31,4 +33,8 @@ class QuestionRequest(BaseModel):
     session_id: Optional[str] = Field(None, description="Client-managed session ID")
 
 class ClearSessionRequest(BaseModel):
-    session_id: str = Field(..., min_length=1)
\ No newline at end of file
+    session_id: str = Field(..., min_length=1)
+
+
+class ModelReloadRequest(BaseModel):
+    version: Optional[str] = Field(None, description="Registry version; defaults to the manifest's active version")
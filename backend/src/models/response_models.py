@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from typing import List
+from typing import List, Dict
 
 from pydantic import BaseModel, Field
 
@@ -8,6 +8,11 @@ class HealthResponse(BaseModel):
     status: str = "ok"
     time: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+class ReadinessResponse(BaseModel):
+    status: str = "ready"
+    components: Dict[str, str] = {}
+    time: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
 class SuccessResponse(BaseModel):
     success: bool = True
 
@@ -31,11 +36,18 @@ class StopSessionResponse(BaseModel):
     stopped_at: datetime
     duration_seconds: int
 
+class GoalRecommendation(BaseModel):
+    temperature: float  # in Celsius
+    humidity: float  # in percentage
+    session_length: float  # in minutes
+
 class SaunaRecommendationResponse(BaseModel):
     temperature: float  # in Celsius
     humidity: float  # in percentage
     session_length: float  # in minutes
     goals_used: List[str]
+    strategy: str = "weighted_mean"
+    per_goal: Dict[str, GoalRecommendation] = {}
 
 #NOT USED
 class ChatMessageResponse(BaseModel):
@@ -0,0 +1,52 @@
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from starlette import status
+
+from backend.src.core.config import ADMIN_TOKEN
+from backend.src.models.error_models import auth_fail, generic_fail
+from backend.src.models.request_models import ModelReloadRequest
+from backend.src.services.recommendation import (
+    get_model_status,
+    reload_recommendation_model,
+    rollback_recommendation_model,
+)
+from backend.src.utils.logger import get_logger
+
+router = APIRouter()
+logger = get_logger("sauna-backend.admin")
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin routes are disabled.")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise auth_fail
+
+
+@router.get("/model", dependencies=[Depends(require_admin)])
+def get_model():
+    return get_model_status()
+
+
+@router.post("/model/reload", status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(require_admin)])
+def post_model_reload(request: ModelReloadRequest):
+    """Warm up a registry version on a background thread and swap it in once ready."""
+    try:
+        reload_recommendation_model(version=request.version)
+    except Exception as e:
+        logger.error(f"Model reload rejected: {e}")
+        raise generic_fail(detail=f"Model reload rejected: {str(e)}")
+    return get_model_status()
+
+
+@router.post("/model/rollback", status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(require_admin)])
+def post_model_rollback():
+    try:
+        version = rollback_recommendation_model()
+    except Exception as e:
+        logger.error(f"Model rollback rejected: {e}")
+        raise generic_fail(detail=f"Model rollback rejected: {str(e)}")
+    logger.info(f"Rolling back recommendation model to {version}")
+    return get_model_status()
@@ -1,13 +1,16 @@
 # python
+import asyncio
 import json
+import sys
 import uuid
 from fastapi import APIRouter, Request, HTTPException
 from starlette import status
+from starlette.concurrency import run_in_threadpool
 from starlette.responses import JSONResponse, StreamingResponse
 
-from backend.LLM.qa import chat, clear_session, get_session_history
+from backend.src.core.config import CHAT_MAX_CONCURRENCY, CHAT_QUEUE_TIMEOUT_SECONDS, CHAT_TIMEOUT_SECONDS
 from backend.src.models.request_models import QuestionRequest, ClearSessionRequest
-from backend.src.services.llm import get_llm_components
+from backend.src.services.llm import get_llm_components, ensure_llm_components
 from backend.src.utils.logger import get_logger
 
 router = APIRouter()
@@ -17,6 +20,10 @@ faiss_index = None
 qa_chain = None
 qa_chain_streaming = None
 
+# Bounds the chains in flight in this process, so a burst queues briefly instead of
+# piling unbounded concurrent requests onto the LLM provider
+_chat_slots = asyncio.Semaphore(CHAT_MAX_CONCURRENCY)
+
 def _load_components():
     global faiss_index, qa_chain, qa_chain_streaming
     try:
@@ -38,11 +45,13 @@ def _ensure_components():
     # Lazy reload if something came up None (e.g. due to import order with reloader)
     if faiss_index is None or qa_chain is None or qa_chain_streaming is None:
         logger.warning("Components missing; attempting reload.")
+        ensure_llm_components()
         _load_components()
 
 @router.post("/ask")
 async def ask_endpoint(request: QuestionRequest):
-    _ensure_components()
+    # May load the index and chains in lazy startup mode; keep that off the event loop
+    await run_in_threadpool(_ensure_components)
 
     if faiss_index is None:
         logger.error("FAISS index is not loaded (None).")
@@ -66,7 +75,20 @@ async def ask_endpoint(request: QuestionRequest):
     logger.info(f"Processing question for session_id={session_id}")
 
     try:
-        response = chat(qa_chain, request.question, session_id=session_id)
+        await asyncio.wait_for(_chat_slots.acquire(), timeout=CHAT_QUEUE_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        logger.warning("All %s chat slots busy; rejecting request.", CHAT_MAX_CONCURRENCY)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Chat service is busy. Please retry shortly.",
+            headers={"Retry-After": "1"}
+        )
+
+    try:
+        # Already imported by initialize_llm_components, so this is a dictionary lookup
+        from backend.LLM.qa import achat
+        response = await achat(qa_chain, request.question, session_id=session_id,
+                               timeout=CHAT_TIMEOUT_SECONDS)
         if response is None:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -77,9 +99,28 @@ async def ask_endpoint(request: QuestionRequest):
         return JSONResponse(content=response, headers={"X-Session-Id": session_id})
     except HTTPException:
         raise
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Timed out generating an answer"
+        )
     except Exception as e:
         logger.error(f"Error processing question: {e}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error processing question"
         )
+    finally:
+        _chat_slots.release()
+
+
+@router.get("/metrics")
+def metrics_endpoint():
+    """Chat pipeline counters and latencies for this process."""
+    from backend.LLM.metrics import chat_metrics
+    metrics = chat_metrics.snapshot()
+    # Only loaded once the LLM components are; don't pull LangChain in just for metrics
+    qa = sys.modules.get("backend.LLM.qa")
+    if qa is not None and qa.answer_cache is not None:
+        metrics["answer_cache"] = qa.answer_cache.stats()
+    return metrics
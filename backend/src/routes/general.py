@@ -1,5 +1,10 @@
-from backend.src.models.response_models import HealthResponse
+from backend.src.core.config import STARTUP_MODE
+from backend.src.models.response_models import HealthResponse, ReadinessResponse
+from backend.src.services.llm import get_llm_status
+from backend.src.services.recommendation import get_recommendation_status
 from fastapi import APIRouter
+from starlette import status
+from starlette.responses import JSONResponse
 
 router = APIRouter()
 
@@ -10,4 +15,22 @@ def root() -> HealthResponse:
 
 @router.get("/health", response_model=HealthResponse)
 def health() -> HealthResponse:
-    return HealthResponse()
\ No newline at end of file
+    return HealthResponse()
+
+
+@router.get("/ready", response_model=ReadinessResponse)
+def ready():
+    """
+    503 while a component is still loading. Components that are unavailable (missing
+    model files or API key) or not yet loaded in lazy mode don't block readiness.
+    """
+    components = {
+        "recommendation": get_recommendation_status(),
+        "llm": get_llm_status(),
+    }
+    pending = {"loading"} if STARTUP_MODE == "lazy" else {"loading", "not_loaded"}
+    if pending & set(components.values()):
+        response = ReadinessResponse(status="loading", components=components)
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            content=response.model_dump(mode="json"))
+    return ReadinessResponse(components=components)
@@ -1,11 +1,12 @@
 import time
 
 import numpy as np
-from fastapi import APIRouter, Request
-import matplotlib.pyplot as plt
+from fastapi import APIRouter, Request, HTTPException
+from starlette import status
 
+from backend.api.claude import HarviaAPIError
 from backend.bridge.bridge import send_to_ts
-from backend.src.core.client import client, device
+from backend.src.core.client import get_client, get_device
 from backend.src.models.error_models import generic_fail
 from backend.src.models.request_models import StartSessionRequest, StopSessionRequest, SaunaRecommendationRequest
 from backend.src.models.response_models import StartSessionResponse, StopSessionResponse, SaunaRecommendationResponse
@@ -21,63 +22,72 @@ def set_device_online(status: bool):
 logger = get_logger("sauna-backend.sauna")
 router = APIRouter()
 
+def _device_control():
+    """Harvia client and sauna device handle; 503 when device control isn't available"""
+    try:
+        return get_client(), get_device()
+    except HarviaAPIError as e:
+        logger.error("Sauna device control unavailable: %s", e)
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail=f"Sauna device control unavailable: {e}")
+
 # Keep your existing response model
 # from your code: SaunaRecommendationResponse
 
 @router.post("/recommendations", response_model=SaunaRecommendationResponse)
 def post_sauna_recommendations(request: SaunaRecommendationRequest):
-    age = request.age
-    gender = request.gender
-    height = request.height
-    weight = request.weight
-    goals = request.goals
-    print(goals)
     """
     Get optimal sauna settings recommendations for a user.
     If user_id is provided, fetches profile data from Firestore.
     Otherwise, uses provided parameters.
     """
     sauna_engine = get_sauna_engine()
-    if sauna_engine is None:
+    if sauna_engine is None or not sauna_engine.is_ready():
         raise generic_fail("Sauna recommendation engine is not initialized.")
 
-
-
     # Ensure height is in meters (convert from cm if needed)
+    height = request.height
     if height > 3:  # Likely in cm, convert to meters
         height = height / 100
         logger.info(f"Converted height from cm to meters: {height}m")
 
-
     try:
         # Get recommendations from neural network
         recommendation = sauna_engine.predict(
-            age=float(age),
-            gender=gender,
+            age=float(request.age),
+            gender=request.gender,
             height=float(height),
-            weight=float(weight),
-            selected_goals=goals
-        )
-
-
-
-        return SaunaRecommendationResponse(
-            temperature=recommendation['temperature'],
-            humidity=recommendation['humidity'],
-            session_length=recommendation['session_length'],
-            goals_used=goals
+            weight=float(request.weight),
+            selected_goals=request.goals,
+            strategy=request.strategy,
+            goal_weights=request.goal_weights
         )
+    except ValueError as e:
+        # Invalid goal weights or strategy: the request is at fault
+        logger.info(f"Rejected recommendation request: {e}")
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         logger.error(f"Error generating recommendations: {e}")
         raise generic_fail(
             detail=f"Error generating recommendations: {str(e)}"
         )
 
+    return SaunaRecommendationResponse(
+        temperature=recommendation['temperature'],
+        humidity=recommendation['humidity'],
+        session_length=recommendation['session_length'],
+        goals_used=recommendation['goals_used'],
+        strategy=request.strategy,
+        per_goal=recommendation['per_goal']
+    )
+
 
 @router.post("/start_session")
 def post_start_session(request: StartSessionRequest):
+    import matplotlib.pyplot as plt
     from backend.brief.qa_brief  import provide_brief, brief_setup
 
+    client, device = _device_control()
     client.devices.send_command(device_id=device.device_id, state="on")
     set_device_online(True)
     client.devices.change_profile(device_id=device.device_id, profile="3")
@@ -225,6 +235,7 @@ def to_json_safe(obj):
 
 @router.post("/end_session")
 def post_stop_session():
+    client, device = _device_control()
     client.devices.send_command(device_id=device.device_id, state="off")
     set_device_online(False)
     return {"message": "Sauna session stopped successfully."}
@@ -1,11 +1,12 @@
 import json
 import uuid
+from contextlib import aclosing
 
-from fastapi import APIRouter, Request, HTTPException
+from fastapi import APIRouter
+from starlette.concurrency import run_in_threadpool
 from starlette.websockets import WebSocket, WebSocketDisconnect
 
-from backend.LLM.qa import chat_stream
-from backend.src.services.llm import faiss_index, qa_chain_streaming
+from backend.src.services.llm import get_llm_components, ensure_llm_components
 from backend.src.utils.logger import get_logger
 
 router = APIRouter()
@@ -29,6 +30,11 @@ async def websocket_echo(ws: WebSocket):
 async def websocket_chat(ws: WebSocket):
     await ws.accept()
 
+    # May load the index and chains in lazy startup mode; keep that off the event loop
+    await run_in_threadpool(ensure_llm_components)
+    components = get_llm_components()
+    faiss_index = components.get("faiss_index")
+    qa_chain_streaming = components.get("qa_chain_streaming")
     if not faiss_index or not qa_chain_streaming:
         await ws.send_json({
             "type": "error",
@@ -37,6 +43,9 @@ async def websocket_chat(ws: WebSocket):
         await ws.close()
         return
 
+    # Already imported by initialize_llm_components, so this is a dictionary lookup
+    from backend.LLM.qa import chat_stream
+
     logger.info("Chat WebSocket client connected")
 
     try:
@@ -62,21 +71,15 @@ async def websocket_chat(ws: WebSocket):
                 })
                 continue
 
-            await ws.send_json({
-                "type": "session_init",
-                "session_id": session_id
-            })
-
-            async for chunk in chat_stream(
-                qa_chain_streaming,
-                question,
-                session_id=session_id
-            ):
-                try:
-                    await ws.send_json(chunk)
-                except Exception as send_err:
-                    logger.error(f"Error sending chunk over WebSocket: {send_err}", exc_info=True)
-                    break
+            # aclosing: if the client goes away mid-answer, stop the chain run (and release
+            # its LLM call) now rather than whenever the generator is garbage collected
+            async with aclosing(chat_stream(qa_chain_streaming, question, session_id=session_id)) as stream:
+                async for chunk in stream:
+                    try:
+                        await ws.send_json(chunk)
+                    except Exception as send_err:
+                        logger.error(f"Error sending chunk over WebSocket: {send_err}", exc_info=True)
+                        break
 
     except WebSocketDisconnect:
         logger.info("Chat WebSocket client disconnected")
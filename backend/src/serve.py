@@ -0,0 +1,145 @@
+"""
+Pre-fork server for multi-worker deployments
+
+`uvicorn --workers N` starts N fresh interpreters, and each one loads its own copy
+of the recommendation model, the embedding model and the FAISS index. This entry
+point loads them once in the parent, then forks the workers. The workers share
+those read-only pages copy-on-write and serve from one listening socket, so memory
+stays roughly flat as workers are added.
+
+Each worker's lifespan still runs, but the loaders are already done and return
+immediately. A worker that exits unexpectedly is re-forked from the preloaded parent.
+
+Usage:
+    python -m backend.src.serve --workers 4 [--host 0.0.0.0] [--port 8000]
+"""
+
+import argparse
+import gc
+import os
+import signal
+import socket
+import time
+
+import uvicorn
+
+from backend.src.core.config import RECOMMENDATION_NUM_THREADS
+from backend.src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def preload(num_threads: int):
+    """Load the shared serving state in the parent, before any worker is forked."""
+    # Thread pools don't survive fork: keep tokenizers single-threaded and pin torch
+    # before anything runs, so the parent never starts a pool the children would inherit
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+    try:
+        import torch
+        torch.set_num_threads(num_threads)
+    except ImportError:
+        pass
+
+    from backend.src.services.llm import initialize_llm_components
+    from backend.src.services.recommendation import load_recommendation_model
+
+    start = time.perf_counter()
+    load_recommendation_model()
+    initialize_llm_components()
+    # Move everything loaded so far out of the collector's generations, so collections
+    # in the workers don't write to (and thereby copy) the shared object headers
+    gc.collect()
+    gc.freeze()
+    logger.info("Preloaded serving state in %.2fs", time.perf_counter() - start)
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _serve(sock: socket.socket):
+    """Worker body: run uvicorn on the inherited socket."""
+    from backend.src.main import app
+
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    server = uvicorn.Server(uvicorn.Config(app, lifespan="on"))
+    server.run(sockets=[sock])
+
+
+def _fork_worker(sock: socket.socket) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            _serve(sock)
+        except Exception as e:
+            logger.error("Worker %s crashed: %s", os.getpid(), e)
+            code = 1
+        finally:
+            # os._exit skips atexit: flush this worker's chat history writes first
+            from backend.LLM.history_backends import close_history_backends
+            close_history_backends()
+            os._exit(code)
+    logger.info("Started worker %s", pid)
+    return pid
+
+
+def run(host: str, port: int, workers: int, num_threads: int):
+    from backend.src.main import app  # noqa: F401  (imported before fork so workers share it)
+
+    preload(num_threads)
+    sock = bind_socket(host, port)
+    logger.info("Listening on http://%s:%s with %s pre-forked workers (parent %s)", host, port, workers, os.getpid())
+
+    children = set()
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for _ in range(workers):
+        children.add(_fork_worker(sock))
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        children.discard(pid)
+        if not stopping:
+            logger.warning("Worker %s exited with status %s; restarting.", pid, status)
+            time.sleep(1)
+            children.add(_fork_worker(sock))
+
+    sock.close()
+    logger.info("All workers stopped.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "2")))
+    parser.add_argument("--threads", type=int, default=RECOMMENDATION_NUM_THREADS or 1,
+                        help="torch intra-op threads per worker")
+    args = parser.parse_args()
+    run(args.host, args.port, args.workers, args.threads)
+
+
+if __name__ == "__main__":
+    main()
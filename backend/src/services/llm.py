@@ -1,4 +1,7 @@
-from backend.src.core.config import OPENAI_API_KEY, LLM_MODEL_NAME
+import importlib.util
+import threading
+
+from backend.src.core.config import OPENAI_API_KEY, LLM_MODEL_NAME, STARTUP_MODE, FAISS_MMAP
 from backend.src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -6,14 +9,17 @@ faiss_index = None
 qa_chain = None
 qa_chain_streaming = None
 
-try:
-    from backend.LLM.faiss_indexing import load_faiss_index
-    from backend.LLM.qa import create_qa_chain
+_init_lock = threading.Lock()
+# Startup load status reported by /ready: not_loaded, loading, ready or unavailable
+_init_state = {"status": "not_loaded"}
 
-    LLM_AVAILABLE = True
-except ImportError as e:
-    logger.warning("LLM components not available: %s", e)
-    LLM_AVAILABLE = False
+# Everything backend.LLM imports on the chat path; imported when the components are initialized
+LLM_DEPENDENCIES = ("numpy", "dotenv", "faiss", "tiktoken", "langchain_core", "langchain_community",
+                    "langchain_classic", "langchain_openai", "langchain_huggingface", "sentence_transformers")
+_missing_dependencies = [name for name in LLM_DEPENDENCIES if importlib.util.find_spec(name) is None]
+LLM_AVAILABLE = not _missing_dependencies
+if not LLM_AVAILABLE:
+    logger.warning(f"LLM components not available, missing: {', '.join(_missing_dependencies)}")
 
 def get_llm_components():
     return {
@@ -23,7 +29,20 @@ def get_llm_components():
     }
 
 def initialize_llm_components():
-    """Initializes the FAISS index and QA chains."""
+    """Initializes the FAISS index and QA chains. Safe to call from several threads; loads once."""
+    with _init_lock:
+        if _init_state["status"] != "not_loaded":
+            return
+        _init_state["status"] = "loading"
+        try:
+            _initialize_llm_components()
+        except Exception as e:
+            logger.error("Failed to initialize LLM components: %s", e)
+        finally:
+            _init_state["status"] = "ready" if qa_chain and qa_chain_streaming else "unavailable"
+
+
+def _initialize_llm_components():
     global faiss_index, qa_chain, qa_chain_streaming
 
     if not LLM_AVAILABLE:
@@ -34,12 +53,24 @@ def initialize_llm_components():
         logger.error("OPENAI_API_KEY not found. Chat functionality will be disabled.")
         return
 
+    from backend.LLM.faiss_indexing import load_faiss_index
+    from backend.LLM.qa import create_qa_chain
+
     logger.info("Loading FAISS index...")
-    faiss_index = load_faiss_index()
+    faiss_index = load_faiss_index(mmap=FAISS_MMAP)
     if faiss_index is None:
         logger.error("Failed to load FAISS index. Chat functionality disabled.")
         return
 
+    from backend.LLM.config import ANSWER_CACHE_ENABLED
+    if ANSWER_CACHE_ENABLED:
+        from backend.LLM.answer_cache import SemanticAnswerCache, index_fingerprint
+        from backend.LLM.faiss_indexing import DATA_DIR
+        from backend.LLM.qa import set_answer_cache
+        # Same MiniLM model as the document index; cleared when the index on disk changes
+        set_answer_cache(SemanticAnswerCache(faiss_index.embeddings.embed_query,
+                                             fingerprint=lambda: index_fingerprint(DATA_DIR)))
+
     logger.info("Creating QA chains...")
     qa_chain = create_qa_chain(faiss_index, model_name=LLM_MODEL_NAME)
     qa_chain_streaming = create_qa_chain(faiss_index, model_name=LLM_MODEL_NAME, streaming=True)
@@ -50,6 +81,17 @@ def initialize_llm_components():
         logger.error("Failed to create one or more QA chains.")
 
 
+def ensure_llm_components():
+    """Loads the LLM components on first use in lazy startup mode; a no-op otherwise."""
+    if STARTUP_MODE == "lazy" and _init_state["status"] == "not_loaded":
+        initialize_llm_components()
+
+
+def get_llm_status() -> str:
+    """Startup load status of the FAISS index and QA chains."""
+    return _init_state["status"]
+
+
 def get_qa_chains():
     """Returns the loaded QA chains."""
     return qa_chain, qa_chain_streaming
\ No newline at end of file
@@ -1,32 +1,216 @@
-from backend.src.core.config import MODEL_PATH, SCALER_PATH
+import importlib.util
+import threading
+from typing import Optional
+
+from backend.src.core.config import (
+    MODEL_PATH,
+    SCALER_PATH,
+    ALLOW_PICKLE_ARTIFACTS,
+    MODEL_REGISTRY_DIR,
+    MODEL_REGISTRY_POLL_SECONDS,
+    RECOMMENDATION_SERVING,
+    RECOMMENDATION_NUM_THREADS,
+    RECOMMENDATION_BACKEND,
+    TRAINING_CSV_PATH,
+    KNN_INDEX_DIR,
+    KNN_NEIGHBOURS,
+    STARTUP_MODE,
+)
 from backend.src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 sauna_engine = None
+# Registry version currently serving traffic ("legacy" when loaded from MODEL_PATH/SCALER_PATH)
+active_version = None
+
+_reload_lock = threading.Lock()
+_load_lock = threading.Lock()
+# Startup load status reported by /ready: not_loaded, loading, ready or unavailable
+_load_state = {"status": "not_loaded"}
+_reload_state = {"loading": None, "last_error": None}
+_watcher_stop = threading.Event()
+_watcher_thread = None
+
+# torch, pandas and the engine itself are imported by _build_engine on first load
+NEURAL_NETWORK_AVAILABLE = importlib.util.find_spec("torch") is not None
+if NEURAL_NETWORK_AVAILABLE:
+    from backend.predictive_model.model_registry import ModelRegistry, MODEL_FILE, SCALER_FILE, PREPROCESSING_FILE
+else:
+    logger.warning("Neural network not available: torch is not installed")
+
+registry = ModelRegistry(MODEL_REGISTRY_DIR) if NEURAL_NETWORK_AVAILABLE else None
+
+
+def _warm_up(engine):
+    """Run one prediction per goal so the first real request doesn't pay for lazy init."""
+    engine.predict(age=25, gender="Male", height=1.75, weight=75,
+                   selected_goals=list(engine.goal_mapping.keys()))
+
+
+def _build_knn_engine():
+    """Load the k-NN engine, (re)building its index when it is missing or the training table changed."""
+    import pandas as pd
+    from backend.predictive_model.nearest_neighbour import NearestNeighbourEngine, build_knn_index, index_is_current
+
+    if not index_is_current(str(KNN_INDEX_DIR), str(TRAINING_CSV_PATH)):
+        logger.info("Building k-NN index in %s from %s", KNN_INDEX_DIR, TRAINING_CSV_PATH)
+        build_knn_index(pd.read_csv(TRAINING_CSV_PATH), str(KNN_INDEX_DIR), source_path=str(TRAINING_CSV_PATH))
+    return NearestNeighbourEngine(str(KNN_INDEX_DIR), k=KNN_NEIGHBOURS)
+
+
+def _build_engine(version: Optional[str]):
+    """Load and warm up an engine for a registry version, or the legacy paths when version is None."""
+    if RECOMMENDATION_BACKEND == "knn":
+        engine = _build_knn_engine()
+        _warm_up(engine)
+        return engine
 
-try:
     from backend.predictive_model.neural_network import SaunaRecommendationEngine
-    NEURAL_NETWORK_AVAILABLE = True
-except ImportError as e:
-    logger.warning("Neural network not available: %s", e)
-    NEURAL_NETWORK_AVAILABLE = False
+    from backend.predictive_model.serving import serving_artifact_path
+
+    if version is None:
+        if not MODEL_PATH.exists():
+            raise FileNotFoundError(f"Model file not found: {MODEL_PATH}")
+        model_path, scaler_path = MODEL_PATH, SCALER_PATH
+    else:
+        paths = registry.verify(version)
+        model_path = paths[MODEL_FILE]
+        scaler_path = paths.get(PREPROCESSING_FILE) or paths[SCALER_FILE]
+
+    engine = SaunaRecommendationEngine(model_path=str(model_path), scaler_path=str(scaler_path),
+                                       allow_pickle=ALLOW_PICKLE_ARTIFACTS)
+    if RECOMMENDATION_SERVING in ("scripted", "int8"):
+        artifact = serving_artifact_path(model_path, quantize=RECOMMENDATION_SERVING == "int8")
+        if artifact.exists():
+            engine.load_serving_artifact(str(artifact), num_threads=RECOMMENDATION_NUM_THREADS or None)
+        else:
+            logger.warning("Serving artifact %s not found; serving the eager model.", artifact)
+    _warm_up(engine)
+    return engine
+
+
+def _swap(version: Optional[str]):
+    """Build the new engine off to the side, then swap the global reference in one assignment."""
+    global sauna_engine, active_version
+    engine = _build_engine(version)
+    # In-flight requests keep the engine reference they already fetched
+    sauna_engine = engine
+    active_version = "knn" if RECOMMENDATION_BACKEND == "knn" else (version or "legacy")
+    logger.info("Sauna recommendation model %s is now serving.", active_version)
+
 
 def load_recommendation_model():
-    """Loads the sauna recommendation model into memory."""
-    global sauna_engine
-    if NEURAL_NETWORK_AVAILABLE and sauna_engine is None:
+    """Loads the sauna recommendation model into memory. Safe to call from several threads; loads once."""
+    if not NEURAL_NETWORK_AVAILABLE:
+        _load_state["status"] = "unavailable"
+        return
+    with _load_lock:
+        if _load_state["status"] != "not_loaded":
+            return
+        _load_state["status"] = "loading"
         try:
-            if MODEL_PATH.exists() and SCALER_PATH.exists():
-                sauna_engine = SaunaRecommendationEngine(
-                    model_path=str(MODEL_PATH),
-                    scaler_path=str(SCALER_PATH)
-                )
-                logger.info("Sauna recommendation model loaded successfully.")
-            else:
-                logger.warning("Model or scaler files not found. Recommendation engine disabled.")
+            _swap(registry.active_version())
+            logger.info("Sauna recommendation model loaded successfully.")
+        except FileNotFoundError as e:
+            logger.warning("%s Recommendation engine disabled.", e)
         except Exception as e:
             logger.error("Failed to load sauna recommendation model: %s", e)
+        finally:
+            _load_state["status"] = "ready" if sauna_engine is not None else "unavailable"
+
+
+def get_recommendation_status() -> str:
+    """Startup load status of the recommendation engine."""
+    # An admin reload can bring up an engine after a failed startup load
+    return "ready" if sauna_engine is not None else _load_state["status"]
+
+
+def _reload(version: Optional[str]):
+    with _reload_lock:
+        target = version or registry.active_version()
+        if target is not None and target == active_version:
+            _reload_state["loading"] = None
+            return
+        try:
+            _swap(target)
+            _reload_state["last_error"] = None
+        except Exception as e:
+            logger.error("Failed to hot swap sauna recommendation model to %s: %s", target, e)
+            _reload_state["last_error"] = f"{target}: {e}"
+        finally:
+            _reload_state["loading"] = None
+
+
+def reload_recommendation_model(version: Optional[str] = None, background: bool = True):
+    """
+    Load a registry version (the manifest's active one by default) and swap it in once warm.
+    The current engine keeps serving until the new one is ready; on failure it stays in place.
+    """
+    if not NEURAL_NETWORK_AVAILABLE:
+        raise RuntimeError("Neural network not available.")
+    if version is not None:
+        registry.verify(version)
+
+    _reload_state["loading"] = version or registry.active_version()
+    if not background:
+        _reload(version)
+        return None
+    thread = threading.Thread(target=_reload, args=(version,), name="model-reload", daemon=True)
+    thread.start()
+    return thread
+
+
+def rollback_recommendation_model(background: bool = True) -> str:
+    """Re-activate the previous registry version and hot swap to it."""
+    if not NEURAL_NETWORK_AVAILABLE:
+        raise RuntimeError("Neural network not available.")
+    version = registry.rollback()
+    reload_recommendation_model(version, background=background)
+    return version
+
+
+def get_model_status():
+    """Returns the serving version, reload progress and known registry versions."""
+    return {
+        "active_version": active_version,
+        "manifest_active_version": registry.active_version() if registry else None,
+        "loading": _reload_state["loading"],
+        "last_error": _reload_state["last_error"],
+        "versions": registry.list_versions() if registry else [],
+    }
+
+
+def _watch_registry(interval: float):
+    last_mtime = registry.manifest_mtime()
+    while not _watcher_stop.wait(interval):
+        mtime = registry.manifest_mtime()
+        if mtime is not None and mtime != last_mtime:
+            last_mtime = mtime
+            logger.info("Model registry manifest changed; reloading.")
+            _reload(None)
+
+
+def start_registry_watcher(interval: float = MODEL_REGISTRY_POLL_SECONDS):
+    """Poll the registry manifest and hot swap when the active version changes. Disabled if interval <= 0."""
+    global _watcher_thread
+    if not NEURAL_NETWORK_AVAILABLE or interval <= 0 or _watcher_thread is not None:
+        return
+    _watcher_stop.clear()
+    _watcher_thread = threading.Thread(target=_watch_registry, args=(interval,),
+                                       name="model-registry-watcher", daemon=True)
+    _watcher_thread.start()
+
+
+def stop_registry_watcher():
+    global _watcher_thread
+    _watcher_stop.set()
+    if _watcher_thread is not None:
+        _watcher_thread.join(timeout=5)
+        _watcher_thread = None
+
 
 def get_sauna_engine():
-    """Returns the loaded sauna engine instance."""
-    return sauna_engine
\ No newline at end of file
+    """Returns the loaded sauna engine instance, loading it first in lazy startup mode."""
+    if sauna_engine is None and STARTUP_MODE == "lazy":
+        load_recommendation_model()
+    return sauna_engine
@@ -0,0 +1,62 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Tests import the app as the `backend` package, like `python -m backend...` does
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+
+class FakeClock:
+    """Stands in for the `time` module: time() and monotonic() only move when advanced"""
+
+    def __init__(self, start: float = 1_000_000.0):
+        self.now = start
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class WhitespaceEncoding:
+    """One token per word, so budgets are easy to reason about (and need no tiktoken download)"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, text):
+        self.calls += 1
+        return text.split()
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+@pytest.fixture
+def encoding(monkeypatch):
+    """Stands in for the tiktoken encoding used to budget chat histories (LLM/sessions.py)"""
+    from backend.LLM import sessions
+
+    encoding = WhitespaceEncoding()
+    monkeypatch.setattr(sessions, "_encoding", lambda name: encoding)
+    return encoding
+
+
+@pytest.fixture
+def redis_server():
+    """In-process Redis-protocol server (see stand_in_redis.py)"""
+    from backend.tests.stand_in_redis import StandInRedisServer
+
+    server = StandInRedisServer().start()
+    yield server
+    server.stop()
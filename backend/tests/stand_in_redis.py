@@ -0,0 +1,74 @@
+"""
+Minimal in-process Redis-protocol server for tests and benchmarks
+
+Speaks RESP2 for the handful of commands RedisHistoryBackend uses. Expiry reads
+the module-level `time.time`, so tests can patch in a fake clock.
+"""
+
+import fnmatch
+import socketserver
+import threading
+import time
+
+
+class StandInRedisServer(socketserver.ThreadingTCPServer):
+    """Single-database RESP2 server: PING, AUTH, SELECT, GET, SET [EX], DEL, SCAN [MATCH] [COUNT]"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        self.data = {}  # key -> (value, expires_at or None)
+        self.data_lock = threading.Lock()
+        super().__init__(("127.0.0.1", 0), _RespHandler)
+
+    @property
+    def url(self) -> str:
+        return f"redis://127.0.0.1:{self.server_address[1]}/0"
+
+    def start(self) -> "StandInRedisServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class _RespHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            args = []
+            for _ in range(int(line[1:-2])):
+                length = int(self.rfile.readline()[1:-2])
+                args.append(self.rfile.read(length + 2)[:-2])
+            self.wfile.write(self._execute([args[0].decode().upper()] + args[1:]))
+
+    def _execute(self, args):
+        server, command = self.server, args[0]
+        with server.data_lock:
+            now = time.time()
+            if command in ("PING", "AUTH", "SELECT"):
+                return b"+OK\r\n" if command != "PING" else b"+PONG\r\n"
+            if command == "GET":
+                value, expires_at = server.data.get(args[1], (None, None))
+                if value is None or (expires_at and expires_at < now):
+                    return b"$-1\r\n"
+                return b"$%d\r\n%s\r\n" % (len(value), value)
+            if command == "SET":
+                ttl = int(args[4]) if len(args) > 4 and args[3].upper() == b"EX" else None
+                server.data[args[1]] = (args[2], now + ttl if ttl else None)
+                return b"+OK\r\n"
+            if command == "DEL":
+                return b":%d\r\n" % sum(server.data.pop(key, None) is not None for key in args[1:])
+            if command == "SCAN":
+                pattern = args[args.index(b"MATCH") + 1].decode() if b"MATCH" in args else "*"
+                keys = [k for k, (_, exp) in server.data.items()
+                        if fnmatch.fnmatchcase(k.decode(), pattern) and not (exp and exp < now)]
+                reply = [b"*2\r\n$1\r\n0\r\n", b"*%d\r\n" % len(keys)]
+                reply.extend(b"$%d\r\n%s\r\n" % (len(k), k) for k in keys)
+                return b"".join(reply)
+        return b"-ERR unknown command\r\n"
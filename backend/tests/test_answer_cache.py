@@ -0,0 +1,27 @@
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from backend.LLM.answer_cache import SemanticAnswerCache
+from backend.LLM.embeddings import CachedEmbeddings
+
+
+class FixedEmbeddings(Embeddings):
+    def embed_query(self, text):
+        return [3.0, 4.0, 0.0]
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+
+def test_cache_does_not_normalize_the_shared_query_vector():
+    embedder = CachedEmbeddings(FixedEmbeddings())
+    cache = SemanticAnswerCache(embedder.embed_query, threshold=0.9)
+    question = "is sauna good for sleep?"
+
+    cache.store(question, "Often, yes.", ["sleep.pdf"])
+    assert cache.lookup(question)["answer"] == "Often, yes."
+
+    first = embedder.embed_query(" ".join(question.split()))
+    np.testing.assert_array_equal(first, [3.0, 4.0, 0.0])
+    assert embedder.embed_query(" ".join(question.split())) is first
+    assert embedder.hits >= 2
@@ -0,0 +1,89 @@
+import pickle
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from backend.predictive_model.artifacts import convert_pickles, load_preprocessing, save_preprocessing
+
+PREDICTIVE_DIR = Path(__file__).resolve().parents[1] / "predictive_model"
+
+
+@pytest.fixture
+def StandardScaler():
+    return pytest.importorskip("sklearn.preprocessing").StandardScaler
+
+
+def test_round_trip_matches_standard_scaler(tmp_path, StandardScaler):
+    rng = np.random.default_rng(0)
+    X = rng.normal(loc=[30, 175, 70, 1, 0], scale=[10, 8, 12, 0.5, 1], size=(500, 5))
+    scaler = StandardScaler().fit(X)
+    metadata = {"goal_columns": ["goal_a", "goal_b"], "model_config": {"hidden_sizes": [16, 8]}}
+
+    path = tmp_path / "scaler.bin"
+    save_preprocessing(str(path), scaler.mean_, scaler.scale_, metadata)
+    loaded, loaded_metadata = load_preprocessing(str(path))
+
+    X_new = rng.normal(size=(50, 5)) * 20
+    np.testing.assert_array_equal(loaded.transform(X_new), scaler.transform(X_new))
+    assert loaded.n_features_in_ == scaler.n_features_in_
+    assert loaded_metadata["goal_columns"] == metadata["goal_columns"]
+    assert loaded_metadata["model_config"] == metadata["model_config"]
+
+
+def test_converted_pickles_match_the_original_scaler(tmp_path, StandardScaler):
+    scaler = StandardScaler().fit(np.random.default_rng(1).normal(size=(100, 4)))
+    scaler_path = tmp_path / "sauna_scaler.pkl"
+    scaler_path.write_bytes(pickle.dumps(scaler))
+    (tmp_path / "sauna_scaler_encoders.pkl").write_bytes(pickle.dumps({"all_goals": ["b", "a"]}))
+
+    loaded, metadata = load_preprocessing(str(convert_pickles(str(scaler_path))))
+
+    X = np.random.default_rng(2).normal(size=(20, 4))
+    np.testing.assert_array_equal(loaded.transform(X), scaler.transform(X))
+    assert metadata["goal_columns"] == ["goal_a", "goal_b"]
+
+
+def test_shipped_artifact_matches_shipped_pickle(StandardScaler):
+    with open(PREDICTIVE_DIR / "sauna_scaler.pkl", "rb") as f:
+        scaler = pickle.load(f)
+    loaded, _ = load_preprocessing(str(PREDICTIVE_DIR / "sauna_scaler.bin"))
+
+    X = np.random.default_rng(3).normal(size=(20, scaler.n_features_in_))
+    np.testing.assert_array_equal(loaded.transform(X), scaler.transform(X))
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "not_an_artifact.bin"
+    path.write_bytes(b"\x80\x04not a preprocessing artifact")
+    with pytest.raises(ValueError):
+        load_preprocessing(str(path))
+
+
+def test_engine_loads_pickles_only_when_opted_in(tmp_path, StandardScaler):
+    pytest.importorskip("torch")
+    from backend.predictive_model.neural_network import SaunaRecommendationEngine
+
+    for name in ("sauna_recommendation_model.pth", "sauna_scaler.pkl", "sauna_scaler_encoders.pkl"):
+        (tmp_path / name).write_bytes((PREDICTIVE_DIR / name).read_bytes())
+    model_path, scaler_path = str(tmp_path / "sauna_recommendation_model.pth"), str(tmp_path / "sauna_scaler.pkl")
+
+    with pytest.raises(FileNotFoundError, match="legacy pickles"):
+        SaunaRecommendationEngine(model_path=model_path, scaler_path=scaler_path)
+    engine = SaunaRecommendationEngine(model_path=model_path, scaler_path=scaler_path, allow_pickle=True)
+    assert engine.is_ready()
+
+
+def test_shipped_model_loads_without_sklearn():
+    pytest.importorskip("torch")
+    snippet = (
+        "import sys\n"
+        "from backend.src.core.config import MODEL_PATH, SCALER_PATH\n"
+        "from backend.predictive_model.neural_network import SaunaRecommendationEngine\n"
+        "engine = SaunaRecommendationEngine(model_path=str(MODEL_PATH), scaler_path=str(SCALER_PATH))\n"
+        "assert engine.is_ready()\n"
+        "assert 'sklearn' not in sys.modules, 'sklearn was imported'\n"
+    )
+    subprocess.run([sys.executable, "-c", snippet], check=True, cwd=PREDICTIVE_DIR.parents[1])
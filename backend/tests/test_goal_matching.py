@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.predictive_model.goal_matching import (GOAL_FUNCTIONS, SCORE_COLUMNS, SETTING_COLUMNS, USER_COLUMNS,
+                                                    find_optimal_settings, inverse_dataset,
+                                                    iter_optimal_settings_chunked)
+
+KEY = USER_COLUMNS + ['goal']
+
+
+def make_forward(n_users=40, settings_per_user=12, seed=0):
+    """Small forward dataset with ties and every user's rows scattered through the frame"""
+    rng = np.random.default_rng(seed)
+    users = pd.DataFrame({
+        'age': rng.integers(19, 27, n_users).astype(float),
+        'BMI': rng.uniform(17, 34, n_users).round(2),
+        'body_mass': rng.uniform(58, 110, n_users).round(1),
+    })
+    df = users.loc[np.repeat(users.index, settings_per_user)].reset_index(drop=True)
+    for col in SETTING_COLUMNS + SCORE_COLUMNS:
+        # Rounded so some rows tie on their goal score
+        df[col] = rng.integers(0, 5, len(df)).astype(float)
+    return df.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def _sorted(df):
+    return df.sort_values(KEY).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("chunk_rows, buckets", [(7, 4), (100, 1), (1000, 64)])
+def test_chunked_matches_the_full_dataset(chunk_rows, buckets, tmp_path):
+    df = make_forward()
+    chunks = (df.iloc[i:i + chunk_rows] for i in range(0, len(df), chunk_rows))
+
+    parts = list(iter_optimal_settings_chunked(chunks, buckets=buckets, spill_dir=tmp_path))
+    assert len(parts) <= buckets
+    pd.testing.assert_frame_equal(_sorted(pd.concat(parts)), _sorted(find_optimal_settings(df)))
+    assert list(tmp_path.iterdir()) == [], "spill files were left behind"
+
+
+def test_inverse_dataset_streams_parquet_input(tmp_path):
+    pytest.importorskip("pyarrow")
+    df = make_forward()
+    input_dir = tmp_path / "forward"
+    input_dir.mkdir()
+    for i in range(0, len(df), 100):
+        df.iloc[i:i + 100].to_parquet(input_dir / f"part-{i:05d}.parquet", index=False)
+
+    for output in (tmp_path / "inverse.parquet", tmp_path / "inverse.csv"):
+        assert inverse_dataset(input_dir, output) == output
+        written = pd.read_parquet(output) if output.suffix == ".parquet" else pd.read_csv(output)
+        assert len(written) == df[USER_COLUMNS].drop_duplicates().shape[0] * len(GOAL_FUNCTIONS)
+        pd.testing.assert_frame_equal(_sorted(written), _sorted(find_optimal_settings(df)), check_exact=False)
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_vectorized_matches_the_row_wise_reference(seed):
+    from backend.benchmarks.benchmark_goal_matching import reference_optimal_settings
+
+    df = make_forward(n_users=15, settings_per_user=8, seed=seed)
+    pd.testing.assert_frame_equal(find_optimal_settings(df), reference_optimal_settings(df))
+
+
+def test_vectorized_matches_the_reference_on_generated_data():
+    from backend.benchmarks.benchmark_goal_matching import make_dataset, reference_optimal_settings
+
+    df = make_dataset(600, settings_per_user=20)  # seeded generator
+    pd.testing.assert_frame_equal(find_optimal_settings(df), reference_optimal_settings(df))
+
+
+def test_regenerating_parquet_parts_replaces_the_previous_dataset(tmp_path):
+    pytest.importorskip("pyarrow")
+    from backend.predictive_model.synthetic_data_generation import (generate_sauna_environmental_data_parquet,
+                                                                    iter_parquet_chunks)
+
+    output_dir = str(tmp_path / "forward")
+    generate_sauna_environmental_data_parquet(50, output_dir=output_dir, chunk_size=10, workers=1)
+    generate_sauna_environmental_data_parquet(15, output_dir=output_dir, chunk_size=10, workers=1)
+
+    assert sorted(path.name for path in (tmp_path / "forward").iterdir()) == ["part-00000.parquet",
+                                                                               "part-00001.parquet"]
+    assert sum(len(chunk) for chunk in iter_parquet_chunks(output_dir, columns=USER_COLUMNS)) == 15
@@ -0,0 +1,284 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from backend.LLM import history_backends
+from backend.LLM.history_backends import (ChatHistoryBackend, ProcessLocalBackend, RedisHistoryBackend,
+                                          SQLiteHistoryBackend, close_history_backends)
+from backend.LLM.sessions import SessionStore
+from backend.tests import stand_in_redis
+
+TTL = 60
+STATE = {"summary": "User asked about sleep.", "messages": [{"type": "human", "data": {"content": "hi"}}]}
+
+# Chat histories are budgeted with a stand-in tokenizer (see conftest.py)
+pytestmark = pytest.mark.usefixtures("encoding")
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def backend(request, tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(history_backends, "time", clock)
+    monkeypatch.setattr(stand_in_redis, "time", clock)
+    if request.param == "sqlite":
+        # No background flushes: the tests flush through ids() or explicitly
+        instance = SQLiteHistoryBackend(str(tmp_path / "history.sqlite3"), ttl_seconds=TTL, flush_interval=3600)
+    else:
+        instance = RedisHistoryBackend(request.getfixturevalue("redis_server").url, ttl_seconds=TTL)
+    yield instance
+    instance.close()
+
+
+def _persist(backend):
+    if isinstance(backend, SQLiteHistoryBackend):
+        backend.flush()
+
+
+def test_backend_interface_is_abstract():
+    class Incomplete(ChatHistoryBackend):
+        def load(self, session_id):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_save_load_round_trip(backend):
+    assert backend.load("a") is None
+    backend.save("a", STATE)
+    assert backend.load("a") == STATE
+    _persist(backend)
+    assert backend.load("a") == STATE
+
+
+def test_save_replaces_previous_state(backend):
+    backend.save("a", STATE)
+    _persist(backend)
+    backend.save("a", {"summary": "", "messages": []})
+    assert backend.load("a") == {"summary": "", "messages": []}
+
+
+def test_delete_and_ids(backend):
+    for session_id in ("a", "b", "c"):
+        backend.save(session_id, STATE)
+    _persist(backend)
+    assert sorted(backend.ids()) == ["a", "b", "c"]
+
+    assert backend.delete("b") is True
+    assert backend.delete("missing") is False
+    assert backend.load("b") is None
+    assert sorted(backend.ids()) == ["a", "c"]
+
+    backend.clear()
+    assert backend.ids() == []
+
+
+def test_idle_sessions_expire(backend, clock):
+    backend.save("old", STATE)
+    _persist(backend)
+    clock.advance(TTL / 2)
+    backend.save("new", STATE)
+    _persist(backend)
+
+    clock.advance(TTL / 2 + 1)
+    assert backend.load("old") is None
+    assert backend.load("new") == STATE
+    assert backend.ids() == ["new"]
+
+
+def test_fresh_store_reads_what_another_worker_wrote(backend):
+    writer = SessionStore(backend=backend)
+    writer.get("s").add_messages([HumanMessage(content="Is sauna good for sleep?"), AIMessage(content="Often.")])
+    _persist(backend)
+
+    reader = SessionStore(backend=backend)
+    assert reader.get("s").messages == writer.get("s").messages
+
+
+def test_store_reloads_stale_cache_entries(backend, clock, monkeypatch):
+    monkeypatch.setattr("backend.LLM.sessions.time", clock)
+    worker_a = SessionStore(backend=backend, cache_ttl_seconds=2)
+    worker_b = SessionStore(backend=backend, cache_ttl_seconds=2)
+    assert worker_a.get("s").messages == []
+
+    worker_b.get("s").add_messages([HumanMessage(content="q"), AIMessage(content="a")])
+    assert worker_a.get("s").messages == []  # still cached
+    clock.advance(3)
+    assert len(worker_a.get("s").messages) == 2
+
+
+class SlowBackend(ChatHistoryBackend):
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.states = {}
+
+    def load(self, session_id):
+        time.sleep(self.delay)
+        return self.states.get(session_id)
+
+    def save(self, session_id, state):
+        self.states[session_id] = state
+
+    def delete(self, session_id):
+        return self.states.pop(session_id, None) is not None
+
+    def clear(self):
+        self.states.clear()
+
+    def ids(self):
+        return list(self.states)
+
+
+def test_aget_reads_the_backend_off_the_event_loop():
+    store = SessionStore(backend=SlowBackend(delay=0.3))
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        history = await store.aget("s")
+        task.cancel()
+        return history, ticks
+
+    history, ticks = asyncio.run(main())
+    assert ticks >= 10, "event loop was blocked during the backend read"
+    # Loaded entries are fresh, so the chain's synchronous lookup right after is a cache hit
+    start = time.perf_counter()
+    assert store.get("s") is history
+    assert time.perf_counter() - start < 0.1
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_worker_persists_its_sessions(tmp_path):
+    path = str(tmp_path / "history.sqlite3")
+    backend = ProcessLocalBackend(lambda: SQLiteHistoryBackend(path, ttl_seconds=TTL, flush_interval=3600))
+    # The parent has its own backend (and flusher thread) before forking, like a preloading server
+    SessionStore(backend=backend).get("parent").add_messages([HumanMessage(content="q"), AIMessage(content="a")])
+
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            store = SessionStore(backend=backend)
+            for session_id in ("w1", "w2"):
+                store.get(session_id).add_messages([HumanMessage(content="q"), AIMessage(content="a")])
+            code = 0
+        finally:
+            # Same exit path as a pre-forked worker (src/serve.py)
+            close_history_backends()
+            os._exit(code)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+
+    with sqlite3.connect(path) as conn:
+        rows = sorted(row[0] for row in conn.execute("SELECT session_id FROM chat_sessions"))
+    assert rows == ["w1", "w2"]
+    # The parent's backend is untouched by the child's exit
+    assert sorted(backend.ids()) == ["parent", "w1", "w2"]
+    backend.close()
+
+
+class GatedConnection:
+    """sqlite3 connection that holds (and optionally fails) a flush at its upsert"""
+
+    def __init__(self, conn, fail=False):
+        self.conn = conn
+        self.fail = fail
+        self.writing = threading.Event()
+        self.release = threading.Event()
+
+    def execute(self, *args):
+        return self.conn.execute(*args)
+
+    def executemany(self, sql, rows):
+        if sql.startswith("INSERT"):
+            self.writing.set()
+            self.release.wait(5)
+            if self.fail:
+                raise sqlite3.OperationalError("disk I/O error")
+        return self.conn.executemany(sql, rows)
+
+    def close(self):
+        self.conn.close()
+
+
+@pytest.fixture
+def sqlite_backend(tmp_path):
+    instance = SQLiteHistoryBackend(str(tmp_path / "history.sqlite3"), ttl_seconds=TTL, flush_interval=3600)
+    yield instance
+    instance.close()
+
+
+def _flush_in_background(backend):
+    errors = []
+
+    def flush():
+        try:
+            backend.flush()
+        except sqlite3.OperationalError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=flush)
+    thread.start()
+    assert backend._conn.writing.wait(5)
+    return thread, errors
+
+
+@pytest.mark.parametrize("fail", [False, True])
+def test_states_stay_readable_while_a_flush_is_writing(sqlite_backend, fail):
+    sqlite_backend.save("s", {"summary": "old", "messages": []})
+    sqlite_backend.flush()
+    sqlite_backend._conn = GatedConnection(sqlite_backend._conn, fail=fail)
+    new_state = {"summary": "new", "messages": []}
+    sqlite_backend.save("s", new_state)
+
+    thread, errors = _flush_in_background(sqlite_backend)
+    start = time.perf_counter()
+    assert sqlite_backend.load("s") == new_state
+    assert time.perf_counter() - start < 1, "load waited for the flush"
+    sqlite_backend._conn.release.set()
+    thread.join()
+
+    assert bool(errors) is fail
+    assert sqlite_backend.load("s") == new_state
+    sqlite_backend._conn.fail = False
+    sqlite_backend.flush()
+    sqlite_backend._pending.clear()
+    assert sqlite_backend.load("s") == new_state
+
+
+def test_clear_waits_for_a_running_flush(sqlite_backend, monkeypatch):
+    taken, release = threading.Event(), threading.Event()
+    write = sqlite_backend._write
+
+    def gated_write(pending):
+        # Batch already taken out of _pending, not yet written
+        taken.set()
+        release.wait(5)
+        write(pending)
+
+    monkeypatch.setattr(sqlite_backend, "_write", gated_write)
+    sqlite_backend.save("s", STATE)
+    flushing = threading.Thread(target=sqlite_backend.flush)
+    flushing.start()
+    assert taken.wait(5)
+
+    clearing = threading.Thread(target=sqlite_backend.clear)
+    clearing.start()
+    clearing.join(0.2)
+    assert clearing.is_alive(), "clear ran while a flush was writing"
+    release.set()
+    flushing.join()
+    clearing.join()
+    assert sqlite_backend.load("s") is None
+    assert sqlite_backend.ids() == []
@@ -0,0 +1,123 @@
+import zlib
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from backend.LLM import faiss_indexing, indexing
+from backend.LLM.faiss_indexing import load_faiss_index
+
+DIM = 32
+
+
+class FakeEmbeddings(Embeddings):
+    """Deterministic pseudo-random vectors keyed by the text"""
+
+    def _vector(self, text):
+        return np.random.default_rng(zlib.crc32(text.encode())).standard_normal(DIM).astype(np.float32)
+
+    def embed_documents(self, texts):
+        return [self._vector(t).tolist() for t in texts]
+
+    def embed_query(self, text):
+        return self._vector(text).tolist()
+
+
+CORPUS = {name: [f"{name} chunk {i}" for i in range(60)] for name in ("a.pdf", "b.pdf", "c.pdf")}
+
+
+def fake_ingest(paths, embedder, chunk_size, chunk_overlap, batch_size, workers, progress):
+    for path in paths:
+        texts = CORPUS[path.name]
+        chunks = [Document(page_content=t, metadata={"source": str(path)}) for t in texts]
+        progress.files += 1
+        progress.embedded += len(chunks)
+        yield [path.name] * len(chunks), chunks, np.asarray(embedder.embed_documents(texts), dtype=np.float32)
+
+
+@pytest.fixture
+def corpus_dirs(tmp_path, monkeypatch):
+    embedder = FakeEmbeddings()
+    monkeypatch.setattr(indexing, "get_embedder", lambda *args, **kwargs: embedder)
+    monkeypatch.setattr(faiss_indexing, "get_embedder", lambda *args, **kwargs: embedder)
+    monkeypatch.setattr(indexing, "ingest", fake_ingest)
+    raw_dir, index_dir = tmp_path / "raw", tmp_path / "index"
+    raw_dir.mkdir()
+    for name in CORPUS:
+        (raw_dir / name).write_bytes(name.encode())
+    return raw_dir, index_dir
+
+
+def _top_hit(index, text):
+    return index.similarity_search(text, k=1)[0].page_content
+
+
+@pytest.mark.parametrize("index_spec, rebuilt", [("Flat", False), ("IVF4,Flat", True)])
+def test_deleting_a_file_keeps_the_other_chunks_retrievable(corpus_dirs, index_spec, rebuilt):
+    raw_dir, index_dir = corpus_dirs
+    first = indexing.update_index(raw_dir, index_dir, index_spec=index_spec, workers=1)
+    assert first["rebuilt"] and sorted(first["added"]) == sorted(CORPUS)
+
+    (raw_dir / "b.pdf").unlink()
+    second = indexing.update_index(raw_dir, index_dir, index_spec=index_spec, workers=1)
+    assert second["deleted"] == ["b.pdf"]
+    assert second["rebuilt"] is rebuilt
+
+    # Search every IVF list, so a miss can only mean a wrong id mapping
+    index = load_faiss_index(index_dir, search_params={"nprobe": 4} if "IVF" in index_spec else {})
+    assert index.index.ntotal == len(CORPUS["a.pdf"]) + len(CORPUS["c.pdf"])
+    for text in CORPUS["a.pdf"] + CORPUS["c.pdf"]:
+        assert _top_hit(index, text) == text
+    assert not any(doc.page_content.startswith("b.pdf") for doc in index.docstore._dict.values())
+
+    manifest = indexing.read_manifest(index_dir)
+    assert sorted(manifest["files"]) == ["a.pdf", "c.pdf"]
+
+
+def test_adding_a_file_after_a_removal_keeps_ids_consistent(corpus_dirs):
+    raw_dir, index_dir = corpus_dirs
+    indexing.update_index(raw_dir, index_dir, index_spec="Flat", workers=1)
+    (raw_dir / "a.pdf").unlink()
+    indexing.update_index(raw_dir, index_dir, index_spec="Flat", workers=1)
+    (raw_dir / "a.pdf").write_bytes(b"a.pdf")
+    summary = indexing.update_index(raw_dir, index_dir, index_spec="Flat", workers=1)
+    assert summary["added"] == ["a.pdf"] and not summary["rebuilt"]
+
+    index = load_faiss_index(index_dir, search_params={})
+    for texts in CORPUS.values():
+        for text in texts:
+            assert _top_hit(index, text) == text
+
+
+def test_unchanged_corpus_is_a_no_op(corpus_dirs):
+    raw_dir, index_dir = corpus_dirs
+    indexing.update_index(raw_dir, index_dir, index_spec="Flat", workers=1)
+    summary = indexing.update_index(raw_dir, index_dir, index_spec="Flat", workers=1)
+    assert summary["unchanged"] == len(CORPUS) and not (summary["added"] or summary["deleted"])
+
+
+@pytest.mark.parametrize("index_spec", ["Flat", "IVF4,Flat"])
+def test_mmap_load_searches_like_a_heap_load(corpus_dirs, index_spec):
+    raw_dir, index_dir = corpus_dirs
+    indexing.update_index(raw_dir, index_dir, index_spec=index_spec, workers=1)
+    index = load_faiss_index(index_dir, mmap=True, search_params={"nprobe": 4} if "IVF" in index_spec else {})
+
+    assert faiss_indexing.mmap_read_flag(index.index) is not None
+    for text in CORPUS["a.pdf"][:10]:
+        assert _top_hit(index, text) == text
+
+
+def test_malformed_search_params_are_skipped():
+    assert faiss_indexing.parse_search_params("nprobe=16, efSearch=6x4,bogus,=3, k_factor=1.5") == {
+        "nprobe": 16, "k_factor": 1.5}
+
+
+def test_malformed_search_params_do_not_stop_the_index_loading(corpus_dirs, monkeypatch):
+    raw_dir, index_dir = corpus_dirs
+    indexing.update_index(raw_dir, index_dir, index_spec="IVF4,Flat", workers=1)
+    monkeypatch.setattr(faiss_indexing, "FAISS_SEARCH_PARAMS", "nprobe=4,nprobe:8")
+
+    index = load_faiss_index(index_dir)
+    assert index is not None
+    assert faiss_indexing.faiss.extract_index_ivf(index.index).nprobe == 4
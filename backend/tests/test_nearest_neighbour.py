@@ -0,0 +1,50 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("sklearn")
+pytest.importorskip("torch")
+
+from backend.predictive_model.nearest_neighbour import (NearestNeighbourEngine, build_knn_index,  # noqa: E402
+                                                        index_is_current)
+from backend.src.services import recommendation  # noqa: E402
+
+PREDICTIVE_DIR = Path(__file__).resolve().parents[1] / "predictive_model"
+
+
+@pytest.fixture
+def training_csv(tmp_path):
+    path = tmp_path / "training.csv"
+    pd.read_csv(PREDICTIVE_DIR / "optimal_sauna_settings_with_height.csv", nrows=600).to_csv(path, index=False)
+    return path
+
+
+def test_index_is_stale_once_the_table_changes(training_csv, tmp_path):
+    index_dir = tmp_path / "knn_index"
+    assert not index_is_current(str(index_dir), str(training_csv))
+
+    build_knn_index(pd.read_csv(training_csv), str(index_dir), source_path=str(training_csv))
+    assert index_is_current(str(index_dir), str(training_csv))
+
+    df = pd.read_csv(training_csv)
+    df.loc[0, 'best_temp'] += 1
+    df.to_csv(training_csv, index=False)
+    assert not index_is_current(str(index_dir), str(training_csv))
+
+
+def test_service_rebuilds_a_stale_index(training_csv, tmp_path, monkeypatch):
+    index_dir = tmp_path / "knn_index"
+    monkeypatch.setattr(recommendation, "KNN_INDEX_DIR", index_dir)
+    monkeypatch.setattr(recommendation, "TRAINING_CSV_PATH", training_csv)
+    recommendation._build_knn_engine()
+
+    # Regenerated table: every setting changes, so a stale index would answer with the old ones
+    df = pd.read_csv(training_csv)
+    df['best_temp'] = 77.0
+    df.to_csv(training_csv, index=False)
+    engine = recommendation._build_knn_engine()
+
+    assert isinstance(engine, NearestNeighbourEngine)
+    result = engine.predict(25, "Male", 1.75, 75, ["longevity"])
+    assert result["temperature"] == 77.0
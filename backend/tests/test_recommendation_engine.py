@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+
+from backend.predictive_model.neural_network import SaunaRecommendationEngine  # noqa: E402
+from backend.src.core.config import MODEL_PATH, SCALER_PATH  # noqa: E402
+
+# temperature, humidity, session length per goal; the last row is out of bounds on every output
+PREDICTIONS = np.array([
+    [70.0, 10.0, 15.0],
+    [90.0, 20.0, 25.0],
+    [120.0, 1.0, 45.0],
+])
+CLIPPED = np.array([
+    [70.0, 10.0, 15.0],
+    [90.0, 20.0, 25.0],
+    [100.0, 5.0, 30.0],
+])
+
+
+@pytest.fixture
+def engine():
+    return SaunaRecommendationEngine()
+
+
+@pytest.fixture(scope="module")
+def loaded_engine():
+    engine = SaunaRecommendationEngine(model_path=str(MODEL_PATH), scaler_path=str(SCALER_PATH))
+    assert engine.is_ready()
+    return engine
+
+
+def test_weighted_mean_defaults_to_equal_weights(engine):
+    np.testing.assert_allclose(engine.combine_predictions(PREDICTIONS), CLIPPED.mean(axis=0))
+
+
+def test_weighted_mean_uses_the_given_weights(engine):
+    combined = engine.combine_predictions(PREDICTIONS, weights=[3, 1, 0])
+    np.testing.assert_allclose(combined, (3 * CLIPPED[0] + CLIPPED[1]) / 4)
+
+
+@pytest.mark.parametrize("weights", [[1, 1], [1, -1, 1], [0, 0, 0]])
+def test_weighted_mean_rejects_invalid_weights(engine, weights):
+    with pytest.raises(ValueError):
+        engine.combine_predictions(PREDICTIONS, weights=weights)
+
+
+def test_min_and_max_are_per_output_and_within_bounds(engine):
+    np.testing.assert_array_equal(engine.combine_predictions(PREDICTIONS, strategy="min"), [70.0, 5.0, 15.0])
+    np.testing.assert_array_equal(engine.combine_predictions(PREDICTIONS, strategy="max"), [100.0, 20.0, 30.0])
+
+
+def test_unknown_strategy_is_rejected(engine):
+    with pytest.raises(ValueError, match="Unknown combine strategy"):
+        engine.combine_predictions(PREDICTIONS, strategy="median")
+
+
+def test_batched_goals_match_one_forward_pass_per_goal(loaded_engine):
+    goals = loaded_engine._map_goals(list(loaded_engine.goal_mapping))
+    features = loaded_engine._build_goal_features(27, 1.8, 75, goals)
+
+    batched = loaded_engine.predict_batch(features)
+    one_by_one = np.vstack([loaded_engine.predict_batch(row[None, :]) for row in features])
+    np.testing.assert_allclose(batched, one_by_one, rtol=1e-5, atol=1e-4)
+
+
+@pytest.mark.parametrize("strategy", SaunaRecommendationEngine.COMBINE_STRATEGIES)
+def test_predict_combines_its_per_goal_breakdown(loaded_engine, strategy):
+    result = loaded_engine.predict(27, "Female", 1.8, 75, ["stress_reduction", "longevity", "cold_recovery"],
+                                   strategy=strategy, goal_weights={"longevity": 2})
+
+    assert result["goals_used"] == ["stress_relief", "longevity", "cold_recovery"]
+    per_goal = np.array([[p["temperature"], p["humidity"], p["session_length"]]
+                         for p in result["per_goal"].values()])
+    if strategy == "weighted_mean":
+        expected = (per_goal * np.array([1, 2, 1])[:, None]).sum(axis=0) / 4
+    else:
+        expected = getattr(per_goal, strategy)(axis=0)
+    # The breakdown is rounded to 0.1, so the combination can differ by rounding only
+    np.testing.assert_allclose([result["temperature"], result["humidity"], result["session_length"]],
+                               expected, atol=0.1)
+
+
+@pytest.fixture
+def client(loaded_engine, monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from backend.src.routes import sauna
+
+    monkeypatch.setattr(sauna, "get_sauna_engine", lambda: loaded_engine)
+    app = FastAPI()
+    app.include_router(sauna.router)
+    return TestClient(app)
+
+
+REQUEST = {"age": 27, "gender": "Female", "height": 180, "weight": 75}
+
+
+def test_route_reports_the_goals_actually_used(client):
+    response = client.post("/recommendations", json={**REQUEST, "goals": ["stress_reduction", "unknown", "longevity"]})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["goals_used"] == ["stress_relief", "longevity"]
+    assert list(body["per_goal"]) == body["goals_used"]
+
+
+@pytest.mark.parametrize("goal_weights", [{"longevity": 1}, {"stress_reduction": 0}])
+def test_route_rejects_invalid_goal_weights_as_client_errors(client, goal_weights):
+    response = client.post("/recommendations", json={**REQUEST, "goals": ["stress_reduction"],
+                                                      "goal_weights": goal_weights})
+    assert response.status_code == 422
+    assert "weights" in response.json()["detail"].lower()
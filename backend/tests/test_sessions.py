@@ -0,0 +1,134 @@
+import random
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from backend.LLM import sessions
+from backend.LLM.config import HISTORY_MAX_TOKENS, SUMMARY_MAX_TOKENS
+from backend.LLM.sessions import (SUMMARY_PREFIX, SessionStore, WindowedChatMessageHistory, count_message_tokens,
+                                  extractive_summary)
+
+# Chat histories are budgeted with a stand-in tokenizer (see conftest.py)
+pytestmark = pytest.mark.usefixtures("encoding")
+
+
+@pytest.fixture
+def store_clock(clock, monkeypatch):
+    monkeypatch.setattr(sessions, "time", clock)
+    return clock
+
+
+def turn(i, words=3):
+    return [HumanMessage(content=f"q{i} " + "w " * (words - 1)), AIMessage(content=f"a{i} " + "w " * (words - 1))]
+
+
+def test_least_recently_used_session_is_evicted(store_clock):
+    store = SessionStore(max_sessions=2, ttl_seconds=60)
+    a = store.get("a")
+    store.get("b")
+    assert store.get("a") is a  # a is now the most recently used
+    store.get("c")
+
+    assert sorted(store.ids()) == ["a", "c"]
+    assert "b" not in store and len(store) == 2
+
+
+def test_idle_sessions_expire_and_use_refreshes_them(store_clock):
+    store = SessionStore(max_sessions=10, ttl_seconds=60)
+    a = store.get("a")
+    a.add_messages(turn(0))
+    store.get("b")
+
+    store_clock.advance(40)
+    store.get("a")
+    store_clock.advance(40)  # b idle for 80s, a for 40s
+    assert store.ids() == ["a"]
+    assert store.get("a") is a
+
+    store_clock.advance(61)
+    fresh = store.get("a")
+    assert fresh is not a and fresh.messages == []
+
+
+def test_window_keeps_the_last_turns_and_summarizes_the_rest():
+    history = WindowedChatMessageHistory(max_turns=2, max_tokens=1000)
+    for i in range(5):
+        history.add_messages(turn(i))
+
+    assert [m.content.split()[0] for m in history.recent] == ["q3", "a3", "q4", "a4"]
+    for i in range(3):
+        assert f"User: q{i}" in history.summary and f"Assistant: a{i}" in history.summary
+    assert "q3" not in history.summary
+
+
+def test_window_is_trimmed_to_the_token_budget():
+    history = WindowedChatMessageHistory(max_turns=100, max_tokens=20)
+    for i in range(10):
+        history.add_messages(turn(i, words=4))  # 8 tokens a turn
+
+    assert count_message_tokens(history.recent) <= 20
+    assert len(history.recent) == 4
+
+
+def test_an_oversized_turn_is_kept_on_its_own():
+    history = WindowedChatMessageHistory(max_turns=10, max_tokens=20)
+    history.add_messages(turn(0))
+    history.add_messages(turn(1, words=50))
+
+    assert [m.content.split()[0] for m in history.recent] == ["q1", "a1"]
+    assert "q0" in history.summary
+
+
+def test_evicted_turns_are_folded_into_the_previous_summary():
+    calls = []
+
+    def summarizer(summary, evicted):
+        calls.append((summary, [m.content.split()[0] for m in evicted]))
+        return f"{summary}|{len(evicted)}"
+
+    history = WindowedChatMessageHistory(max_turns=1, max_tokens=1000, summarizer=summarizer)
+    for i in range(3):
+        history.add_messages(turn(i))
+
+    assert calls == [("", ["q0", "a0"]), ("|2", ["q1", "a1"])]
+    messages = history.messages
+    assert isinstance(messages[0], SystemMessage)
+    assert messages[0].content == f"{SUMMARY_PREFIX}\n|2|2"
+    assert messages[1:] == history.recent
+
+
+def test_extractive_summary_keeps_the_latest_lines_within_budget():
+    summary = ""
+    for i in range(200):
+        summary = extractive_summary(summary, turn(i, words=10))
+    assert len(summary.split()) <= SUMMARY_MAX_TOKENS
+    assert "a199" in summary and "q0" not in summary
+
+
+def test_prompt_stays_bounded_over_a_long_conversation():
+    rng = random.Random(0)
+    history = WindowedChatMessageHistory()
+    prefix_tokens = len(SUMMARY_PREFIX.split())
+    for i in range(500):
+        history.add_messages(turn(i, words=rng.randint(1, 200)))
+        assert count_message_tokens(history.messages) <= HISTORY_MAX_TOKENS + SUMMARY_MAX_TOKENS + prefix_tokens
+    assert history.recent[-1].content.startswith("a499")
+
+
+def test_each_message_is_tokenized_once(encoding):
+    history = WindowedChatMessageHistory(max_turns=1000, max_tokens=200, summarizer=lambda summary, evicted: summary)
+    for i in range(300):
+        history.add_messages(turn(i, words=10))
+    assert encoding.calls == 600
+    assert count_message_tokens(history.recent) <= 200
+
+
+def test_loaded_state_trims_with_its_own_token_counts():
+    history = WindowedChatMessageHistory(max_turns=10, max_tokens=1000)
+    for i in range(3):
+        history.add_messages(turn(i, words=10))
+
+    restored = WindowedChatMessageHistory(max_turns=10, max_tokens=50)
+    restored.load_state(history.to_state())
+    restored.add_messages(turn(3, words=10))
+    assert [m.content.split()[0] for m in restored.recent] == ["q2", "a2", "q3", "a3"]
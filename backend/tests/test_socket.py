@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from backend.src.routes import socket
+
+
+class DroppingWebSocket:
+    """Client that asks one question and disconnects after the first chunk it receives"""
+
+    def __init__(self, closed):
+        self.questions = ['{"question": "Is sauna good for sleep?", "session_id": "s"}']
+        self.sent = []
+        self.closed = closed
+        self.closed_before_next_receive = None
+
+    async def accept(self):
+        pass
+
+    async def receive_text(self):
+        if self.questions:
+            return self.questions.pop()
+        self.closed_before_next_receive = list(self.closed)
+        raise WebSocketDisconnect()
+
+    async def send_json(self, data):
+        if self.sent:
+            raise RuntimeError("Cannot call send once a close message has been sent")
+        self.sent.append(data)
+
+
+def test_stream_is_closed_when_the_client_disconnects_mid_answer(monkeypatch):
+    qa = pytest.importorskip("backend.LLM.qa")
+    closed = []
+
+    async def fake_chat_stream(chain, question, session_id):
+        try:
+            for i in range(100):
+                yield {"type": "token", "content": str(i)}
+                await asyncio.sleep(0)
+        finally:
+            closed.append(session_id)
+
+    monkeypatch.setattr(qa, "chat_stream", fake_chat_stream)
+    monkeypatch.setattr(socket, "ensure_llm_components", lambda: None)
+    monkeypatch.setattr(socket, "get_llm_components", lambda: {"faiss_index": object(),
+                                                              "qa_chain_streaming": object()})
+
+    ws = DroppingWebSocket(closed)
+    asyncio.run(socket.websocket_chat(ws))
+
+    assert ws.sent == [{"type": "token", "content": "0"}]
+    # Closed as soon as sending failed, not later by the loop's async generator cleanup
+    assert ws.closed_before_next_receive == ["s"]
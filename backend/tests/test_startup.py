@@ -0,0 +1,30 @@
+import statistics
+
+import pytest
+
+from backend.benchmarks.benchmark_startup import DEFERRED_MODULES, MAX_RSS_MB, MAX_SECONDS, TARGET, run_once
+
+pytest.importorskip("fastapi")
+
+RUNS = 3
+
+
+@pytest.fixture(scope="module")
+def cold_imports():
+    return [run_once(TARGET, importtime=False)[0] for _ in range(RUNS)]
+
+
+def test_cold_import_is_within_time_budget(cold_imports):
+    seconds = statistics.median(r["seconds"] for r in cold_imports)
+    assert seconds <= MAX_SECONDS, f"import {TARGET} took {seconds:.2f}s"
+
+
+def test_cold_import_is_within_memory_budget(cold_imports):
+    rss_mb = statistics.median(r["rss_mb"] for r in cold_imports)
+    assert rss_mb <= MAX_RSS_MB, f"import {TARGET} peaked at {rss_mb:.1f} MB"
+
+
+def test_heavy_dependencies_are_not_imported(cold_imports):
+    modules = cold_imports[0]["modules"]
+    eager = [name for name in modules if name in DEFERRED_MODULES or name.startswith("langchain")]
+    assert not eager, f"imported eagerly by {TARGET}: {', '.join(sorted(eager))}"
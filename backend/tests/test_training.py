@@ -0,0 +1,99 @@
+from pathlib import Path
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from backend.predictive_model.neural_network import (SaunaRecommendationEngine,  # noqa: E402
+                                                     SaunaRecommendationModel, TensorBatchLoader)
+
+N_FEATURES = 4
+PREDICTIVE_DIR = Path(__file__).resolve().parents[1] / "predictive_model"
+
+
+class UnusedLoader:
+    def __iter__(self):
+        raise AssertionError("trained after the run had already stopped")
+
+    def __len__(self):
+        return 1
+
+
+def make_engine(seed=0):
+    torch.manual_seed(seed)
+    engine = SaunaRecommendationEngine(hidden_sizes=[8], dropout_rate=0.0)
+    engine.model = SaunaRecommendationModel(N_FEATURES, engine.hidden_sizes, engine.dropout_rate).to(engine.device)
+    return engine
+
+
+def make_loader(rows, batch_size=16, seed=0, **kwargs):
+    generator = torch.Generator().manual_seed(seed)
+    return TensorBatchLoader(torch.randn(rows, N_FEATURES, generator=generator),
+                             torch.randn(rows, 3, generator=generator), batch_size, **kwargs)
+
+
+def run(engine, lr, **kwargs):
+    optimizer = torch.optim.Adam(engine.model.parameters(), lr=lr)
+    scheduler = torch.optim.lr_scheduler.ReduceLROnPlateau(optimizer)
+    train_loader = kwargs.pop("train_loader", make_loader(64, shuffle=True))
+    return engine._run_epochs(train_loader, make_loader(32, seed=1), torch.nn.MSELoss(), optimizer, scheduler,
+                              **kwargs)
+
+
+def test_checkpoint_is_written_on_the_final_epoch(tmp_path):
+    path = str(tmp_path / "checkpoint.pt")
+    _, epochs_trained = run(make_engine(), lr=1e-3, epochs=3, patience=10, checkpoint_path=path, checkpoint_every=10)
+
+    assert epochs_trained == 3
+    assert torch.load(path, weights_only=False)["epoch"] == 2
+
+
+def test_checkpoint_is_written_on_early_stop_and_resume_trains_no_further(tmp_path, monkeypatch):
+    path = str(tmp_path / "checkpoint.pt")
+    # A constant validation loss improves once (on inf), then stops the run after patience=2 epochs
+    monkeypatch.setattr(SaunaRecommendationEngine, "_validation_loss", lambda self, loader, criterion: 1.0)
+    _, epochs_trained = run(make_engine(), lr=1e-3, epochs=50, patience=2, checkpoint_path=path, checkpoint_every=10)
+    assert epochs_trained == 3
+
+    engine = make_engine()
+    optimizer = torch.optim.Adam(engine.model.parameters(), lr=1e-3)
+    scheduler = torch.optim.lr_scheduler.ReduceLROnPlateau(optimizer)
+    checkpoint = engine.load_checkpoint(path, optimizer, scheduler)
+    assert checkpoint["epoch"] == 2 and checkpoint["patience_counter"] == 2
+
+    _, resumed_epochs = run(engine, lr=1e-3, train_loader=UnusedLoader(), epochs=50, patience=2,
+                            start_epoch=checkpoint["epoch"] + 1, best_val_loss=checkpoint["best_val_loss"],
+                            best_state=checkpoint["best_state"], patience_counter=checkpoint["patience_counter"])
+    assert resumed_epochs == 3
+
+
+def test_loader_drops_a_trailing_singleton_batch():
+    sizes = [len(features) for features, _ in make_loader(33, shuffle=True, drop_singleton=True)]
+    assert sizes == [16, 16]
+
+
+@pytest.fixture
+def shipped_engine():
+    pytest.importorskip("sklearn")
+    from backend.src.core.config import MODEL_PATH, SCALER_PATH
+    return SaunaRecommendationEngine(model_path=str(MODEL_PATH), scaler_path=str(SCALER_PATH))
+
+
+def write_new_rows(path, rows):
+    import pandas as pd
+
+    df = pd.read_csv(PREDICTIVE_DIR / "optimal_sauna_settings_with_height.csv", nrows=rows)
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+def test_fine_tune_handles_a_trailing_batch_of_one(shipped_engine, tmp_path):
+    # 19 rows -> 17 training rows, i.e. 16 + 1 with batch_size=16
+    results = shipped_engine.fine_tune(write_new_rows(tmp_path / "new.csv", 19), batch_size=16, epochs=2,
+                                       save_model=False)
+    assert results["epochs_trained"] == 2
+
+
+def test_fine_tune_rejects_a_single_training_row(shipped_engine, tmp_path):
+    with pytest.raises(ValueError, match="at least 2 training rows"):
+        shipped_engine.fine_tune(write_new_rows(tmp_path / "new.csv", 2), save_model=False)